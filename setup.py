@@ -30,6 +30,7 @@ setup(
     include_package_data=True,
     version=version,
     install_requires=['click', 'requests', 'retry', 'singledispatch', 'six'],
+    extras_require={'aio': ['aiohttp>=3.3']},
     keywords="testrail client api wrapper traw",
     classifiers=[
         "Development Status :: 4 - Beta",
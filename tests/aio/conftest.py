@@ -0,0 +1,47 @@
+import asyncio
+
+import mock
+import pytest
+
+from traw.aio import AsyncClient
+
+USER = 'mock username'
+PASS = 'mock password'
+URL = 'mock url'
+
+
+def run(coro):
+    """ Run ``coro`` to completion on the current event loop """
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def collect(agen):
+    """ Exhaust the async generator ``agen`` and return its values as a list """
+    async def _collect():
+        return [val async for val in agen]
+
+    return run(_collect())
+
+
+def returns(*values):
+    """ side_effect for mocked coroutines, returning ``values`` in order """
+    values = list(values)
+
+    async def _coro(*args, **kwargs):
+        return values.pop(0)
+
+    return _coro
+
+
+@pytest.fixture()
+def aiohttp_mock():
+    with mock.patch('traw.aio.sessions.aiohttp') as aiohttp_mock:
+        yield aiohttp_mock
+
+
+@pytest.fixture()
+def async_client(aiohttp_mock):
+    with mock.patch('traw.aio.api.AsyncSession') as sess_mock:
+        sess_mock.return_value = sess_mock
+
+        yield AsyncClient(username=USER, password=PASS, url=URL)
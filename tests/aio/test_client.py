@@ -0,0 +1,170 @@
+import mock
+import pytest
+
+from traw import models
+from traw.const import GET, POST, API_PATH as AP
+from traw.exceptions import TRAWClientError
+
+from .conftest import collect, returns, run
+
+CASE1 = {'id': 991, 'title': 'case1'}
+PROJ1 = {'id': 15, 'suite_mode': 1}
+RESU1 = {'id': 771}
+RESU2 = {'id': 772}
+RUN1 = {'id': 881, 'name': 'run1', 'project_id': 15}
+STAT1 = {'id': 1, 'label': 'Passed'}
+STAT2 = {'id': 5, 'label': 'Failed'}
+TEST1 = {'id': 441, 'case_id': 991, 'run_id': 881}
+
+
+def test_new_models_need_no_await(async_client):
+    """ Verify calling a method with no arguments returns a new model """
+    run_ = async_client.run()
+
+    assert isinstance(run_, models.Run)
+    assert run_.id is None
+    assert not async_client.api._session.request.called
+
+
+def test_run_by_id(async_client):
+    """ Verify ``await client.run(id)`` """
+    async_client.api._session.request.side_effect = returns(RUN1)
+
+    run_ = run(async_client.run(881))
+
+    assert isinstance(run_, models.Run)
+    assert run_.name == 'run1'
+    exp_call = mock.call(method=GET, path=AP['get_run'].format(run_id=881))
+    assert async_client.api._session.request.call_args == exp_call
+
+
+def test_runs_by_project(async_client):
+    """ Verify ``client.runs(project)`` is an async generator """
+    async_client.api._session.request.side_effect = returns([RUN1])
+    project = models.Project(async_client, PROJ1)
+
+    runs = collect(async_client.runs(project))
+
+    assert [r.id for r in runs] == [881]
+    exp_call = mock.call(method=GET, path=AP['get_runs'].format(project_id=15),
+                         params={'offset': 0})
+    assert async_client.api._session.request.call_args == exp_call
+
+
+def test_run_cases(async_client):
+    """ Verify a run's case selection yields awaitable cases, in order """
+    async_client.api._session.request.side_effect = returns(dict(CASE1, id=992), CASE1)
+    run_ = models.Run(async_client, dict(RUN1, case_ids=[992, 991]))
+
+    cases = [run(case) for case in run_.cases]
+
+    assert [c.id for c in cases] == [992, 991]
+    exp_call = mock.call(method=GET, path=AP['get_case'].format(case_id=991))
+    assert async_client.api._session.request.call_args == exp_call
+
+
+def test_results_by_run_paginates(async_client):
+    """ Verify results are paged through until a short page is returned """
+    async_client.api._session.request.side_effect = returns([RESU1] * 250, [RESU2])
+    run_ = models.Run(async_client, RUN1)
+
+    results = collect(async_client.results(run_))
+
+    assert len(results) == 251
+    assert async_client.api._session.request.call_count == 2
+    last_call = async_client.api._session.request.call_args
+    assert last_call[1]['params'] == {'offset': 250}
+
+
+def test_cases_by_project_follows_envelope_links(async_client):
+    """ Verify enveloped case pages are followed through their next links """
+    next_link = '/api/v2/get_cases/15&limit=1&offset=1'
+    async_client.api._session.request.side_effect = returns(
+        PROJ1,
+        {'offset': 0, 'limit': 1, 'size': 1, 'cases': [CASE1],
+         '_links': {'next': next_link, 'prev': None}},
+        {'offset': 1, 'limit': 1, 'size': 1, 'cases': [dict(CASE1, id=992)],
+         '_links': {'next': None, 'prev': None}})
+
+    cases = collect(async_client.cases(15))
+
+    assert [c.id for c in cases] == [991, 992]
+    last_call = async_client.api._session.request.call_args
+    assert last_call[1]['params']['offset'] == 1
+
+
+def test_status_by_label(async_client):
+    """ Verify status lookups by case-insensitive label """
+    async_client.api._session.request.side_effect = returns([STAT1, STAT2])
+
+    status = run(async_client.status('failed'))
+
+    assert status.id == 5
+
+
+def test_status_by_id_missing(async_client):
+    """ Verify an unknown status raises TRAWClientError """
+    async_client.api._session.request.side_effect = returns([STAT1, STAT2])
+
+    with pytest.raises(TRAWClientError):
+        run(async_client.status(99))
+
+
+def test_model_properties_are_awaitable(async_client):
+    """ Verify relationship properties of models return awaitables """
+    async_client.api._session.request.side_effect = returns(CASE1)
+    test = models.Test(async_client, TEST1)
+
+    case = run(test.case)
+
+    assert isinstance(case, models.Case)
+    assert case.id == 991
+
+
+def test_add_result(async_client):
+    """ Verify ``await client.add(result)`` """
+    async_client.api._session.request.side_effect = returns(RESU1)
+    result = async_client.result()
+    result.test = models.Test(async_client, TEST1)
+    result.comment = 'mock comment'
+
+    added = run(async_client.add(result))
+
+    assert added.id == 771
+    call_kwargs = async_client.api._session.request.call_args[1]
+    assert call_kwargs['method'] == POST
+    assert call_kwargs['path'] == AP['add_result'].format(test_id=441)
+    assert call_kwargs['json']['comment'] == 'mock comment'
+
+
+def test_add_unsupported_type(async_client):
+    """ Verify adding an unsupported object raises a TypeError """
+    with pytest.raises(TypeError):
+        async_client.add(models.Status(async_client, STAT1))
+
+
+def test_context_manager_closes_session(async_client):
+    """ Verify leaving ``async with`` closes the HTTP session """
+    async_client.api._session.close.side_effect = returns(None)
+
+    async def use_client():
+        async with async_client as client:
+            assert client is async_client
+
+    run(use_client())
+
+    assert async_client.api._session.close.called
+
+
+def test_add_results(async_client):
+    """ Verify ``await client.add_results(run, results)`` bulk adds results """
+    async_client.api._session.request.side_effect = returns([RESU1, RESU2])
+    results = [models.Result(async_client, {'test_id': 441, 'status_id': 1}),
+               models.Result(async_client, {'test_id': 442, 'status_id': 5})]
+
+    added = run(async_client.add_results(models.Run(async_client, RUN1), results))
+
+    assert [result.id for result in added] == [771, 772]
+    call_kwargs = async_client.api._session.request.call_args[1]
+    assert call_kwargs['path'] == AP['add_results'].format(run_id=881)
+    assert [entry['test_id'] for entry in call_kwargs['json']['results']] == [441, 442]
@@ -0,0 +1,118 @@
+import asyncio
+
+import mock
+import pytest
+from requests.status_codes import codes
+
+from traw import exceptions
+from traw.aio.sessions import AsyncResponse, AsyncRequest, AsyncSession
+from traw.const import GET, BASE_API_PATH as BAP, API_PATH as AP
+
+from .conftest import returns, run
+
+AUTH = ('mock username', 'mock password')
+URL = 'http://mock.url'
+
+
+async def no_sleep(*args):
+    pass
+
+
+@pytest.fixture()
+def session(aiohttp_mock):
+    aiohttp_mock.ClientConnectionError = ConnectionError
+    aiohttp_mock.ClientPayloadError = ValueError
+    with mock.patch('traw.aio.sessions.asyncio.sleep', side_effect=no_sleep):
+        yield AsyncSession(auth=AUTH, url=URL)
+
+
+def response(status_code, content=b'', headers=None):
+    return AsyncResponse(status_code, 'Response Reason', headers or dict(),
+                         content, AsyncRequest('mock path url'))
+
+
+def test___init___requires_aiohttp():
+    """ Verify a helpful error is raised when aiohttp is missing """
+    with mock.patch('traw.aio.sessions.aiohttp', None):
+        with pytest.raises(exceptions.TRAWClientError):
+            AsyncSession(auth=AUTH, url=URL)
+
+
+def test_request_builds_url(session):
+    """ Verify ``request`` combines the base url, api path, and resource path """
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(response(codes['ok'], b'{"id": 1}'))
+        resp = run(session.request(method=GET, path=AP['get_projects']))
+
+    exp_url = URL + BAP + '/' + AP['get_projects']
+    exp_call = mock.call(method=GET, params={}, url=exp_url, json=None)
+    assert resp == {'id': 1}
+    assert make_req_mock.call_args == exp_call
+
+
+def test_request_empty_content(session):
+    """ Verify a successful response without content returns an empty string """
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(response(codes['ok']))
+        assert run(session.request(method=GET, path=AP['get_projects'])) == ''
+
+
+def test_request_retries_server_error(session):
+    """ Verify server errors are retried three times """
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(*[response(codes['bad_gateway'])] * 3)
+        with pytest.raises(exceptions.ServerError):
+            run(session.request(method=GET, path=AP['get_projects']))
+
+    assert make_req_mock.call_count == 3
+
+
+def test_request_not_found_not_retried(session):
+    """ Verify client errors are raised immediately """
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(response(codes['not_found']))
+        with pytest.raises(exceptions.NotFound):
+            run(session.request(method=GET, path=AP['get_projects']))
+
+    assert make_req_mock.call_count == 1
+
+
+def test_request_rate_limited_sleeps_without_blocking(session):
+    """ Verify a 429 awaits asyncio.sleep for Retry-After seconds """
+    limited = response(429, headers={'Retry-After': '7'})
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(limited, response(codes['ok'], b'[]'))
+        assert run(session.request(method=GET, path=AP['get_projects'])) == []
+
+    assert mock.call(7) in asyncio.sleep.call_args_list
+
+
+def test_request_rate_limiter_waits_without_blocking(session):
+    """ Verify the rate limiter's wait is awaited with asyncio.sleep """
+    session._rate_limiter = mock.MagicMock()
+    session._rate_limiter.reserve.return_value = 3
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = returns(response(codes['ok'], b'[]'))
+        assert run(session.request(method=GET, path=AP['get_projects'])) == []
+
+    assert session._rate_limiter.reserve.called
+    assert mock.call(3) in asyncio.sleep.call_args_list
+
+
+def test_request_concurrent_gets_coalesced(session):
+    """ Verify identical concurrent GETs share one request """
+    async def slow_response(**kwargs):
+        await asyncio.sleep(0)
+        return response(codes['ok'], b'{"id": 1}')
+
+    async def fetch_twice():
+        return await asyncio.gather(session.request(method=GET, path=AP['get_projects']),
+                                    session.request(method=GET, path=AP['get_projects']))
+
+    with mock.patch.object(AsyncSession, '_make_request') as make_req_mock:
+        make_req_mock.side_effect = slow_response
+        results = run(fetch_twice())
+
+    assert results == [{'id': 1}, {'id': 1}]
+    assert make_req_mock.call_count == 1
+    assert session._inflight == dict()
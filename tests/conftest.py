@@ -1,3 +1,4 @@
+import sys
 import time
 
 import mock
@@ -5,6 +6,9 @@ import pytest
 
 import traw
 
+# traw.aio uses async generators, which require Python 3.6+
+collect_ignore = ['aio'] if sys.version_info < (3, 6) else []
+
 USER = 'mock username'
 PASS = 'mock password'
 URL = 'mock url'
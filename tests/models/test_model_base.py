@@ -1,6 +1,12 @@
+import inspect
+
 import pytest
 
+from traw import models
 from traw.models import Priority, Result, Status
+from traw.models.model_base import ModelBase
+
+BENCHMARK_COUNT = 10000
 
 
 @pytest.fixture()
@@ -110,3 +116,53 @@ def test___ne___hashes_change_as_object_changes(client):
     result2.comment = "mock comment a"
 
     assert (result1 != result2) is False
+
+
+def test___hash___uses_type_and_id(status1a, status1c, priority1):
+    assert hash(status1a) == hash(status1c)
+    assert hash(status1a) != hash(priority1)
+
+
+def test___hash___set_membership(status1a, status1b, status1c, status2):
+    assert {status1a, status1b, status1c, status2} == {status1a, status1c, status2}
+    assert len({status1a, status1b, status1c, status2}) == 3
+
+
+@pytest.mark.parametrize('model_cls', [cls for _, cls in inspect.getmembers(models, inspect.isclass)
+                                       if issubclass(cls, ModelBase)])
+def test_models_have_no_instance_dict(client, model_cls):
+    assert not hasattr(model_cls(client), '__dict__')
+
+
+class DictModel(object):
+    """ Model that keeps its attributes in a per-instance __dict__, as TRAW
+        models did before they declared __slots__
+    """
+    def __init__(self, client, content=None):
+        self.client = client
+        self._content = content or dict()
+
+
+def _allocated(tracemalloc, factory):
+    tracemalloc.start()
+    try:
+        objs = [factory(i) for i in range(BENCHMARK_COUNT)]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert len(objs) == BENCHMARK_COUNT
+    return size
+
+
+def test_slots_memory_benchmark(client):
+    """ Verify slotted models use less memory than models with a __dict__ """
+    tracemalloc = pytest.importorskip('tracemalloc')
+    contents = [{'id': i, 'status_id': 1, 'test_id': i} for i in range(BENCHMARK_COUNT)]
+
+    slotted = _allocated(tracemalloc, lambda i: Result(client, contents[i]))
+    with_dict = _allocated(tracemalloc, lambda i: DictModel(client, contents[i]))
+
+    print('{0} models.Result objects: {1} bytes with __slots__, {2} bytes with a __dict__ '
+          '({3:.0%} less)'.format(BENCHMARK_COUNT, slotted, with_dict, 1 - float(slotted) / with_dict))
+    assert slotted < with_dict * 0.75
@@ -1,3 +1,5 @@
+from datetime import datetime as dt
+
 import mock
 import pytest
 
@@ -132,6 +134,16 @@ def test___init___with_caller_supplied_credentials(no_env_vars, no_path_mock):
     assert api._session._url == MOCK_URL
 
 
+def test___init___with_rate_limit(no_env_vars, no_path_mock):
+    """ Verify a rate limit gives the session a shared token bucket """
+    with mock.patch('traw.api.shared_bucket') as shared_bucket_mock:
+        api = traw.api.API(username=MOCK_USERNAME, password=MOCK_PASSWORD,
+                           url=MOCK_URL, rate_limit=180, rate_limit_file='mock path')
+
+    shared_bucket_mock.assert_called_once_with(MOCK_URL, 180, path='mock path')
+    assert api._session._rate_limiter is shared_bucket_mock.return_value
+
+
 def test___init___with_caller_supplied_password(no_env_vars, no_path_mock):
     """ Verify a password can be used instead of the apk key """
     api = traw.api.API(username=MOCK_USERNAME,
@@ -227,7 +239,7 @@ def test_cases_by_project_id(api):
 
     exp_call = mock.call(method=GET,
                          path=AP['get_cases'].format(project_id=PROJECT_ID),
-                         params=dict())
+                         params={'offset': 0})
 
     assert case == CASE1
     assert isinstance(case, dict)
@@ -246,13 +258,90 @@ def test_cases_by_project_id_w_params(api):
 
     exp_call = mock.call(method=GET,
                          path=AP['get_cases'].format(project_id=PROJECT_ID),
-                         params={'suite_id': SUITE_ID, 'section_id': SECTION_ID})
+                         params={'suite_id': SUITE_ID, 'section_id': SECTION_ID,
+                                 'offset': 0})
 
     assert case == CASE1
     assert isinstance(case, dict)
     assert api._session.request.call_args == exp_call
 
 
+def test_cases_by_project_id_envelope(api):
+    """ Verify ``cases_by_project_id`` pages through enveloped responses """
+    PROJECT_ID = 1234
+    next_link = '/api/v2/get_cases/{0}&limit=1&offset=1'.format(PROJECT_ID)
+    api._session.request.side_effect = [
+        {'offset': 0, 'limit': 1, 'size': 1, 'cases': [CASE1],
+         '_links': {'next': next_link, 'prev': None}},
+        {'offset': 1, 'limit': 1, 'size': 1, 'cases': [CASE2],
+         '_links': {'next': None, 'prev': None}}]
+
+    cases = list(api.cases_by_project_id(PROJECT_ID))
+
+    assert cases == [CASE1, CASE2]
+    offsets = [c[1]['params']['offset'] for c in api._session.request.call_args_list]
+    assert offsets == [0, 1]
+
+
+def test_cases_synced(api):
+    """ Verify an expired listing is refreshed with only the updated cases """
+    PROJECT_ID = 1234
+    SUITE_ID = 2345
+    api._session.request.side_effect = [
+        [{'id': 1, 'updated_on': 100}, {'id': 2, 'updated_on': 200}],
+        [{'id': 2, 'title': 'updated', 'updated_on': 300}, {'id': 3, 'updated_on': 300}]]
+
+    assert api.cases_synced(PROJECT_ID, SUITE_ID) == [{'id': 1, 'updated_on': 100},
+                                                      {'id': 2, 'updated_on': 200}]
+    assert api.cases_synced(PROJECT_ID, SUITE_ID) is api.cases_synced(PROJECT_ID, SUITE_ID)
+    assert api._session.request.call_count == 1
+
+    api.cases_by_project_id.cache.clear()  # As if the listing had expired
+    cases = api.cases_synced(PROJECT_ID, SUITE_ID)
+
+    exp_call = mock.call(method=GET,
+                         path=AP['get_cases'].format(project_id=PROJECT_ID),
+                         params={'suite_id': SUITE_ID, 'updated_after': 199, 'offset': 0})
+    assert api._session.request.call_args == exp_call
+    assert [case['id'] for case in cases] == [1, 2, 3]
+    assert cases[1]['title'] == 'updated'
+    assert list(api.cases_by_project_id(PROJECT_ID, suite_id=SUITE_ID)) == cases
+    assert api.case_by_id(2)['title'] == 'updated'
+    assert api.case_syncs.get((PROJECT_ID, SUITE_ID), dt.now())['value']['updated_on'] == 300
+    assert api._session.request.call_count == 2
+
+
+def test_cases_synced_from_cached_listing(api):
+    """ Verify a listing cached by ``cases_by_project_id`` is refreshed
+        incrementally once it expires
+    """
+    api._session.request.side_effect = [[{'id': 1, 'updated_on': 100}], list()]
+    list(api.cases_by_project_id(1234))
+
+    api.cases_synced(1234)
+    api.cases_by_project_id.cache.clear()
+
+    assert api.cases_synced(1234) == [{'id': 1, 'updated_on': 100}]
+    assert api._session.request.call_args[1]['params'] == {'updated_after': 99, 'offset': 0}
+
+
+def test_cases_synced_bounded(api):
+    """ Verify the sync state is kept within the models.Case cache limits,
+        and is not locked while TestRail is called
+    """
+    def request(method, path, params=None):  # pylint: disable=unused-argument
+        assert not api._case_sync_lock.locked()
+        return [{'id': params['suite_id'], 'updated_on': 100}]
+
+    api._session.request.side_effect = request
+    api.cache_limits[traw.models.Case] = dict(max_entries=1, max_bytes=None)
+
+    api.cases_synced(1234, 1)
+    api.cases_synced(1234, 2)
+
+    assert list(api.case_syncs.keys()) == [(1234, 2)]
+
+
 def test_case_types(api):
     """ Verify the ``case_types`` method call """
     api._session.request.return_value = [CT1, CT2, CT3]
@@ -509,7 +598,7 @@ def test_project_by_id(api):
 
     proj = api.project_by_id(PROJ_ID)
 
-    assert proj is PROJ_DICT
+    assert proj == PROJ_DICT
     assert str(PROJ_ID) in str(api._session.request.call_args)
 
 
@@ -585,6 +674,36 @@ def test_result_add(api):
     assert api._session.request.call_args == exp_call
 
 
+def test_results_add(api):
+    """ Verify the ``results_add`` method call """
+    RUN_ID = 881
+    RESULTS = [{'test_id': 1, 'status_id': 1}, {'test_id': 2, 'status_id': 5}]
+    api._session.request.return_value = [RESU1, RESU2]
+    results = api.results_add(RUN_ID, RESULTS)
+
+    exp_call = mock.call(method=POST,
+                         path=AP['add_results'].format(run_id=RUN_ID),
+                         json={'results': RESULTS})
+
+    assert results == [RESU1, RESU2]
+    assert api._session.request.call_args == exp_call
+
+
+def test_results_add_for_cases(api):
+    """ Verify the ``results_add_for_cases`` method call """
+    RUN_ID = 881
+    RESULTS = [{'case_id': 1, 'status_id': 1}, {'case_id': 2, 'status_id': 5}]
+    api._session.request.return_value = [RESU1, RESU2]
+    results = api.results_add_for_cases(RUN_ID, RESULTS)
+
+    exp_call = mock.call(method=POST,
+                         path=AP['add_results_for_cases'].format(run_id=RUN_ID),
+                         json={'results': RESULTS})
+
+    assert results == [RESU1, RESU2]
+    assert api._session.request.call_args == exp_call
+
+
 def test_results_by_run_id_no_status_id(api):
     """ Verify the ``results_by_run_id`` method call with no status_id"""
     RUN_ID = 1234
@@ -985,7 +1104,7 @@ def test_tests_by_run_id_no_status_id(api):
     test = next(api.tests_by_run_id(RUN_ID))
 
     exp_call = mock.call(
-        method=GET, path=AP['get_tests'].format(run_id=RUN_ID), params=None)
+        method=GET, path=AP['get_tests'].format(run_id=RUN_ID), params={'offset': 0})
 
     assert test == TEST1
     assert isinstance(test, dict)
@@ -1001,7 +1120,7 @@ def test_tests_by_run_id_w_status_id(api):
 
     exp_call = mock.call(method=GET,
                          path=AP['get_tests'].format(run_id=RUN_ID),
-                         params={'status_id': '111,222'})
+                         params={'status_id': '111,222', 'offset': 0})
 
     assert test == TEST1
     assert isinstance(test, dict)
@@ -1017,7 +1136,7 @@ def test_user_by_email(api):
 
     user = api.user_by_email(USER_EMAIL)
 
-    assert user is USER_DICT
+    assert user == USER_DICT
     assert USER_EMAIL in str(api._session.request.call_args)
 
 
@@ -1030,7 +1149,7 @@ def test_user_by_id(api):
 
     user = api.user_by_id(USER_ID)
 
-    assert user is USER_DICT
+    assert user == USER_DICT
     assert str(USER_ID) in str(api._session.request.call_args)
 
 
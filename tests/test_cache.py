@@ -0,0 +1,264 @@
+from copy import deepcopy
+from datetime import datetime, timedelta
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+
+import mock
+import pytest
+
+from traw.cache import (LRUCache, PersistentCache, ReadOnlyDict, ReadOnlyList, SQLiteStore, ThreadConnections,
+                        freeze, sizeof)
+
+
+@pytest.fixture()
+def cache():
+    yield LRUCache(max_entries=3, max_bytes=None, sweep_interval=4)
+
+
+def test_get_missing(cache):
+    """ Verify a missing key returns None """
+    assert cache.get('missing', 0) is None
+
+
+def test_set_get(cache):
+    """ Verify stored values are returned until they expire """
+    cache.set('key', 'value', expires=10)
+
+    assert cache.get('key', 5)['value'] == 'value'
+    assert cache.get('key', 10)['value'] == 'value'
+    assert cache.get('key', 11) is None
+    assert 'key' not in cache
+
+
+def test_max_entries_evicts_least_recently_used(cache):
+    """ Verify the least recently used entry is evicted first """
+    cache.set('a', 1, expires=10)
+    cache.set('b', 2, expires=10)
+    cache.set('c', 3, expires=10)
+    cache.get('a', 0)  # 'b' is now the least recently used entry
+    cache.set('d', 4, expires=10)
+
+    assert sorted(cache.keys()) == ['a', 'c', 'd']
+
+
+def test_eviction_prefers_expired_entries(cache):
+    """ Verify expired entries are dropped before live ones are evicted """
+    cache.set('a', 1, expires=10)
+    cache.set('b', 2, expires=1)
+    cache.set('c', 3, expires=10)
+    cache.set('d', 4, expires=10, now=5)
+
+    assert sorted(cache.keys()) == ['a', 'c', 'd']
+
+
+def test_max_bytes():
+    """ Verify entries are evicted to stay under the byte limit """
+    value = ['x' * 100]
+    cache = LRUCache(max_entries=None, max_bytes=sizeof(value) * 2)
+    cache.set('a', list(value), expires=10)
+    cache.set('b', list(value), expires=10)
+    assert len(cache) == 2
+
+    cache.set('c', list(value), expires=10)
+    assert sorted(cache.keys()) == ['b', 'c']
+    assert cache.size <= cache.max_bytes
+
+
+def test_configure_shrinks_cache(cache):
+    """ Verify lowering the limits evicts entries immediately """
+    for key in 'abc':
+        cache.set(key, key, expires=10)
+
+    cache.configure(max_entries=1)
+
+    assert cache.keys() == ['c']
+
+
+def test_configure_max_bytes_tracks_existing_entries(cache):
+    """ Verify enabling a byte limit accounts for already cached entries """
+    cache.set('a', 'x' * 1000, expires=10)
+    assert cache.size == 0
+
+    cache.configure(max_entries=None, max_bytes=10 ** 6)
+
+    assert cache.size == sizeof('x' * 1000)
+
+
+def test_proactive_sweep(cache):
+    """ Verify expired entries are swept every ``sweep_interval`` writes """
+    cache.configure(max_entries=None)
+    cache.set('a', 1, expires=1, now=0)
+    cache.set('b', 2, expires=1, now=0)
+    cache.set('c', 3, expires=10, now=0)
+    assert len(cache) == 3
+
+    cache.set('d', 4, expires=10, now=5)
+
+    assert sorted(cache.keys()) == ['c', 'd']
+
+
+def test_pop_and_clear(cache):
+    """ Verify entries can be removed individually or all at once """
+    cache.set('a', 1, expires=10)
+    cache.set('b', 2, expires=10)
+
+    assert cache.pop('a')['value'] == 1
+    assert cache.pop('a') is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_thread_safety():
+    """ Verify concurrent writers never push the cache over its limit """
+    cache = LRUCache(max_entries=50)
+
+    def writer(offset):
+        for idx in range(500):
+            cache.set(offset + idx, idx, expires=10, now=0)
+            cache.get(offset + idx - 1, 0)
+
+    threads = [threading.Thread(target=writer, args=(n * 1000, )) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
+
+
+def test_freeze_nested():
+    """ Verify frozen responses, including nested dicts and lists, are read-only """
+    frozen = freeze({'id': 1, 'steps': [{'content': 'a'}], 'refs': None})
+
+    assert frozen == {'id': 1, 'steps': [{'content': 'a'}], 'refs': None}
+    assert isinstance(frozen, ReadOnlyDict)
+    assert isinstance(frozen['steps'], ReadOnlyList)
+    assert isinstance(frozen['steps'][0], ReadOnlyDict)
+    assert freeze(frozen) is frozen
+
+    with pytest.raises(TypeError):
+        frozen['id'] = 2
+    with pytest.raises(TypeError):
+        frozen.update(id=2)
+    with pytest.raises(TypeError):
+        frozen['steps'].append({})
+    with pytest.raises(TypeError):
+        frozen['steps'][0]['content'] = 'b'
+
+
+def test_freeze_copies():
+    """ Verify frozen responses can be copied, pickled, and serialized """
+    frozen = freeze({'id': 1, 'steps': [{'content': 'a'}]})
+
+    thawed = frozen.copy()
+    thawed['id'] = 2
+    assert type(thawed) is dict
+    assert frozen['id'] == 1
+
+    assert deepcopy(frozen) == frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert json.loads(json.dumps(frozen)) == frozen
+
+
+@pytest.fixture()
+def store(tmpdir):
+    yield SQLiteStore(os.path.join(str(tmpdir), 'cache', 'traw.sqlite'), scope='user@url')
+
+
+def test_store_set_get(store):
+    """ Verify stored values are returned until they expire, by scope and name """
+    store.set('users', ((1, ), ()), freeze({'id': 1}), expires=10)
+
+    assert store.get('users', ((1, ), ()), 10)['value'] == {'id': 1}
+    assert isinstance(store.get('users', ((1, ), ()), 10)['value'], ReadOnlyDict)
+    assert store.get('users', ((1, ), ()), 11) is None
+    assert store.get('statuses', ((1, ), ()), 5) is None
+    assert SQLiteStore(store.path, scope='other').get('users', ((1, ), ()), 5) is None
+    assert store.keys('users') == [((1, ), ())]
+
+
+def test_store_datetime_expiry(store):
+    """ Verify datetime expiry times are compared chronologically """
+    now = datetime.now()
+    store.set('users', 'key', 'value', expires=now + timedelta(seconds=300))
+
+    assert store.get('users', 'key', now + timedelta(seconds=299))['value'] == 'value'
+    assert store.get('users', 'key', now + timedelta(seconds=301)) is None
+
+
+def test_store_pop_sweep_clear(store):
+    """ Verify entries can be removed one at a time, once expired, or by name """
+    store.set('users', 'a', 1, expires=10)
+    store.set('users', 'b', 2, expires=20)
+    store.set('users', 'c', 3, expires=30)
+    store.set('statuses', 'd', 4, expires=30)
+
+    assert store.pop('users', 'a')['value'] == 1
+    assert store.pop('users', 'a') is None
+    store.sweep(25)
+    assert store.keys('users') == ['c']
+    store.clear('users')
+    assert store.keys('users') == list()
+    assert store.keys('statuses') == ['d']
+
+
+def _write_entries(path, worker):
+    store = SQLiteStore(path)
+    for i in range(50):
+        store.set('users', (worker, i), {'id': i}, expires=10)
+        assert store.get('users', (worker, i), 5)['value'] == {'id': i}
+
+
+def test_store_shared_between_processes(store):
+    """ Verify concurrent processes can write to, and read from, one store """
+    path = store.path
+    processes = [multiprocessing.Process(target=_write_entries, args=(path, worker))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert len(SQLiteStore(path).keys('users')) == 200
+
+
+def test_thread_connections(tmpdir):
+    """ Verify each thread, and each forked process, gets its own connection """
+    connection = ThreadConnections(os.path.join(str(tmpdir), 'traw.sqlite'))
+    conn = connection()
+    assert connection() is conn
+
+    other = list()
+    thread = threading.Thread(target=lambda: other.append(connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    with mock.patch('traw.cache.os.getpid') as getpid_mock:
+        getpid_mock.return_value = os.getpid() + 1
+        assert connection() is not conn
+
+
+def test_persistent_cache(store):
+    """ Verify entries are written to memory and the store, and read from
+        the store when they are not in memory
+    """
+    cache = PersistentCache(store, 'users', LRUCache(max_entries=1))
+    cache.set('a', 1, expires=10)
+    cache.set('b', 2, expires=10)  # Evicts 'a' from memory
+
+    assert 'a' not in cache.memory
+    assert cache.get('a', 5)['value'] == 1
+    assert 'a' in cache.memory
+    assert sorted(cache.keys()) == ['a', 'b']
+    assert len(cache) == 2
+
+    assert PersistentCache(store, 'users').get('b', 5)['value'] == 2
+    assert cache.pop('b')['value'] == 2
+    assert 'b' not in cache
+    cache.clear()
+    assert len(cache) == 0
@@ -1,4 +1,6 @@
+import gc
 from datetime import datetime as dt
+import json
 import sys
 
 import mock
@@ -6,7 +8,7 @@ import pytest
 
 import traw
 from traw import models
-from traw.exceptions import TRAWClientError, UnknownCustomStatusError
+from traw.exceptions import TooLarge, TRAWClientError, UnknownCustomStatusError
 
 USER = 'mock username'
 PASS = 'mock password'
@@ -228,6 +230,104 @@ def test_add_result(client):
     assert 'extra' not in str(client.api.result_add.call_args)
 
 
+def test_add_results(client):
+    """ Verify ``client.add_results(run, results)`` sends one bulk request """
+    results = [models.Result(client, {'test_id': 1, 'status_id': 1, 'comment': 'c1'}),
+               models.Result(client, {'test_id': 2, 'status_id': 5})]
+    client.api.results_add.return_value = [RESU1, RESU2]
+
+    with mock.patch.object(client, 'test') as test_mock:
+        added = client.add_results(models.Run(client, {'id': 881}), results)
+
+    assert not test_mock.called
+    assert [result.id for result in added] == [771, 772]
+    assert all(isinstance(result, models.Result) for result in added)
+    run_id, entries = client.api.results_add.call_args[0]
+    assert run_id == 881
+    assert [entry['test_id'] for entry in entries] == [1, 2]
+    assert entries[0]['comment'] == 'c1'
+
+
+def test_add_results_chunked(client):
+    """ Verify large result sets are split into requests under max_bytes """
+    results = [models.Result(client, {'test_id': i, 'comment': 'x' * 100})
+               for i in range(10)]
+    client.api.results_add.side_effect = lambda run_id, chunk: [RESU1] * len(chunk)
+
+    added = client.add_results(881, results, max_bytes=1024)
+
+    assert len(added) == 10
+    chunks = [call[0][1] for call in client.api.results_add.call_args_list]
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) == 10
+    assert all(len(json.dumps({'results': chunk})) <= 1024 for chunk in chunks)
+
+
+def test_add_results_splits_chunks_too_large(client):
+    """ Verify a chunk rejected as too large is split and retried """
+    results = [models.Result(client, {'test_id': i}) for i in range(4)]
+
+    def _add(run_id, chunk):
+        if len(chunk) > 1:
+            raise TooLarge(mock.MagicMock())
+        return [dict(RESU1, test_id=chunk[0]['test_id'])]
+
+    client.api.results_add.side_effect = _add
+
+    added = client.add_results(881, results)
+
+    assert [result._content['test_id'] for result in added] == [0, 1, 2, 3]
+    assert client.api.results_add.call_count == 7
+
+
+def test_add_results_too_large_single_result(client):
+    """ Verify a single result rejected as too large raises """
+    client.api.results_add.side_effect = TooLarge(mock.MagicMock())
+
+    with pytest.raises(TooLarge):
+        client.add_results(881, [models.Result(client, {'test_id': 1})])
+
+
+def test_add_results_requires_test(client):
+    """ Verify results without a test raise TRAWClientError """
+    with pytest.raises(TRAWClientError):
+        client.add_results(881, [models.Result(client)])
+
+    assert not client.api.results_add.called
+
+
+def test_add_results_requires_results(client):
+    """ Verify non-Result objects raise TypeError """
+    with pytest.raises(TypeError):
+        client.add_results(881, [{'test_id': 1}])
+
+
+def test_add_results_no_run(client):
+    """ Verify ``client.add_results()`` requires a run """
+    with pytest.raises(NotImplementedError):
+        client.add_results()
+
+
+def test_add_results_for_cases(client):
+    """ Verify ``client.add_results_for_cases(run, [(case, result)])`` """
+    results = [(models.Case(client, {'id': 991}), models.Result(client, {'status_id': 1})),
+               (992, models.Result(client, {'status_id': 5}))]
+    client.api.results_add_for_cases.return_value = [RESU1, RESU2]
+
+    added = client.add_results_for_cases(models.Run(client, {'id': 881}), results)
+
+    assert [result.id for result in added] == [771, 772]
+    run_id, entries = client.api.results_add_for_cases.call_args[0]
+    assert run_id == 881
+    assert [(entry['case_id'], entry['status_id']) for entry in entries] == [(991, 1), (992, 5)]
+
+
+def test_add_results_for_cases_bad_case(client):
+    """ Verify cases must be models.Case objects or ints """
+    with pytest.raises(TypeError):
+        client.add_results_for_cases(881, [('991', models.Result(client))])
+
+
 def test_add_run_with_case_ids(client):
     RUN_ID = 111
     PROJECT_ID = 15
@@ -326,6 +426,19 @@ def test_add_section_exc(client):
     proj_mock.assert_called_once_with(PROJECT_ID)
 
 
+def test_add_parent_fetched_milestone(full_client):
+    """ Verify a milestone fetched through the client can be given a parent """
+    full_client.api._session.request.return_value = {'id': 111, 'name': 'milestone'}
+    milestone = full_client.milestone(111)
+
+    sub_milestone = milestone.add_parent(222)
+
+    assert isinstance(sub_milestone, models.SubMilestone)
+    assert sub_milestone._content['parent_id'] == 222
+    assert 'parent_id' not in milestone._content
+    assert 'parent_id' not in full_client.api.milestone_by_id.peek(111)
+
+
 def test_add_sub_milestone(client):
     SUB_MILESTONE_ID = 111
     PARENT_ID = 222
@@ -947,6 +1060,35 @@ def test_cases_by_project_and_suite_id_and_section_id(client):
         PROJECT_ID, suite_id=SUITE_ID, section_id=SECTION_ID)
 
 
+def test_cases_incremental(client):
+    """ Verify ``client.cases(Project, 16, incremental=True)`` lists the cases
+        through ``cases_synced``
+    """
+    PROJECT_DICT = {'id': 15, 'suite_mode': 2}
+    client.api.project_by_id.return_value = PROJECT_DICT
+    client.api.cases_synced.return_value = [CASE1, CASE2]
+
+    cases = list(client.cases(models.Project(client, PROJECT_DICT), 16, incremental=True))
+
+    assert [case.id for case in cases] == [991, 992]
+    client.api.cases_synced.assert_called_once_with(15, 16)
+    assert not client.api.cases_by_project_id.called
+
+
+def test_cases_incremental_w_filter(client):
+    """ Verify incremental case listings cannot be filtered """
+    client.api.project_by_id.return_value = {'id': 15, 'suite_mode': 1}
+
+    with pytest.raises(TRAWClientError) as exc:
+        list(client.cases(15, section=17, incremental=True))
+    assert 'section' in str(exc)
+
+    with pytest.raises(TRAWClientError) as exc:
+        list(client.cases(15, priority=4, incremental=True))
+    assert 'priority' in str(exc)
+    assert not client.api.cases_synced.called
+
+
 def test_cases_by_project_exc_1(client):
     """ Verify calling ``client.cases(Project)`` when the project is a
         suite_mode of 2 raises an exception
@@ -2278,6 +2420,20 @@ def test_results_by_run(client):
     client.api.results_by_run_id.assert_called_once_with(1234)
 
 
+def test_results_by_run_w_workers(client):
+    """ Verify calling ``client.results(Run)`` with workers """
+    list(client.results(models.Run(client, {'id': 1234}), workers=4))
+
+    client.api.results_by_run_id.assert_called_once_with(1234, workers=4)
+
+
+def test_results_by_run_w_prefetch(client):
+    """ Verify calling ``client.results(Run)`` with prefetch """
+    list(client.results(models.Run(client, {'id': 1234}), prefetch=2))
+
+    client.api.results_by_run_id.assert_called_once_with(1234, prefetch=2)
+
+
 def test_results_by_run_id(client):
     """ Verify calling ``client.results(123, obj_type=models.Run)`` with
         an ID returns result generator
@@ -2568,6 +2724,13 @@ def test_runs_by_project_w_limit(client):
     client.api.runs_by_project_id.assert_called_once_with(1234, limit=2)
 
 
+def test_runs_by_project_w_workers(client):
+    """ Verify calling ``client.runs(Project)`` with workers """
+    list(client.runs(models.Project(client, {'id': 1234}), workers=4))
+
+    client.api.runs_by_project_id.assert_called_once_with(1234, workers=4)
+
+
 def test_runs_by_project_w_int_created_after(client):
     """ Verify calling ``client.runs(Project)`` with created_after """
     list(client.runs(models.Project(client, {'id': 1234}), created_after=1112))
@@ -3276,6 +3439,121 @@ def test_template_by_int_exc(client):
     assert client.api.templates.called
 
 
+def test_template_by_int_indexed(client):
+    """ Verify the Client's ``template`` method only indexes projects until
+        the template is found, and answers later lookups from the index
+    """
+    templates = {1: [TEMP1], 2: [TEMP2], 3: [TEMP3]}
+    client.api.templates.side_effect = lambda project_id: templates[project_id]
+
+    with mock.patch.object(client, 'projects') as proj_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1}),
+                                  models.Project(client, {'id': 2}),
+                                  models.Project(client, {'id': 3})]
+        template = client.template(992)
+        assert client.template(992) is template
+        assert client.template(991).id == 991
+
+    assert template.id == 992
+    assert client.api.templates.call_args_list == [mock.call(1), mock.call(2)]
+
+
+def test_template_by_int_new_project(client):
+    """ Verify the Client's ``template`` method indexes projects added after
+        the index was built
+    """
+    client.api.templates.side_effect = lambda project_id: {1: [TEMP1], 2: [TEMP2]}[project_id]
+
+    with mock.patch.object(client, 'projects') as proj_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1})]
+        client.build_template_index()
+
+        proj_mock.return_value = [models.Project(client, {'id': 1}),
+                                  models.Project(client, {'id': 2})]
+        template = client.template(992)
+
+    assert template.id == 992
+    assert client.api.templates.call_args_list == [mock.call(1), mock.call(2)]
+
+
+def test_template_by_int_added_to_indexed_project(client):
+    """ Verify the Client's ``template`` method lists indexed projects again
+        before failing to find a template
+    """
+    templates = {1: [TEMP1], 2: [TEMP2]}
+    client.api.templates.side_effect = lambda project_id: templates[project_id]
+
+    with mock.patch.object(client, 'projects') as proj_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1}),
+                                  models.Project(client, {'id': 2})]
+        client.build_template_index()
+
+        templates[2] = [TEMP2, TEMP3]
+        template = client.template(993)
+
+    assert template.id == 993
+    assert client.api.templates.call_args_list == [mock.call(1), mock.call(2), mock.call(1), mock.call(2)]
+    client.api.templates.invalidate.assert_has_calls([mock.call('project_id', [1]),
+                                                      mock.call('project_id', [2])])
+
+
+def test_template_index_expires(client):
+    """ Verify the template index expires with the models.Template cache timeout """
+    client.api.cache_timeouts = {models.Template: 300}
+    client.api.templates.side_effect = lambda project_id: [TEMP1]
+
+    with mock.patch.object(client, 'projects') as proj_mock, \
+            mock.patch('traw.client.time.time') as time_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1})]
+        time_mock.return_value = 1000
+        client.build_template_index()
+        time_mock.return_value = 1299
+        client.build_template_index()
+        assert client.api.templates.call_count == 1
+
+        time_mock.return_value = 1300
+        assert client.template(991).id == 991
+
+    assert client.api.templates.call_count == 2
+    assert not client.api.templates.invalidate.called
+
+
+def test_clear_cache_template_index(client):
+    """ Verify clearing the models.Template cache clears the template index """
+    client.api.templates.side_effect = lambda project_id: [TEMP1]
+
+    with mock.patch.object(client, 'projects') as proj_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1})]
+        client.build_template_index()
+        client.clear_cache(models.Template)
+        client.build_template_index()
+        client.clear_cache()
+        client.build_template_index()
+
+    assert client.api.templates.call_count == 3
+
+
+@pytest.mark.parametrize('workers', [None, 4])
+def test_build_template_index(client, workers):
+    """ Verify ``build_template_index`` indexes every project's templates """
+    templates = {1: [TEMP1], 2: [TEMP2, TEMP1], 3: [TEMP3]}
+    client.api.templates.side_effect = lambda project_id: templates[project_id]
+
+    with mock.patch.object(client, 'projects') as proj_mock:
+        proj_mock.return_value = [models.Project(client, {'id': 1}),
+                                  models.Project(client, {'id': 2}),
+                                  models.Project(client, {'id': 3})]
+        client.build_template_index(workers=workers)
+        assert client.api.templates.call_count == 3
+
+        client.build_template_index(workers=workers)
+        assert client.api.templates.call_count == 3
+
+        assert [client.template(tid).id for tid in (991, 992, 993)] == [991, 992, 993]
+
+    assert client.api.templates.call_count == 3
+
+
 def test_templates_exception(client):
     """ Verify an exception is thrown if templates is called with no parameters """
     with pytest.raises(NotImplementedError) as exc:
@@ -3586,27 +3864,25 @@ def test_users(client):
 def test_change_cache_timeout_single_change(client):
     """ Verify change_cache_timeout works for a single object type """
     client.api.cache_timeouts = dict()
-    client.api.cache_timeouts[client.api] = dict()
 
-    assert client.api.cache_timeouts[client.api] == dict()
+    assert client.api.cache_timeouts == dict()
 
     client.change_cache_timeout(30, models.Project)
 
-    assert client.api.cache_timeouts[client.api][models.Project] == 30
+    assert client.api.cache_timeouts[models.Project] == 30
 
 
 def test_change_cache_timeout_change_all(client):
     """ Verify change_cache_timeout works for all object types """
     client.api.cache_timeouts = dict()
-    client.api.cache_timeouts[client.api] = dict()
 
-    assert client.api.cache_timeouts[client.api] == dict()
+    assert client.api.cache_timeouts == dict()
 
     client.change_cache_timeout(30)
 
     for cls_name in models.__all__:
         cls = getattr(models, cls_name)
-        assert client.api.cache_timeouts[client.api][cls] == 30
+        assert client.api.cache_timeouts[cls] == 30
 
 
 def test_change_cache_timeout_exc(client):
@@ -3617,6 +3893,33 @@ def test_change_cache_timeout_exc(client):
     assert "found class of type {0}".format(type(1234)) in str(exc)
 
 
+def test_change_cache_limits_single_change(client):
+    """ Verify change_cache_limits works for a single object type """
+    client.api.cache_limits = dict()
+
+    client.change_cache_limits(10, 2048, models.Result)
+
+    assert client.api.cache_limits == {
+        models.Result: dict(max_entries=10, max_bytes=2048)}
+
+
+def test_change_cache_limits_change_all(client):
+    """ Verify change_cache_limits works for all object types """
+    client.api.cache_limits = dict()
+
+    client.change_cache_limits(max_entries=10)
+
+    for cls_name in models.__all__:
+        cls = getattr(models, cls_name)
+        assert client.api.cache_limits[cls] == dict(max_entries=10, max_bytes=None)
+
+
+def test_change_cache_limits_exc(client):
+    """ Verify change_cache_limits raises an exception """
+    with pytest.raises(TypeError):
+        client.change_cache_limits(10, model_cls=type(1234))
+
+
 def test_clear_cache(client):
     """ Verify the Client's ``clear_cache`` method call """
     client.clear_cache()
@@ -3644,3 +3947,261 @@ def test_clear_cache(client):
     assert client.api.user_by_email.cache.clear.called
     assert client.api.user_by_id.cache.clear.called
     assert client.api.users.cache.clear.called
+
+
+def test_status_index_built_once_per_cache_period(full_client):
+    """ Verify status lookups share one index until the statuses cache changes """
+    full_client.api._session.request.return_value = [STAT1, STAT2, STAT3]
+
+    status = full_client.status(222)
+    assert full_client.status('FAILED') is status
+    assert full_client.status('failed', strict=True).id == 223
+    assert full_client.status(222) is status
+    assert full_client.api._session.request.call_count == 1
+
+    full_client.clear_cache(models.Status)
+    assert full_client.status(222) is not status
+    assert full_client.api._session.request.call_count == 2
+
+
+def test_status_index_missing(full_client):
+    """ Verify indexed lookups still raise for unknown ids and labels """
+    full_client.api._session.request.return_value = [STAT1, STAT2]
+
+    with pytest.raises(TRAWClientError):
+        full_client.status(999)
+
+    with pytest.raises(TRAWClientError):
+        full_client.status('failed', strict=True)
+
+
+def test_priority_and_case_type_indexes(full_client):
+    """ Verify priorities and case types are served from indexes """
+    full_client.api._session.request.side_effect = [[PRIO1], [CT1]]
+
+    assert full_client.priority(111) is full_client.priority(111)
+    assert full_client.case_type(331) is full_client.case_type(331)
+    assert full_client.api._session.request.call_count == 2
+
+
+def _routed_requests(responses):
+    """ Returns a session.request side effect that answers by request path """
+    def request(method, path, params=None, **kwargs):  # pylint: disable=unused-argument
+        return responses[path]
+    return request
+
+
+def test_resolve_tests(full_client):
+    """ Verify ``resolve`` loads the cases and users of tests in bulk """
+    tests = [models.Test(full_client, {'id': 1, 'case_id': 991, 'run_id': 7, 'assignedto_id': 5}),
+             models.Test(full_client, {'id': 2, 'case_id': 992, 'run_id': 7, 'assignedto_id': 6}),
+             models.Test(full_client, {'id': 3, 'case_id': 991, 'run_id': 7, 'assignedto_id': None})]
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_run/7': {'id': 7, 'project_id': 15, 'suite_id': 4},
+        'get_cases/15': [CASE1, CASE2, CASE3],
+        'get_users': [{'id': 5, 'name': 'user5'}, {'id': 6, 'name': 'user6'}]})
+
+    assert full_client.resolve(iter(tests), 'case', 'assigned_to') == tests
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert paths == ['get_run/7', 'get_cases/15', 'get_users']
+    params = full_client.api._session.request.call_args_list[1][1]['params']
+    assert params['suite_id'] == 4
+
+    assert [test.case.id for test in tests] == [991, 992, 991]
+    assert [test.assigned_to.id for test in tests[:2]] == [5, 6]
+    assert tests[2].assigned_to is None
+    assert full_client.api._session.request.call_count == 3
+
+
+def test_resolve_fetches_remainder(full_client):
+    """ Verify ``resolve`` individually fetches related objects that were not
+        listed, or that cannot be listed, once per id
+    """
+    results = [models.Result(full_client, {'id': 1, 'test_id': 11, 'created_by': 5}),
+               models.Result(full_client, {'id': 2, 'test_id': 11, 'created_by': 8}),
+               models.Result(full_client, {'id': 3, 'test_id': 12, 'created_by': 5})]
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_test/11': {'id': 11}, 'get_test/12': {'id': 12},
+        'get_users': [{'id': 5}], 'get_user/8': {'id': 8}})
+
+    full_client.resolve(results, 'test', 'created_by', workers=2)
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert sorted(paths) == ['get_test/11', 'get_test/12', 'get_user/8', 'get_users']
+
+    assert [result.test.id for result in results] == [11, 11, 12]
+    assert [result.created_by.id for result in results] == [5, 8, 5]
+    assert full_client.api._session.request.call_count == 4
+
+
+def test_resolve_skips_cached(full_client):
+    """ Verify ``resolve`` does not reload related objects that are cached """
+    full_client.api._session.request.return_value = {'id': 15, 'project_id': 3}
+    full_client.suite(15)
+    full_client.api._session.request.reset_mock()
+
+    cases = [models.Case(full_client, {'id': 1, 'suite_id': 15})]
+    full_client.resolve(cases, 'suite')
+
+    assert not full_client.api._session.request.called
+
+
+def test_resolve_above_cache_limit(full_client):
+    """ Verify ``resolve`` loads more related objects than their cache holds,
+        and restores the cache's limits
+    """
+    full_client.change_cache_limits(max_entries=2, model_cls=models.User)
+    tests = [models.Test(full_client, {'id': tid, 'assignedto_id': tid}) for tid in (5, 6, 7)]
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_users': [{'id': 5}, {'id': 6}, {'id': 7}]})
+
+    full_client.resolve(tests, 'assigned_to')
+
+    assert [test.assigned_to.id for test in tests] == [5, 6, 7]
+    assert full_client.api._session.request.call_count == 1
+    assert full_client.api.cache_limits[models.User] == dict(max_entries=2, max_bytes=None)
+
+
+def test_resolve_milestones(full_client):
+    """ Verify ``resolve`` caches milestones with their sub-milestones """
+    runs = [models.Run(full_client, {'id': 1, 'project_id': 15, 'milestone_id': 3}),
+            models.Run(full_client, {'id': 2, 'project_id': 15, 'milestone_id': 4})]
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_milestones/15': [{'id': 3}],
+        'get_milestone/3': {'id': 3, 'milestones': [{'id': 4}]},
+        'get_milestone/4': {'id': 4, 'parent_id': 3, 'milestones': list()}})
+
+    full_client.resolve(runs, 'milestone')
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert paths == ['get_milestone/3', 'get_milestone/4']
+
+    assert [sub.id for sub in full_client.milestone(3).sub_milestones] == [4]
+    assert list(full_client.milestone(4).sub_milestones) == list()
+    assert full_client.api._session.request.call_count == 2
+
+
+def test_resolve_exc(client):
+    """ Verify ``resolve`` rejects unknown relations and keyword arguments """
+    with pytest.raises(ValueError) as exc:
+        client.resolve([], 'case', 'asdf')
+
+    assert "Cannot resolve 'asdf'" in str(exc)
+
+    with pytest.raises(TypeError):
+        client.resolve([], 'case', prefetch=True)
+
+
+def test_cases_by_ids(full_client):
+    """ Verify ``client.cases(list)`` lists the cases in bulk, and only fetches
+        cases that were not listed individually
+    """
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_cases/15': [CASE1, CASE3], 'get_case/992': CASE2})
+
+    cases = list(full_client.cases([993, 991, 992], project=15, suite=models.Suite(full_client, {'id': 4})))
+
+    assert [case.id for case in cases] == [993, 991, 992]
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert paths == ['get_cases/15', 'get_case/992']
+    assert full_client.api._session.request.call_args_list[0][1]['params']['suite_id'] == 4
+
+
+def test_cases_by_ids_above_cache_limit(full_client):
+    """ Verify ``client.cases(list)`` does not fetch listed cases individually
+        when there are more of them than the case cache holds
+    """
+    full_client.change_cache_limits(max_entries=2, model_cls=models.Case)
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_cases/15': [CASE1, CASE2, CASE3]})
+
+    cases = list(full_client.cases([993, 992, 991], project=15))
+
+    assert [case.id for case in cases] == [993, 992, 991]
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert paths == ['get_cases/15']
+
+
+def test_cases_by_ids_wo_project(full_client):
+    """ Verify ``client.cases(list)`` fetches cases individually without a project """
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_case/991': CASE1, 'get_case/992': CASE2})
+
+    assert [case.id for case in full_client.cases([991, 992])] == [991, 992]
+    assert full_client.api._session.request.call_count == 2
+
+
+def test_run_cases_listed_in_bulk(full_client):
+    """ Verify ``run.cases`` lists the run's cases from its suite """
+    full_client.api._session.request.side_effect = _routed_requests({
+        'get_cases/15': [CASE1, CASE2, CASE3]})
+    run = models.Run(full_client, {'id': 7, 'project_id': 15, 'suite_id': 4,
+                                   'case_ids': [991, 993]})
+
+    assert [case.id for case in run.cases] == [991, 993]
+    assert full_client.api._session.request.call_count == 1
+
+
+def test_identity_map(full_client):
+    """ Verify a client with an identity map returns one model object per
+        TestRail object, refreshed with the latest response
+    """
+    client = traw.Client(username=USER, password=PASS, url=URL, identity_map=True)
+    client.api._session.request.side_effect = [{'id': 15, 'name': 'user15'},
+                                               [{'id': 15, 'name': 'renamed'}, {'id': 16}]]
+
+    user = client.user(15)
+    assert client.user(15) is user
+    assert client.api._session.request.call_count == 1
+
+    users = list(client.users())
+    assert users[0] is user
+    assert user.name == 'renamed'
+
+
+def test_identity_map_keeps_local_edits(full_client):
+    """ Verify a client with an identity map does not refresh model objects
+        that have local edits
+    """
+    client = traw.Client(username=USER, password=PASS, url=URL, identity_map=True)
+    client.api._session.request.side_effect = [{'id': 1, 'name': 'orig'},
+                                               [{'id': 1, 'name': 'renamed'}]]
+
+    run = client.run(1)
+    run.name = 'edited'
+
+    assert client.run(1) is run
+    assert list(client.runs(15))[0] is run
+    assert run.name == 'edited'
+
+
+def test_identity_map_releases_unused_objects(full_client):
+    """ Verify the identity map does not keep model objects alive """
+    client = traw.Client(username=USER, password=PASS, url=URL, identity_map=True)
+    client.api._session.request.return_value = {'id': 15}
+
+    client.user(15)
+    gc.collect()
+
+    assert len(client._identity_map) == 0
+
+
+def test_no_identity_map(full_client):
+    """ Verify clients return new model objects by default """
+    full_client.api._session.request.return_value = {'id': 15}
+
+    assert full_client.user(15) is not full_client.user(15)
+    assert full_client.user(15) == full_client.user(15)
+
+
+def test_cached_content_copy_on_write(full_client):
+    """ Verify models share cached responses until they are edited, and that
+        edits do not reach the cache
+    """
+    full_client.api._session.request.return_value = {'id': 5, 'name': 'run name'}
+
+    run = full_client.run(5)
+    assert full_client.run(5)._content is run._content
+
+    run.name = 'edited name'
+    assert run.name == 'edited name'
+    assert full_client.run(5).name == 'run name'
+    assert full_client.api._session.request.call_count == 1
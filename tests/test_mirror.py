@@ -0,0 +1,174 @@
+from datetime import datetime
+import os
+
+import pytest
+
+from traw import Mirror, models
+from traw.exceptions import TRAWClientError
+
+PROJECT_ID = 15
+
+
+class FakeTestRail(object):
+    """ Answers the requests a mirror sync makes from in-memory objects, and
+        records them
+    """
+    def __init__(self):
+        self.project = {'id': PROJECT_ID, 'suite_mode': 2}
+        self.suites = [{'id': 1}, {'id': 2}]
+        self.cases = [{'id': 991, 'suite_id': 1, 'priority_id': 4, 'updated_on': 100},
+                      {'id': 992, 'suite_id': 1, 'priority_id': 2, 'updated_on': 200},
+                      {'id': 993, 'suite_id': 2, 'priority_id': 4, 'updated_on': 150}]
+        self.runs = [{'id': 7, 'suite_id': 1, 'is_completed': True, 'created_on': 300},
+                     {'id': 8, 'suite_id': 1, 'is_completed': False, 'created_on': 400}]
+        self.tests = {7: [{'id': 71, 'run_id': 7, 'case_id': 991, 'status_id': 1}],
+                      8: [{'id': 81, 'run_id': 8, 'case_id': 991, 'status_id': 3},
+                          {'id': 82, 'run_id': 8, 'case_id': 992, 'status_id': 3}]}
+        self.results = {7: [{'id': 701, 'test_id': 71, 'status_id': 1, 'created_on': 350}],
+                        8: list()}
+        self.requests = list()
+
+    def request(self, method, path, params=None, **kwargs):  # pylint: disable=unused-argument
+        params = dict(params or dict())
+        self.requests.append((path, params))
+        if params.pop('offset', 0):
+            return list()
+
+        name, _, obj_id = path.partition('/')
+        if name == 'get_project':
+            return self.project
+        elif name == 'get_suites':
+            return self.suites
+        elif name == 'get_cases':
+            return [case for case in self.cases if case['suite_id'] == params['suite_id'] and
+                    case['updated_on'] > params.get('updated_after', -1)]
+        elif name == 'get_runs':
+            return [run for run in self.runs if run['created_on'] > params.get('created_after', -1) and
+                    run['is_completed'] == params.get('is_completed', run['is_completed'])]
+        elif name == 'get_tests':
+            return self.tests[int(obj_id)]
+
+        return [result for result in self.results[int(obj_id)]
+                if result['created_on'] > params.get('created_after', -1)]
+
+
+@pytest.fixture()
+def testrail(full_client):
+    fake = FakeTestRail()
+    full_client.api._session.request.side_effect = fake.request
+    yield fake
+
+
+@pytest.fixture()
+def mirror(full_client, tmpdir):
+    yield Mirror(full_client, PROJECT_ID, os.path.join(str(tmpdir), 'mirror.sqlite'))
+
+
+def test_sync_and_query(mirror, testrail):
+    """ Verify a sync mirrors the project, and queries return models """
+    mirror.sync()
+
+    cases = list(mirror.cases())
+    assert [case.id for case in cases] == [991, 992, 993]
+    assert all(isinstance(case, models.Case) for case in cases)
+    assert [run.id for run in mirror.runs()] == [7, 8]
+    assert [test.id for test in mirror.tests()] == [71, 81, 82]
+    assert [result.id for result in mirror.results(run=7)] == [701]
+    assert isinstance(next(mirror.results()), models.Result)
+
+
+def test_query_filters(mirror, testrail):
+    """ Verify queries filter by models, ids, lists, None and times """
+    mirror.sync()
+
+    assert [case.id for case in mirror.cases(priority=4)] == [991, 993]
+    assert [case.id for case in mirror.cases(priority=4, suite=1)] == [991]
+    assert [case.id for case in mirror.cases(updated_after=100)] == [992, 993]
+    assert [case.id for case in mirror.cases(updated_before=datetime.fromtimestamp(150))] == [991]
+    assert [case.id for case in mirror.cases(milestone=None)] == [991, 992, 993]
+    assert [run.id for run in mirror.runs(is_completed=False)] == [8]
+    assert [test.id for test in mirror.tests(case=[992, 993])] == [82]
+    run = models.Run(mirror.client, {'id': 8})
+    assert [test.id for test in mirror.tests(run=run, status=3)] == [81, 82]
+    assert [result.id for result in mirror.results(test=71)] == [701]
+
+    with pytest.raises(TRAWClientError) as exc:
+        list(mirror.tests(created_after=100))
+    assert 'created_after' in str(exc)
+
+
+def test_incremental_sync(mirror, testrail):
+    """ Verify later syncs only request what may have changed, and merge it in """
+    mirror.sync()
+    testrail.cases[1] = dict(testrail.cases[1], title='updated', updated_on=500)
+    testrail.runs[1] = dict(testrail.runs[1], is_completed=True)
+    testrail.runs.append({'id': 9, 'suite_id': 2, 'is_completed': False, 'created_on': 600})
+    testrail.tests[8][0] = dict(testrail.tests[8][0], status_id=1)
+    testrail.tests[9] = [{'id': 91, 'run_id': 9, 'case_id': 993, 'status_id': 3}]
+    testrail.results[8].append({'id': 801, 'test_id': 81, 'status_id': 1, 'created_on': 550})
+    testrail.results[9] = list()
+    del testrail.requests[:]
+
+    mirror.sync()
+
+    requests = [(path, params) for path, params in testrail.requests if params.pop('offset', 0) == 0]
+    assert requests == [('get_cases/15', {'suite_id': 1, 'updated_after': 199}),
+                        ('get_cases/15', {'suite_id': 2, 'updated_after': 149}),
+                        ('get_runs/15', {'created_after': 399}),
+                        ('get_runs/15', {'is_completed': 0}),
+                        ('get_runs/15', {'is_completed': 1, 'created_after': 399}),
+                        ('get_tests/8', dict()),
+                        ('get_results_for_run/8', dict()),
+                        ('get_tests/9', dict()),
+                        ('get_results_for_run/9', dict())]
+
+    assert [case.title for case in mirror.cases(suite=1)] == [None, 'updated']
+    assert [run.id for run in mirror.runs(is_completed=True)] == [7, 8]
+    assert [test.id for test in mirror.tests(status=1)] == [71, 81]
+    assert [result.id for result in mirror.results(run=8)] == [801]
+
+    del testrail.requests[:]
+    mirror.sync()
+    result_requests = [params for path, params in testrail.requests
+                       if path == 'get_results_for_run/9' and not params.get('offset', 0)]
+    assert result_requests == [dict()]
+    assert [path for path, _ in testrail.requests if path.startswith('get_tests')] == ['get_tests/9']
+
+
+def test_full_sync_drops_deleted(mirror, testrail):
+    """ Verify a full sync removes objects deleted from TestRail """
+    mirror.sync()
+    del testrail.cases[0]
+    del testrail.runs[0]
+
+    mirror.sync()
+    assert [case.id for case in mirror.cases()] == [991, 992, 993]
+
+    mirror.sync(full=True)
+    assert [case.id for case in mirror.cases()] == [992, 993]
+    assert [run.id for run in mirror.runs()] == [8]
+
+
+def test_full_sync_drops_children_of_deleted(mirror, testrail):
+    """ Verify a full sync removes the tests and results of deleted runs, and
+        the cases of deleted suites
+    """
+    mirror.sync(full=True)
+    del testrail.runs[0]
+    del testrail.suites[1]
+
+    mirror.sync(full=True)
+
+    assert [run.id for run in mirror.runs()] == [8]
+    assert [test.id for test in mirror.tests()] == [81, 82]
+    assert list(mirror.results()) == list()
+    assert [case.id for case in mirror.cases()] == [991, 992]
+
+
+def test_one_project_per_database(mirror, full_client):
+    """ Verify a database cannot mirror two projects """
+    with pytest.raises(TRAWClientError) as exc:
+        Mirror(full_client, models.Project(full_client, {'id': 16}), mirror.path)
+    assert 'mirrors project 15' in str(exc)
+
+    assert Mirror(full_client, models.Project(full_client, {'id': PROJECT_ID}), mirror.path)
@@ -0,0 +1,122 @@
+import mock
+import pytest
+
+from traw import ratelimit
+from traw.exceptions import TRAWClientError
+from traw.ratelimit import FileTokenBucket, TokenBucket, shared_bucket
+
+
+@pytest.fixture()
+def clock():
+    with mock.patch('traw.ratelimit.time') as time_mock:
+        time_mock.time.return_value = 1000.0
+        yield time_mock
+
+
+@pytest.fixture()
+def buckets():
+    with mock.patch.object(ratelimit, '_buckets', dict()) as buckets_mock:
+        yield buckets_mock
+
+
+def test___init___rejects_bad_rate():
+    """ Verify a non-positive rate is rejected """
+    with pytest.raises(TRAWClientError):
+        TokenBucket(0)
+
+
+def test_reserve_within_burst(clock):
+    """ Verify requests within the burst size do not wait """
+    bucket = TokenBucket(60, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+
+
+def test_reserve_waits_once_empty(clock):
+    """ Verify requests wait for the bucket to refill once it is empty """
+    bucket = TokenBucket(60, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    # One token per second; each reservation waits behind the one before it
+    assert bucket.reserve() == pytest.approx(1)
+    assert bucket.reserve() == pytest.approx(2)
+
+
+def test_reserve_refills_over_time(clock):
+    """ Verify the bucket refills at ``rate`` tokens per ``per`` seconds """
+    bucket = TokenBucket(60, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.time.return_value = 1001.5
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_refill_capped_at_burst(clock):
+    """ Verify an idle bucket refills to no more than ``burst`` tokens """
+    bucket = TokenBucket(60, burst=2)
+    clock.time.return_value = 5000.0
+
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() == pytest.approx(1)
+
+
+def test_acquire_sleeps(clock):
+    """ Verify ``acquire`` sleeps for as long as ``reserve`` says to wait """
+    bucket = TokenBucket(60, burst=1)
+    bucket.acquire()
+    assert not clock.sleep.called
+
+    bucket.acquire()
+    clock.sleep.assert_called_once_with(pytest.approx(1))
+
+
+def test_pause(clock):
+    """ Verify ``pause`` empties the bucket and holds back refills """
+    bucket = TokenBucket(60, burst=10)
+    bucket.pause(30)
+
+    assert bucket.reserve() == pytest.approx(31)
+
+
+def test_file_token_bucket_shared_between_instances(clock, tmpdir):
+    """ Verify FileTokenBucket instances for the same file share tokens """
+    path = str(tmpdir.join('traw.bucket'))
+    bucket1 = FileTokenBucket(path, 60, burst=2)
+    bucket2 = FileTokenBucket(path, 60, burst=2)
+
+    try:
+        assert bucket1.reserve() == 0
+        assert bucket2.reserve() == 0
+        assert bucket1.reserve() == pytest.approx(1)
+
+        bucket2.pause(10)
+        assert bucket1.reserve() == pytest.approx(12)
+    finally:
+        bucket1.close()
+        bucket2.close()
+
+
+def test_shared_bucket(buckets):
+    """ Verify buckets are shared by key within the process """
+    bucket = shared_bucket('http://mock.url', 60)
+
+    assert isinstance(bucket, TokenBucket)
+    assert shared_bucket('http://mock.url', 120) is bucket
+    assert shared_bucket('http://other.url', 60) is not bucket
+
+
+def test_shared_bucket_w_path(buckets, tmpdir):
+    """ Verify a path makes ``shared_bucket`` return a FileTokenBucket """
+    path = str(tmpdir.join('traw.bucket'))
+    bucket = shared_bucket('http://mock.url', 60, path=path)
+
+    try:
+        assert isinstance(bucket, FileTokenBucket)
+        assert bucket.path == path
+        assert shared_bucket('http://mock.url', 60) is not bucket
+    finally:
+        bucket.close()
@@ -0,0 +1,196 @@
+import threading
+
+import mock
+import pytest
+
+from traw import models, reporter as reporter_module
+from traw.exceptions import ServiceUnavailableError, TRAWClientError
+from traw.reporter import ResultReporter
+
+RUN_ID = 881
+
+
+@pytest.fixture()
+def client():
+    client_mock = mock.MagicMock()
+    client_mock.add_results.side_effect = lambda run, results, max_bytes: results
+    client_mock.add_results_for_cases.side_effect = lambda run, results, max_bytes: results
+    yield client_mock
+
+
+@pytest.fixture()
+def reporter(client):
+    result_reporter = ResultReporter(client, RUN_ID, flush_size=3, flush_interval=3600)
+    yield result_reporter
+    result_reporter.close()
+
+
+def result(test_id=None, **content):
+    if test_id is not None:
+        content['test_id'] = test_id
+    return models.Result(None, content)
+
+
+def test_add_queues_until_flush(reporter, client):
+    """ Verify results are not reported until a flush """
+    reporter.add(result(1))
+    reporter.add(result(2))
+    assert not client.add_results.called
+
+    assert reporter.flush(timeout=5)
+
+    assert client.add_results.call_count == 1
+    run_id, results = client.add_results.call_args[0]
+    assert run_id == RUN_ID
+    assert [r._content['test_id'] for r in results] == [1, 2]
+
+
+def test_add_flushes_at_flush_size(reporter, client):
+    """ Verify a full batch is reported without waiting for a flush """
+    for test_id in range(3):
+        reporter.add(result(test_id))
+
+    reporter.flush(timeout=5)
+    assert client.add_results.call_count == 1
+    assert len(client.add_results.call_args[0][1]) == 3
+
+
+def test_flushes_after_flush_interval(client):
+    """ Verify queued results are reported once ``flush_interval`` passes """
+    with ResultReporter(client, RUN_ID, flush_size=100, flush_interval=0) as reporter:
+        reporter.add(result(1))
+
+        while not client.add_results.called:
+            pass
+
+    assert client.add_results.call_count == 1
+
+
+def test_add_for_case(reporter, client):
+    """ Verify results for cases are reported with add_results_for_cases """
+    case_result = result(status_id=1)
+    reporter.add_for_case(991, case_result)
+    reporter.flush(timeout=5)
+
+    assert client.add_results_for_cases.call_args[0] == (RUN_ID, [(991, case_result)])
+    assert not client.add_results.called
+
+
+def test_add_requires_result(reporter):
+    """ Verify only models.Result objects with a test can be reported """
+    with pytest.raises(TypeError):
+        reporter.add({'test_id': 1})
+
+    with pytest.raises(TRAWClientError):
+        reporter.add(result())
+
+    with pytest.raises(TypeError):
+        reporter.add_for_case(991, {'status_id': 1})
+
+
+def test_service_unavailable_retried(reporter, client):
+    """ Verify flushes are retried with backoff while TestRail is unavailable """
+    client.add_results.side_effect = [ServiceUnavailableError(mock.MagicMock()),
+                                      ServiceUnavailableError(mock.MagicMock()),
+                                      list()]
+    with mock.patch('traw.reporter.time.sleep') as sleep_mock:
+        reporter.add(result(1))
+        reporter.flush(timeout=5)
+
+    assert client.add_results.call_count == 3
+    assert sleep_mock.call_args_list == [mock.call(1), mock.call(2)]
+    assert reporter.failed == list()
+
+
+def test_only_failed_request_retried(client):
+    """ Verify a flush that takes several requests only retries the request
+        that failed, so reported results are not added again
+    """
+    client.add_results.side_effect = [list(), ServiceUnavailableError(mock.MagicMock()), list()]
+    results = [result(test_id) for test_id in range(4)]
+
+    with mock.patch('traw.reporter.time.sleep'):
+        with ResultReporter(client, RUN_ID, max_bytes=300) as reporter:
+            for reported in results:
+                reporter.add(reported)
+
+    sent = [call[0][1] for call in client.add_results.call_args_list]
+    assert sent == [results[:2], results[2:], results[2:]]
+    assert client.add_results.call_args[1] == {'max_bytes': 300}
+    assert reporter.failed == list()
+
+
+def test_failed_results_kept(client):
+    """ Verify results are kept in ``failed`` once retries are exhausted """
+    client.add_results.side_effect = ServiceUnavailableError(mock.MagicMock())
+    failed_result = result(1)
+
+    with mock.patch('traw.reporter.time.sleep'):
+        with ResultReporter(client, RUN_ID, retries=2) as reporter:
+            reporter.add(failed_result)
+
+    assert client.add_results.call_count == 3
+    assert reporter.failed == [failed_result]
+
+
+def test_close_flushes_and_stops(client):
+    """ Verify ``close`` reports queued results and stops the reporter """
+    reporter = ResultReporter(client, RUN_ID)
+    reporter.add(result(1))
+    reporter.close()
+
+    assert client.add_results.call_count == 1
+    assert not reporter._thread.is_alive()
+    assert reporter not in reporter_module._open_reporters
+
+    with pytest.raises(TRAWClientError):
+        reporter.add(result(2))
+
+
+def test_concurrent_close(client):
+    """ Verify concurrent ``close`` calls stop the reporter once, and nothing
+        is queued after it stops
+    """
+    reporter = ResultReporter(client, RUN_ID)
+    reporter.add(result(1))
+    closers = [threading.Thread(target=reporter.close) for _ in range(8)]
+    for closer in closers:
+        closer.start()
+    for closer in closers:
+        closer.join()
+
+    assert reporter._queue.empty()
+    with pytest.raises(TRAWClientError):
+        reporter.add(result(2))
+    assert reporter._queue.empty()
+    assert client.add_results.call_count == 1
+
+
+def test_open_reporters_closed_at_exit(client):
+    """ Verify the exit handler flushes every open reporter """
+    reporter = ResultReporter(client, RUN_ID)
+    reporter.add(result(1))
+
+    reporter_module._close_open_reporters()
+
+    assert client.add_results.call_count == 1
+    assert reporter._closed
+
+
+def test_exit_gives_up_after_timeout(client, caplog):
+    """ Verify the exit handler does not wait on TestRail past its timeout,
+        and logs how many results were not reported
+    """
+    release = threading.Event()
+    client.add_results.side_effect = lambda run, results, max_bytes: release.wait(5)
+    reporter = ResultReporter(client, RUN_ID)
+    reporter.add(result(1))
+    reporter.add(result(2))
+
+    reporter_module._close_open_reporters(timeout=0.1)
+
+    assert reporter._closed
+    assert 'Gave up on reporting 2 results' in caplog.text
+    release.set()
+    reporter._thread.join(5)
+    assert reporter._unreported == 0
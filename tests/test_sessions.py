@@ -6,7 +6,7 @@ import time
 
 from traw.sessions import Session
 from traw import exceptions
-from traw.const import GET, BASE_API_PATH as BAP, API_PATH as AP
+from traw.const import GET, POST, BASE_API_PATH as BAP, API_PATH as AP
 
 UNAME = 'mock username'
 PWORD = 'mock password'
@@ -86,6 +86,28 @@ def test_request_with_params(req_mock, session):
     assert req_mock.call_args == exp_call
 
 
+def test_request_get_coalesced(session):
+    """ Validate GET requests are made through the single-flight group """
+    session._inflight = mock.MagicMock()
+    session.request(method=GET, path=AP['get_projects'], params={'b': 2, 'a': 1})
+
+    exp_url = URL + BAP + '/' + AP['get_projects']
+    exp_key = (exp_url, "[('a', 1), ('b', 2)]")
+    assert session._inflight.do.call_args == mock.call(
+        exp_key, session._request_with_retries,
+        method=GET, json=None, params={'a': 1, 'b': 2}, url=exp_url)
+
+
+@mock.patch.object(Session, '_request_with_retries')
+def test_request_post_not_coalesced(req_mock, session):
+    """ Validate POST requests are never shared """
+    session._inflight = mock.MagicMock()
+    session.request(method=POST, path=AP['add_project'], json={'name': 'mock'})
+
+    assert not session._inflight.do.called
+    assert req_mock.called
+
+
 @mock.patch.object(Session, '_make_request')
 def test_req_w_retries_bad_gateway(make_req_mock, session, response):
     """ Validate _request_with_retries exception logic for bad_gateway """
@@ -113,6 +135,23 @@ def test_req_w_retries_rate_limited(make_req_mock, session, response):
     assert str(time.sleep.mock_obj.call_args_list).count('60') == 3
 
 
+@mock.patch.object(Session, '_make_request')
+def test_req_w_retries_rate_limiter(make_req_mock, session, response):
+    """ Validate every request attempt takes a token from the rate limiter,
+        and that a 429 pauses the limiter for Retry-After seconds
+    """
+    session._rate_limiter = mock.MagicMock()
+    response.status_code = 429
+    response.headers = {'Retry-After': 60}
+    make_req_mock.return_value = response
+
+    with pytest.raises(exceptions.RateLimited):
+        session._request_with_retries()
+
+    assert session._rate_limiter.acquire.call_count == 3
+    assert session._rate_limiter.pause.call_args_list == [mock.call(60)] * 3
+
+
 @mock.patch.object(Session, '_make_request')
 def test_req_w_retries_bad_request(make_req_mock, session, response):
     """ Validate _request_with_retries exception logic for bad_request """
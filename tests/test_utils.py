@@ -1,10 +1,15 @@
+import gc
+import json
 from datetime import timedelta as td
 import mock
 import pytest
+import threading
+import time
+import weakref
 
 import traw
 from traw.const import GET, API_PATH as AP
-from traw.utils import dispatchmethod, duration_to_timedelta
+from traw.utils import SingleFlight, cache_key, chunk_by_size, dispatchmethod, duration_to_timedelta
 
 MOCK_USERNAME = 'mock username'
 MOCK_USER_API_KEY = 'mock user api key'
@@ -114,6 +119,172 @@ def test_paginate_w_limit(api):
     assert api._session.request.call_args_list == [exp_call_1, exp_call_2, exp_call_3]
 
 
+def _pages(*pages):
+    """ Returns a request side_effect that serves ``pages`` by offset """
+    def _request(method, path, params):
+        index = params['offset'] // 250
+        page = pages[index] if index < len(pages) else []
+        return page[:params.get('limit', len(page))]
+    return _request
+
+
+def test_paginate_w_workers(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = _pages([1] * 250, [2] * 250, [3] * 50)
+
+    results = list(api.results_by_test_id(1, workers=3))
+
+    assert results == [1] * 250 + [2] * 250 + [3] * 50
+    offsets = sorted(c[1]['params']['offset'] for c in api._session.request.call_args_list)
+    # Windows past the short page may be requested speculatively, but never
+    # more than ``workers`` at a time
+    assert offsets[:3] == [0, 250, 500]
+    assert len(offsets) <= 5
+
+
+def test_paginate_w_workers_stops_at_short_page(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = _pages([1] * 250, [2] * 10, [3] * 250)
+
+    results = list(api.results_by_test_id(1, workers=2))
+
+    assert results == [1] * 250 + [2] * 10
+
+
+def test_paginate_w_workers_w_limit(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = _pages([1] * 250, [2] * 250, [3] * 250)
+
+    results = list(api.results_by_test_id(1, limit=525, workers=4))
+
+    assert results == [1] * 250 + [2] * 250 + [3] * 25
+    params = sorted((c[1]['params'] for c in api._session.request.call_args_list),
+                    key=lambda p: p['offset'])
+    assert params == [{'offset': 0, 'limit': 250},
+                      {'offset': 250, 'limit': 250},
+                      {'offset': 500, 'limit': 25}]
+
+
+@pytest.mark.parametrize('count', [250, 300])
+@pytest.mark.parametrize('workers', [None, 3])
+def test_paginate_server_ignores_offset(api, count, workers):
+    """ Verify paging stops when the server returns every object for every
+        offset, as TestRail servers that do not page an endpoint do
+    """
+    tests = [{'id': tid} for tid in range(count)]
+    api._session.request.side_effect = lambda method, path, params: tests
+
+    assert list(api._tests(7, workers=workers)) == tests
+    assert api._session.request.call_count <= (2 if workers is None else 4)
+
+
+def test_paginate_w_prefetch(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = _pages([1] * 250, [2] * 250, [3] * 50)
+
+    results = list(api.results_by_test_id(1, prefetch=2))
+
+    assert results == [1] * 250 + [2] * 250 + [3] * 50
+    offsets = [c[1]['params']['offset'] for c in api._session.request.call_args_list]
+    assert offsets == [0, 250, 500]
+
+
+def test_paginate_w_prefetch_w_limit(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = _pages([1] * 250, [2] * 250, [3] * 250)
+
+    results = list(api.results_by_test_id(1, limit=300, prefetch=1))
+
+    assert results == [1] * 250 + [2] * 50
+    params = [c[1]['params'] for c in api._session.request.call_args_list]
+    assert params == [{'offset': 0, 'limit': 250}, {'offset': 250, 'limit': 50}]
+
+
+def test_paginate_w_prefetch_bounded(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = lambda method, path, params: [params['offset']] * 250
+
+    results = api.results_by_test_id(1, prefetch=1)
+    assert next(results) == 0
+    results.close()
+
+    # The page being consumed, one queued page, and one page waiting to be queued
+    assert api._session.request.call_count <= 3
+
+
+def test_paginate_w_prefetch_raises_errors(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = [[1] * 250, traw.exceptions.TRAWClientError('mock error')]
+
+    results = api.results_by_test_id(1, prefetch=2)
+
+    assert [next(results) for _ in range(250)] == [1] * 250
+    with pytest.raises(traw.exceptions.TRAWClientError):
+        next(results)
+
+
+def _envelope(objs, offset, limit, more, key='results'):
+    next_link = '/api/v2/get_results/1&limit={0}&offset={1}'.format(limit, offset + limit)
+    return {'offset': offset, 'limit': limit, 'size': len(objs), key: objs,
+            '_links': {'next': next_link if more else None, 'prev': None}}
+
+
+def test_paginate_envelope_follows_next_links(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = [_envelope([1] * 100, 0, 100, True),
+                                        _envelope([2] * 100, 100, 100, True),
+                                        _envelope([3] * 100, 200, 100, False)]
+
+    results = list(api.results_by_test_id(1))
+
+    assert results == [1] * 100 + [2] * 100 + [3] * 100
+    offsets = [c[1]['params']['offset'] for c in api._session.request.call_args_list]
+    assert offsets == [0, 100, 200]
+
+
+def test_paginate_envelope_uses_server_page_size(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = [_envelope([1] * 100, 0, 100, True),
+                                        _envelope([2] * 100, 100, 100, True)]
+
+    results = list(api.results_by_test_id(1, limit=200))
+
+    assert results == [1] * 100 + [2] * 100
+    params = [c[1]['params'] for c in api._session.request.call_args_list]
+    assert params == [{'offset': 0, 'limit': 200}, {'offset': 100, 'limit': 100}]
+
+
+def test_paginate_envelope_exposes_size(api):
+    api.results_by_test_id.cache.clear()
+    api._session.request.side_effect = [_envelope([1] * 40, 0, 250, False)]
+
+    results = api.results_by_test_id(1)
+    assert results.size is None
+
+    next(results)
+    assert results.size == 40
+
+    list(results)
+    cached = api.results_by_test_id(1)
+    next(cached)
+    assert cached.size == 40
+
+
+def test_paginate_envelope_w_workers(api):
+    api.results_by_test_id.cache.clear()
+    pages = {0: _envelope([1] * 100, 0, 100, True),
+             100: _envelope([2] * 100, 100, 100, True),
+             200: _envelope([3] * 10, 200, 100, False)}
+    api._session.request.side_effect = (
+        lambda method, path, params: pages.get(params['offset'], _envelope([], 0, 100, False)))
+
+    results = list(api.results_by_test_id(1, workers=3))
+
+    assert results == [1] * 100 + [2] * 100 + [3] * 10
+    offsets = sorted(c[1]['params']['offset'] for c in api._session.request.call_args_list)
+    assert offsets[:3] == [0, 100, 200]
+
+
 def test_cacheable_caching(timedelta, dt, full_client):
     dt.now.return_value = 1
     timedelta.return_value = 2
@@ -166,7 +337,7 @@ def test_cacheable_clear_cache(timedelta, dt, full_client):
     timedelta.return_value = 2
     side_effects = [{'id': 3},    # full_client.milestone(1)
                     [{'id': 4}],  # full_client.milestones(123)
-                    {'id': 5},    # full_client.add -> milestone.project.id
+                    {'id': 123},  # full_client.add -> milestone.project.id
                     {'id': 6}]    # full_client.add -> response
     full_client.api._session.request.side_effect = side_effects
     full_client.api.milestone_by_id.cache.clear()
@@ -178,9 +349,10 @@ def test_cacheable_clear_cache(timedelta, dt, full_client):
     assert len(full_client.api.milestone_by_id.cache) == 1
     assert len(full_client.api.milestones.cache) == 1
 
-    full_client.add(traw.models.Milestone(full_client, {'id': 456, 'project_id': 5}))
+    full_client.add(traw.models.Milestone(full_client, {'id': 456, 'project_id': 123}))
 
-    assert len(full_client.api.milestone_by_id.cache) == 0
+    # The added milestone is cached in place of the cleared entries
+    assert full_client.api.milestone_by_id.cache.keys() == [((6, ), ())]
     assert len(full_client.api.milestones.cache) == 0
 
 
@@ -263,3 +435,495 @@ def test_duration_to_timedelta():
 
     assert isinstance(d2td, td)
     assert d2td == td(days=total_days, seconds=total_seconds)
+
+
+def test_cacheable_respects_cache_limits(timedelta, dt, full_client):
+    """ Verify cached entries are evicted once the cache limits are reached """
+    dt.now.return_value = 1
+    timedelta.return_value = 2
+    full_client.api._session.request.side_effect = [{'id': i} for i in range(5)]
+    full_client.api.user_by_id.cache.clear()
+    full_client.change_cache_limits(max_entries=2, model_cls=traw.models.User)
+
+    for user_id in (1, 2, 3):
+        full_client.user(user_id)
+
+    assert len(full_client.api.user_by_id.cache) == 2
+
+    full_client.user(1)  # Evicted, so fetched again
+    assert full_client.api._session.request.call_count == 4
+
+
+def test_cacheable_caches_are_per_client(timedelta, dt, full_client):
+    """ Verify clients do not share cached responses """
+    dt.now.return_value = 1
+    timedelta.return_value = 2
+    full_client.api._session.request.side_effect = [{'id': 1}, {'id': 2}]
+    other_client = traw.Client(username=MOCK_USERNAME, password=MOCK_PASSWORD, url=MOCK_URL)
+
+    assert full_client.user(15).id == 1
+    assert other_client.user(15).id == 2
+    assert full_client.user(15).id == 1
+    assert full_client.api.user_by_id.cache is not other_client.api.user_by_id.cache
+
+    other_client.api.user_by_id.cache.clear()
+    assert len(full_client.api.user_by_id.cache) == 1
+
+
+def test_clear_cache_by_arg(api):
+    """ Verify writes only clear the cached responses for the objects they affect """
+    api.results_by_test_id.prime([{'id': 1}], 11)
+    api.results_by_test_id.prime([{'id': 2}], 12)
+    api.results_by_run_id.prime([{'id': 1}], 7)
+    api.results_by_run_id.prime([{'id': 3}], 8)
+    api.test_by_id.prime({'id': 11, 'run_id': 7}, 11)
+    api._session.request.return_value = {'id': 4, 'test_id': 11}
+
+    api.result_add(11, {'status_id': 1})
+
+    assert not api.results_by_test_id.is_cached(11)
+    assert api.results_by_test_id.is_cached(12)
+    assert not api.results_by_run_id.is_cached(7)
+    assert api.results_by_run_id.is_cached(8)
+
+
+def test_clear_cache_by_response(api):
+    """ Verify argument values missing from the write are read from the response """
+    api.results_by_test_id.prime([{'id': 1}], 11)
+    api.results_by_test_id.prime([{'id': 2}], 12)
+    api.results_by_test_id.prime([{'id': 3}], 13)
+    api._session.request.return_value = [{'id': 4, 'test_id': 11}, {'id': 5, 'test_id': 12}]
+
+    api.results_add_for_cases(7, [{'case_id': 1}, {'case_id': 2}])
+
+    assert not api.results_by_test_id.is_cached(11)
+    assert not api.results_by_test_id.is_cached(12)
+    assert api.results_by_test_id.is_cached(13)
+
+
+def test_clear_cache_by_keyword_arg(api):
+    """ Verify cached calls are matched on keyword and unfiltered arguments """
+    api.sections_by_project_id.prime([{'id': 1}], 15, 4)
+    api.sections_by_project_id.prime([{'id': 1}], 15, suite_id=5)
+    api.sections_by_project_id.prime([{'id': 3}], 15, suite_id=6)
+    api.sections_by_project_id.prime([{'id': 4}], 16)
+    api.sections_by_project_id.prime([{'id': 2}], 17)
+    api._session.request.return_value = {'id': 2, 'suite_id': 5}
+
+    api.section_update(2, {'name': 'section'})
+
+    assert api.sections_by_project_id.is_cached(15, 4)
+    assert not api.sections_by_project_id.is_cached(15, suite_id=5)
+    assert api.sections_by_project_id.is_cached(15, suite_id=6)
+    assert api.sections_by_project_id.is_cached(16)
+    assert api.sections_by_project_id.peek(17) == [{'id': 2, 'suite_id': 5}]
+
+
+def test_clear_cache_unknown_arg(api):
+    """ Verify the whole cache is cleared when the affected objects are unknown """
+    api.runs_by_project_id.prime([{'id': 7}], 15)
+    api.runs_by_project_id.prime([{'id': 8}], 16)
+    api.results_by_run_id.prime([{'id': 1}], 7)
+    api._session.request.return_value = None
+
+    api.run_delete(7)
+    api.result_add(11, {'status_id': 1})  # Test 11 is not cached
+
+    assert len(api.runs_by_project_id.cache) == 0
+    assert len(api.results_by_run_id.cache) == 0
+
+
+def test_clear_cache_milestone_parents(api):
+    """ Verify milestone writes clear the cached parent milestone """
+    api.milestone_by_id.prime({'id': 1, 'milestones': [{'id': 2}]}, 1)
+    api.milestone_by_id.prime({'id': 2, 'parent_id': 1}, 2)
+    api.milestone_by_id.prime({'id': 3}, 3)
+    api._session.request.return_value = {'id': 2, 'parent_id': 1, 'project_id': 15}
+
+    api.milestone_update(2, {'name': 'sub milestone'})
+
+    assert not api.milestone_by_id.is_cached(1)
+    assert api.milestone_by_id.peek(2) == {'id': 2, 'parent_id': 1, 'project_id': 15}
+    assert api.milestone_by_id.is_cached(3)
+
+
+def test_write_through(api):
+    """ Verify updates cache the written object, and patch it into the cached
+        listings that include it
+    """
+    api.run_by_id.prime({'id': 7, 'name': 'old'}, 7)
+    api.runs_by_project_id.prime([{'id': 6}, {'id': 7, 'name': 'old'}], 15)
+    api.runs_by_project_id.prime([{'id': 7, 'name': 'old'}], 15, limit=1, workers=2)
+    api.runs_by_project_id.prime([{'id': 7, 'name': 'old'}], 15, is_completed=0)
+    api.runs_by_project_id.prime([{'id': 6}], 15, suite_id=3)
+    api.runs_by_project_id.prime([{'id': 8}], 16)
+    api._session.request.return_value = {'id': 7, 'name': 'new', 'project_id': 15}
+
+    api.run_update(7, {'name': 'new'})
+
+    assert api.run_by_id.peek(7)['name'] == 'new'
+    assert api.runs_by_project_id.peek(15) == [{'id': 6}, {'id': 7, 'name': 'new', 'project_id': 15}]
+    assert api.runs_by_project_id.peek(15, limit=1, workers=2)[0]['name'] == 'new'
+    assert not api.runs_by_project_id.is_cached(15, is_completed=0)
+    assert not api.runs_by_project_id.is_cached(15, suite_id=3)
+    assert api.runs_by_project_id.is_cached(16)
+    assert api._session.request.call_count == 1
+
+
+def test_write_through_scoped_listing(full_client):
+    """ Verify an updated section is patched into its suite's cached listing,
+        which is scoped by project
+    """
+    full_client.api._session.request.side_effect = [
+        [{'id': 1, 'suite_id': 4}, {'id': 2, 'suite_id': 4, 'name': 'old'}],
+        {'id': 2, 'suite_id': 4, 'name': 'new'}]
+    assert len(list(full_client.api.sections_by_project_id(15, 4))) == 2
+
+    full_client.api.section_update(2, {'name': 'new'})
+
+    sections = list(full_client.api.sections_by_project_id(15, 4))
+    assert [section.get('name', None) for section in sections] == [None, 'new']
+    paths = [call[1]['path'] for call in full_client.api._session.request.call_args_list]
+    assert paths == ['get_sections/15', 'update_section/2']
+
+
+def test_write_through_add(full_client):
+    """ Verify an added object can be read back without calling TestRail """
+    full_client.api._session.request.side_effect = [{'id': 15},  # new_run.project
+                                                    {'id': 7, 'name': 'run', 'project_id': 15}]
+    new_run = full_client.run()
+    new_run.name = 'run'
+    new_run.project = full_client.project(15)
+
+    run = full_client.add(new_run)
+
+    assert full_client.run(7).name == 'run' == run.name
+    assert full_client.api._session.request.call_count == 2
+
+
+def test_cacheable_prime(timedelta, dt, full_client):
+    """ Verify primed responses are returned without calling TestRail """
+    dt.now.return_value = 1
+    timedelta.return_value = 2
+    full_client.api.user_by_id.cache.clear()
+
+    assert not full_client.api.user_by_id.is_cached(15)
+    full_client.api.user_by_id.prime({'id': 15, 'name': 'primed'}, 15)
+
+    assert full_client.api.user_by_id.is_cached(15)
+    assert full_client.user(15).name == 'primed'
+    assert not full_client.api._session.request.called
+
+
+def test_cacheable_caches_released_with_client(full_client):
+    """ Verify a client's caches are freed when the client is dropped """
+    full_client.api._session.request.return_value = {'id': 1}
+    other_client = traw.Client(username=MOCK_USERNAME, password=MOCK_PASSWORD, url=MOCK_URL)
+    other_client.user(15)
+    cached_method = traw.api.API.__dict__['user_by_id']
+    api_ref = weakref.ref(other_client.api)
+    assert other_client.api in cached_method._caches
+
+    del other_client
+    gc.collect()
+
+    assert api_ref() is None
+    assert list(cached_method._caches.keys()) == []
+
+
+def test_cacheable_custom_cache_engine():
+    """ Verify the cache engine can be swapped per client """
+    engine = mock.MagicMock()
+    engine.return_value.get.return_value = {'value': {'id': 99}}
+    with mock.patch('traw.api.Session'):
+        client = traw.Client(username=MOCK_USERNAME, password=MOCK_PASSWORD, url=MOCK_URL,
+                             cache_engine=engine)
+
+    assert client.user(15).id == 99
+    assert client.api.user_by_id.cache is engine.return_value
+
+
+class WaitCountingEvent(object):
+    """ threading.Event stand-in that counts the threads waiting on it """
+    def __init__(self):
+        self.event = threading.Event()
+        self.waiters = 0
+
+    def wait(self):
+        self.waiters += 1
+        return self.event.wait()
+
+    def set(self):
+        self.event.set()
+
+
+@pytest.fixture()
+def flight():
+    calls = list()
+
+    def _call():
+        call = mock.Mock(done=WaitCountingEvent(), result=None, exc_info=None)
+        calls.append(call)
+        return call
+
+    with mock.patch('traw.utils._Call', side_effect=_call):
+        single_flight = SingleFlight()
+        single_flight.calls = calls
+        yield single_flight
+
+
+def _run_concurrently(flight, func, followers):
+    """ Calls ``flight.do('key', func)`` from a leader thread, then from
+        ``followers`` threads that wait on the leader's call, and returns the
+        results (or exceptions) of every thread
+    """
+    started, release = threading.Event(), threading.Event()
+    outcomes = list()
+
+    def _func():
+        started.set()
+        release.wait()
+        return func()
+
+    def _do():
+        try:
+            outcomes.append(flight.do('key', _func))
+        except Exception as exc:  # pylint: disable=broad-except
+            outcomes.append(exc)
+
+    threads = [threading.Thread(target=_do)]
+    threads[0].start()
+    started.wait()
+
+    threads += [threading.Thread(target=_do) for _ in range(followers)]
+    for thread in threads[1:]:
+        thread.start()
+
+    while flight.calls[0].done.waiters < followers:
+        threading.Event().wait(0.001)
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    return outcomes
+
+
+def test_single_flight_coalesces_concurrent_calls(flight):
+    """ Verify concurrent calls with the same key share one call """
+    func = mock.Mock(return_value={'id': 1})
+
+    results = _run_concurrently(flight, func, followers=4)
+
+    assert func.call_count == 1
+    assert results == [{'id': 1}] * 5
+    assert flight._calls == dict()
+
+
+def test_single_flight_shares_exceptions(flight):
+    """ Verify waiting callers receive the leader's exception """
+    func = mock.Mock(side_effect=ValueError('mock error'))
+
+    errors = _run_concurrently(flight, func, followers=2)
+
+    assert func.call_count == 1
+    assert len(errors) == 3
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_single_flight_sequential_calls_not_shared():
+    """ Verify calls that do not overlap are each made """
+    flight = SingleFlight()
+    func = mock.Mock(return_value=1)
+
+    assert flight.do('key', func) == 1
+    assert flight.do('key', func) == 1
+    assert func.call_count == 2
+
+
+def test_chunk_by_size():
+    """ Verify items are grouped into lists whose JSON fits in max_bytes """
+    items = [{'id': i, 'comment': 'x' * 20} for i in range(20)]
+
+    chunks = list(chunk_by_size(items, 200, overhead=10))
+
+    assert [item for chunk in chunks for item in chunk] == items
+    assert all(len(json.dumps(chunk)) + 10 <= 200 for chunk in chunks)
+    assert all(len(json.dumps(chunk + [items[0]])) + 10 > 200 for chunk in chunks[:-1])
+
+
+def test_chunk_by_size_oversized_item():
+    """ Verify an item too large for any chunk is yielded on its own """
+    chunks = list(chunk_by_size(['small', 'x' * 100, 'small'], 50))
+
+    assert chunks == [['small'], ['x' * 100], ['small']]
+
+
+def test_chunk_by_size_empty():
+    """ Verify no chunks are yielded for no items """
+    assert list(chunk_by_size([], 50)) == list()
+
+
+def test_cacheable_generator_seeds(timedelta, dt, full_client):
+    """ Verify listed objects are cached by id, and expire with the by-id
+        cache timeout counted from when they were listed
+    """
+    dt.now.side_effect = [1, 2, 3, 5]
+    timedelta.side_effect = lambda seconds: seconds
+    full_client.change_cache_timeout(3, traw.models.User)
+    full_client.api.users.cache.clear()
+    full_client.api.user_by_id.cache.clear()
+    full_client.api._session.request.side_effect = [[{'id': 15, 'name': 'listed'}, {'id': 16}],
+                                                    {'id': 15, 'name': 'fetched'}]
+
+    list(full_client.users())
+
+    assert full_client.api.user_by_id.is_cached(16)
+    assert full_client.user(15).name == 'listed'
+    assert full_client.api._session.request.call_count == 1
+    assert full_client.user(15).name == 'fetched'
+    assert full_client.api._session.request.call_count == 2
+
+
+def test_cacheable_generator_seeds_on_miss_only(api):
+    """ Verify a cached listing does not re-seed by-id entries """
+    api.runs_by_project_id.prime([{'id': 7, 'name': 'listed'}], 15)
+
+    list(api.runs_by_project_id(15))
+
+    assert not api.run_by_id.is_cached(7)
+    assert not api._session.request.called
+
+
+def test_cache_dir(tmpdir):
+    """ Verify responses cached by one API are reused by the next, until they
+        expire or are cleared
+    """
+    with mock.patch('traw.api.Session') as Session:
+        Session.return_value = Session
+        Session.request.return_value = [{'id': 1, 'name': 'Passed'}]
+        apis = [traw.api.API(username=MOCK_USERNAME, user_api_key=MOCK_USER_API_KEY,
+                             url=MOCK_URL, cache_dir=str(tmpdir)) for _ in range(4)]
+        apis[2].cache_timeouts[traw.models.Status] = 0
+
+        assert list(apis[0].statuses()) == [{'id': 1, 'name': 'Passed'}]
+        assert list(apis[1].statuses()) == [{'id': 1, 'name': 'Passed'}]
+        assert Session.request.call_count == 1
+
+        apis[0].statuses.cache.clear()
+        list(apis[2].statuses())  # Cached, but expires immediately
+        assert Session.request.call_count == 2
+
+        list(apis[3].statuses())
+        assert Session.request.call_count == 3
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stale_opt_in(full_client):
+    """ Verify expired objects are not served stale unless a maximum
+        staleness is set, and never when their cache timeout is 0
+    """
+    full_client.api.user_by_id.cache.clear()
+    full_client.api._session.request.side_effect = [{'id': 1, 'name': 'v1'}, {'id': 1, 'name': 'v2'},
+                                                    {'id': 1, 'name': 'v3'}]
+    full_client.change_cache_timeout(0, traw.models.User)
+
+    assert full_client.user(1).name == 'v1'
+    assert full_client.user(1).name == 'v2'
+
+    full_client.change_cache_staleness(3600, traw.models.User)
+    assert full_client.user(1).name == 'v3'
+    assert full_client.api._session.request.call_count == 3
+
+
+def test_stale_while_revalidate(timedelta, dt, full_client):
+    """ Verify expired statuses are served while they are refreshed in the
+        background, until they are older than the maximum staleness
+    """
+    dt.now.return_value = 0
+    timedelta.side_effect = lambda seconds: seconds
+    full_client.change_cache_timeout(10, traw.models.Status)
+    full_client.change_cache_staleness(5, traw.models.Status)
+    full_client.api.statuses.cache.clear()
+    release = threading.Event()
+    responses = [[{'id': 1, 'label': 'v1'}], [{'id': 1, 'label': 'v2'}], [{'id': 1, 'label': 'v3'}]]
+
+    def request(**kwargs):  # pylint: disable=unused-argument
+        if len(responses) == 2:  # The background refresh
+            assert release.wait(5)
+        return responses.pop(0)
+    full_client.api._session.request.side_effect = request
+
+    assert list(full_client.api.statuses())[0]['label'] == 'v1'
+
+    dt.now.return_value = 12
+    assert list(full_client.api.statuses())[0]['label'] == 'v1'
+    assert list(full_client.api.statuses())[0]['label'] == 'v1'
+    release.set()
+    assert _wait_for(lambda: full_client.api.statuses.peek()[0]['label'] == 'v2')
+    assert full_client.api._session.request.call_count == 2
+
+    dt.now.return_value = 28  # 16 seconds after the refresh
+    assert list(full_client.api.statuses())[0]['label'] == 'v3'
+    assert full_client.api._session.request.call_count == 3
+
+
+def test_stale_while_revalidate_failure(timedelta, dt, full_client):
+    """ Verify a failed background refresh keeps serving the stale user """
+    dt.now.return_value = 0
+    timedelta.side_effect = lambda seconds: seconds
+    full_client.change_cache_timeout(10, traw.models.User)
+    full_client.change_cache_staleness(3600, traw.models.User)
+    full_client.api.user_by_id.cache.clear()
+    full_client.api._session.request.side_effect = [{'id': 15, 'name': 'old'}, IOError('unavailable'),
+                                                    {'id': 15, 'name': 'new'}]
+
+    assert full_client.user(15).name == 'old'
+    dt.now.return_value = 12
+    assert full_client.user(15).name == 'old'
+    assert _wait_for(lambda: not traw.utils._revalidating)
+    assert full_client.user(15).name == 'old'
+    assert _wait_for(lambda: full_client.api.user_by_id.peek(15)['name'] == 'new')
+    assert full_client.api._session.request.call_count == 3
+
+
+def test_cache_key():
+    """ Verify equivalent arguments share a cache key, and others do not """
+    run = traw.models.Run(None, {'id': 7, 'name': 'run'})
+    key = cache_key((7, ), {'limit': 5}, ['run_id'])
+
+    assert key == ((7, ), (('limit', 5), ))
+    assert cache_key((run, ), {'limit': 5}, ['run_id']) == key
+    assert cache_key((), {'run_id': 7, 'limit': 5, 'workers': 2, 'prefetch': 1}, ['run_id']) == key
+    assert cache_key((7, ), {'limit': 5, 'created_by': None}, ['run_id']) == key
+    assert cache_key(('7', ), {'limit': 5}, ['run_id']) != key
+    assert cache_key((7, ), {'limit': '5'}, ['run_id']) != key
+
+    assert cache_key((7, ), {}, ['run_id', 'status_id'], {'status_id': None}) == ((7, None), ())
+    assert cache_key((7, ), {'status_id': [1, 2]}, ['run_id', 'status_id']) == ((7, (1, 2)), ())
+    assert (cache_key((), {'ids': set([run, 3])}, []) == cache_key((), {'ids': [3, 7]}, []) ==
+            ((), (('ids', (3, 7)), )))
+    assert cache_key((), {'filter': {'b': [1], 'a': run}}, []) == ((), (('filter', (('a', 7), ('b', (1, )))), ))
+    hash(cache_key((), {'filter': {'b': [1], 'a': run}}, []))
+
+
+def test_cacheable_equivalent_calls(api):
+    """ Verify calls with equivalent arguments are served from one cache entry """
+    api._session.request.side_effect = [{'id': 7}, [{'id': 71}], [{'id': 72}]]
+    run = traw.models.Run(None, {'id': 7})
+
+    api.run_by_id(7)
+    api.run_by_id(run_id=7)
+    api.run_by_id(run)
+    list(api.tests_by_run_id(7))
+    list(api.tests_by_run_id(run_id=7, status_id=None, workers=2))
+    list(api.tests_by_run_id(7, [1, 2]))
+
+    assert api._session.request.call_count == 3
+    assert api.tests_by_run_id.is_cached(7, status_id=(1, 2))
@@ -17,6 +17,8 @@ import logging
 from os.path import dirname, join, realpath
 
 from .client import Client  # NOQA
+from .mirror import Mirror  # NOQA
+from .reporter import ResultReporter  # NOQA
 
 try:
     FileNotFoundError
@@ -31,6 +33,6 @@ except FileNotFoundError:
 
 
 __version__ = version
-__all__ = ('__version__', 'Client')
+__all__ = ('__version__', 'Client', 'Mirror', 'ResultReporter')
 
 logging.getLogger(__package__).addHandler(logging.NullHandler())
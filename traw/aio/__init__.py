@@ -0,0 +1,21 @@
+""" asyncio support for TRAW
+
+Requires Python 3.6+ and aiohttp (``pip install traw[aio]``):
+
+.. code-block:: python
+
+    from traw.aio import AsyncClient
+
+    async with AsyncClient(username='username',
+                           user_api_key='api_key',
+                           url='url') as testrail:
+        project = await testrail.project(15)
+        async for run in testrail.runs(project):
+            ...
+
+See the AsyncClient help documentation (`help(traw.aio.AsyncClient)`) for more information
+"""
+from .api import AsyncAPI  # NOQA
+from .client import AsyncClient  # NOQA
+
+__all__ = ('AsyncAPI', 'AsyncClient')
@@ -0,0 +1,401 @@
+from ..api import _load_config, _env_var, _USER_KEY, _PASS_KEY, _URL_KEY
+from ..const import API_PATH, DEFAULT_MAX_CONNECTIONS, GET, POST
+from ..exceptions import TRAWLoginError
+from ..ratelimit import shared_bucket
+from .sessions import AsyncSession
+from .utils import paginate
+
+
+class AsyncAPI(object):
+    """ asyncio counterpart of traw.api.API
+
+    Every method is a coroutine, and every method that yields objects is an
+    async generator. Responses are not cached.
+
+    The AsyncAPI class is not meant to be accessed directly, rather, use the
+    traw.aio.AsyncClient
+    """
+    def __init__(self, username=None, user_api_key=None, password=None, url=None,
+                 max_connections=DEFAULT_MAX_CONNECTIONS, rate_limit=None, rate_limit_file=None):
+        """
+        :param rate_limit: Optional requests per minute budget, shared with
+            every other API for the same url in this process
+        :param rate_limit_file: Optional path of a file through which the
+            ``rate_limit`` budget is also shared with other processes
+        """
+        config = _load_config()
+        _username = username or _env_var(_USER_KEY) or config[_USER_KEY]
+        _password = user_api_key or password or _env_var(_PASS_KEY) or config[_PASS_KEY]
+        _url = url or _env_var(_URL_KEY) or config[_URL_KEY]
+
+        if _username is None or _password is None or _url is None:
+            msg = ('You must set a username, password/api_key, and url to '
+                   'use TRAW')
+            raise TRAWLoginError(msg)
+
+        rate_limiter = None
+        if rate_limit:
+            rate_limiter = shared_bucket(_url, rate_limit, path=rate_limit_file)
+
+        self._session = AsyncSession(auth=(_username, _password), url=_url,
+                                     max_connections=max_connections,
+                                     rate_limiter=rate_limiter)
+
+    async def close(self):
+        """ Close the underlying HTTP session """
+        await self._session.close()
+
+    async def case_by_id(self, case_id):
+        """ Calls `get_case` API endpoint with the given case_id
+
+        :param case_id: int id of case
+
+        :returns: case dict
+        """
+        path = API_PATH['get_case'].format(case_id=case_id)
+        return await self._session.request(method=GET, path=path)
+
+    @paginate
+    async def cases_by_project_id(self, project_id, **params):
+        """ Calls `get_cases` API endpoint
+
+        :yields: case dictionaries from api
+        """
+        path = API_PATH['get_cases'].format(project_id=project_id)
+        return await self._session.request(method=GET, path=path, params=params)
+
+    async def case_types(self):
+        """ Calls `get_case_types` API endpoint
+
+        :yields: case_type dictionaries from api
+        """
+        path = API_PATH['get_case_types']
+        for case_type in await self._session.request(method=GET, path=path):
+            yield case_type
+
+    async def config_groups(self, project_id):
+        """ Calls `get_configs` API endpoint
+
+        :yields: config_group dictionaries from api
+        """
+        path = API_PATH['get_configs'].format(project_id=project_id)
+        for config_group in await self._session.request(method=GET, path=path):
+            yield config_group
+
+    async def config_add(self, config_group_id, params):
+        path = API_PATH['add_config'].format(config_group_id=config_group_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def config_delete(self, config_id):
+        path = API_PATH['delete_config'].format(config_id=config_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def config_update(self, config_id, params):
+        path = API_PATH['update_config'].format(config_id=config_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def config_group_add(self, project_id, params):
+        path = API_PATH['add_config_group'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def config_group_delete(self, config_group_id):
+        path = API_PATH['delete_config_group'].format(config_group_id=config_group_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def config_group_update(self, config_group_id, params):
+        path = API_PATH['update_config_group'].format(config_group_id=config_group_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def milestone_by_id(self, milestone_id):
+        """ Calls `get_milestone` API endpoint with the given milestone_id
+
+        :param milestone_id: int id of milestone
+
+        :returns: milestone dict
+        """
+        path = API_PATH['get_milestone'].format(milestone_id=milestone_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def milestones(self, project_id, is_completed=None, is_started=None):
+        """ Calls `get_milestones` API endpoint
+
+        :yields: milestone dictionaries from api
+        """
+        path = API_PATH['get_milestones'].format(project_id=project_id)
+
+        params = dict()
+        if is_completed is not None:
+            params['is_completed'] = int(is_completed)
+
+        if is_started is not None:
+            params['is_started'] = int(is_started)
+
+        params = params or None
+
+        for milestone in await self._session.request(method=GET, path=path, params=params):
+            yield milestone
+
+    async def milestone_add(self, project_id, params):
+        path = API_PATH['add_milestone'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def milestone_delete(self, milestone_id):
+        path = API_PATH['delete_milestone'].format(milestone_id=milestone_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def milestone_update(self, milestone_id, params):
+        path = API_PATH['update_milestone'].format(milestone_id=milestone_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def plan_by_id(self, plan_id):
+        """ Calls `get_plan` API endpoint with the given plan_id
+
+        :param plan_id: int id of plan
+
+        :returns: plan dict
+        """
+        path = API_PATH['get_plan'].format(plan_id=plan_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def priorities(self):
+        """ Calls `get_priorities` API endpoint
+
+        :yields: priority dictionaries from api
+        """
+        path = API_PATH['get_priorities']
+        for priority in await self._session.request(method=GET, path=path):
+            yield priority
+
+    async def project_by_id(self, project_id):
+        """ Calls `get_project` API endpoint with the given project_id
+
+        :param project_id: int id of project
+
+        :returns: project dict
+        """
+        path = API_PATH['get_project'].format(project_id=project_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def projects(self, is_completed=None):
+        """ Calls `projects` API endpoint with given filter
+
+        :param project_filter: Filter results by completion status: 0, 1, or None
+
+        :yields: project dictionaries from api
+        """
+        path = API_PATH['get_projects']
+        params = dict(is_completed=is_completed) if is_completed is not None else None
+
+        for project in await self._session.request(method=GET, path=path, params=params):
+            yield project
+
+    async def project_add(self, params):
+        path = API_PATH['add_project']
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def project_delete(self, project_id):
+        path = API_PATH['delete_project'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def project_update(self, project_id, params):
+        path = API_PATH['update_project'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    @paginate
+    async def results_by_run_id(self, run_id, **params):
+        """ Calls `get_results_for_run` API endpoint
+
+        :yields: result dictionaries from api
+        """
+        path = API_PATH['get_results_for_run'].format(run_id=run_id)
+        return await self._session.request(method=GET, path=path, params=params)
+
+    @paginate
+    async def results_by_test_id(self, test_id, **params):
+        """ Calls `get_results` API endpoint
+
+        :yields: result dictionaries from api
+        """
+        path = API_PATH['get_results'].format(test_id=test_id)
+        return await self._session.request(method=GET, path=path, params=params)
+
+    async def result_add(self, test_id, params):
+        path = API_PATH['add_result'].format(test_id=test_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def results_add(self, run_id, results):
+        """ Calls `add_results` API endpoint with a list of result dicts """
+        path = API_PATH['add_results'].format(run_id=run_id)
+        return await self._session.request(method=POST, path=path, json={'results': results})
+
+    async def results_add_for_cases(self, run_id, results):
+        """ Calls `add_results_for_cases` API endpoint with a list of result dicts """
+        path = API_PATH['add_results_for_cases'].format(run_id=run_id)
+        return await self._session.request(method=POST, path=path, json={'results': results})
+
+    async def run_by_id(self, run_id):
+        """ Calls `get_run` API endpoint with the given run_id
+
+        :param run_id: int id of run
+
+        :returns: run dict
+        """
+        path = API_PATH['get_run'].format(run_id=run_id)
+        return await self._session.request(method=GET, path=path)
+
+    @paginate
+    async def runs_by_project_id(self, project_id, **params):
+        """ Calls `get_runs` API endpoint
+
+        :yields: run dictionaries from api
+        """
+        path = API_PATH['get_runs'].format(project_id=project_id)
+        return await self._session.request(method=GET, path=path, params=params)
+
+    async def run_add(self, project_id, params):
+        path = API_PATH['add_run'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def run_close(self, run_id):
+        path = API_PATH['close_run'].format(run_id=run_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def run_delete(self, run_id):
+        path = API_PATH['delete_run'].format(run_id=run_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def run_update(self, run_id, params):
+        path = API_PATH['update_run'].format(run_id=run_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def section_by_id(self, section_id):
+        """ Calls `get_section` API endpoint with the given section_id
+
+        :param section_id: int id of section
+
+        :returns: section dict
+        """
+        path = API_PATH['get_section'].format(section_id=section_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def sections_by_project_id(self, project_id, suite_id=None):
+        """ Calls `get_sections` API endpoint
+
+        :yields: section dictionaries from api
+        """
+        params = {'suite_id': suite_id} if suite_id else dict()
+        path = API_PATH['get_sections'].format(project_id=project_id)
+        for section in await self._session.request(method=GET, path=path, params=params):
+            yield section
+
+    async def section_add(self, project_id, params):
+        path = API_PATH['add_section'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def section_delete(self, section_id):
+        path = API_PATH['delete_section'].format(section_id=section_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def section_update(self, section_id, params):
+        path = API_PATH['update_section'].format(section_id=section_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def statuses(self):
+        """ Calls `get_statuses` API endpoint
+
+        :yields: status dictionaries from api
+        """
+        path = API_PATH['get_statuses']
+        for status in await self._session.request(method=GET, path=path):
+            yield status
+
+    async def suite_by_id(self, suite_id):
+        """ Calls `get_suite` API endpoint with the given suite_id
+
+        :param suite_id: int id of suite
+
+        :returns: suite dict
+        """
+        path = API_PATH['get_suite'].format(suite_id=suite_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def suites_by_project_id(self, project_id):
+        """ Calls `get_suites` API endpoint
+
+        :yields: suite dictionaries from api
+        """
+        path = API_PATH['get_suites'].format(project_id=project_id)
+        for suite in await self._session.request(method=GET, path=path):
+            yield suite
+
+    async def suite_add(self, project_id, params):
+        path = API_PATH['add_suite'].format(project_id=project_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def suite_delete(self, suite_id):
+        path = API_PATH['delete_suite'].format(suite_id=suite_id)
+        return await self._session.request(method=POST, path=path)
+
+    async def suite_update(self, suite_id, params):
+        path = API_PATH['update_suite'].format(suite_id=suite_id)
+        return await self._session.request(method=POST, path=path, json=params)
+
+    async def templates(self, project_id):
+        """ Calls `get_templates` API endpoint
+
+        :yields: template dictionaries from api
+        """
+        path = API_PATH['get_templates'].format(project_id=project_id)
+        for template in await self._session.request(method=GET, path=path):
+            yield template
+
+    async def test_by_id(self, test_id):
+        """ Calls `get_test` API endpoint with the given test_id
+
+        :param test_id: int id of test
+
+        :returns: test dict
+        """
+        path = API_PATH['get_test'].format(test_id=test_id)
+        return await self._session.request(method=GET, path=path)
+
+    @paginate
+    async def tests_by_run_id(self, run_id, status_id=None, **params):
+        """ Calls `get_tests` API endpoint
+
+        :yields: test dictionaries from api
+        """
+        path = API_PATH['get_tests'].format(run_id=run_id)
+        if status_id:
+            params['status_id'] = status_id
+        return await self._session.request(method=GET, path=path, params=params)
+
+    async def user_by_email(self, email):
+        """ Calls `get_user` API endpoint with the given user email
+
+        :param email: str email of user
+
+        :returns: user dict
+        """
+        path = API_PATH['get_user_by_email']
+        params = {'email': email}
+        return await self._session.request(method=GET, path=path, params=params)
+
+    async def user_by_id(self, user_id):
+        """ Calls `get_user` API endpoint with the given user_id
+
+        :param user_id: int id of user
+
+        :returns: user dict
+        """
+        path = API_PATH['get_user'].format(user_id=user_id)
+        return await self._session.request(method=GET, path=path)
+
+    async def users(self):
+        """ Calls `users` API endpoint
+
+        :yields: user dictionaries from api
+        """
+        path = API_PATH['get_users']
+        for user in await self._session.request(method=GET, path=path):
+            yield user
@@ -0,0 +1,808 @@
+from collections.abc import Iterable
+
+from .. import const
+from .. import models
+from ..client import (BULK_BODY_OVERHEAD, bulk_case_result_entries, bulk_result_entries,
+                      normalize_dt_filter, normalize_param)
+from ..exceptions import TooLarge, TRAWClientError, UnknownCustomStatusError
+from ..utils import chunk_by_size, dispatchmethod
+from .api import AsyncAPI
+
+
+class AsyncClient(object):
+    """ asyncio counterpart of traw.Client
+
+    AsyncClient exposes the same dispatch surface as traw.Client, but every
+    method that talks to TestRail is a coroutine, and every method that yields
+    objects is an async generator. Requests are sent over a non-blocking
+    transport (aiohttp), so many of them can be in flight at once:
+
+    .. code-block:: python
+
+        import asyncio
+        from traw.aio import AsyncClient
+
+        async def main():
+            async with AsyncClient(username='username',
+                                   user_api_key='api_key',
+                                   url='url') as testrail:
+                run = await testrail.run(1234)
+                tests = [test async for test in testrail.tests(run)]
+                cases = await asyncio.gather(*[test.case for test in tests])
+
+    Calling a method with no arguments (e.g. ``testrail.run()``) still returns
+    a new, unconfigured model synchronously, as no API call is needed.
+
+    Model properties that reference other TestRail objects (e.g. ``test.case``)
+    return awaitables when the model belongs to an AsyncClient:
+
+    .. code-block:: python
+
+        case = await test.case
+
+    Credentials are resolved exactly as they are for traw.Client. The optional
+    ``max_connections`` keyword limits how many requests are in flight at once.
+    """
+    def __init__(self, **credentials):
+        """ Initialize the async TRAW instance """
+        self.api = AsyncAPI(**credentials)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.api.close()
+
+    # POST generics
+    @dispatchmethod
+    def add(self, obj):
+        # Not directly implemented. TypeError is raised if called with unregistered object
+        msg = "TRAW and/or TestRail's API does not support adding objects of type {0}"
+        raise TypeError(msg.format(type(obj)))
+
+    @dispatchmethod
+    def close(self, obj):
+        # Not directly implemented. TypeError is raised if called with unregistered object
+        msg = "TRAW and/or TestRail's API does not support closing objects of type {0}"
+        raise TypeError(msg.format(type(obj)))
+
+    @dispatchmethod
+    def delete(self, obj):
+        # Not directly implemented. TypeError is raised if called with unregistered object
+        msg = "TRAW and/or TestRail's API does not support deleting objects of type {0}"
+        raise TypeError(msg.format(type(obj)))
+
+    @dispatchmethod
+    def update(self, obj):
+        # Not directly implemented. TypeError is raised if called with unregistered object
+        msg = "TRAW and/or TestRail's API does not support updating objects of type {0}"
+        raise TypeError(msg.format(type(obj)))
+
+    # Case related methods
+    @dispatchmethod
+    def case(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.Case instance
+            `client.case()` returns a new Case instance (no API call)
+            `await client.case(1234)` returns a Case instance with an ID of 1234
+        """
+        return models.Case(self)
+
+    @case.register(int)
+    async def _case_by_id(self, case_id):
+        return models.Case(self, await self.api.case_by_id(case_id))
+
+    @dispatchmethod
+    def cases(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Case for the given models.Project object
+            or project ID. Accepts the same filters as traw.Client.cases
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @cases.register(int)
+    async def _cases_by_project_id(self, project_id, suite=None, section=None, **kwargs):
+        project = await self.project(project_id)
+        if project.suite_mode != 1 and suite is None:
+            msg = ("The project with ID {0} is set to a suite_mode of {1}, which "
+                   "requires a valid suite or suite_id to retrieve cases")
+            raise TypeError(msg.format(project, project.suite_mode))
+
+        params = dict()
+        if suite:
+            if not isinstance(suite, (int, models.Suite)):
+                msg = ("``suite`` must be a models.Suite object, or int ID of a "
+                       "suite in testrail. Found {0}")
+                raise TypeError(msg.format(suite))
+
+            params['suite_id'] = suite.id if isinstance(suite, models.Suite) else suite
+
+        if section:
+            if not isinstance(section, (int, models.Section)):
+                msg = ("``section`` must be a models.Section object, or int ID "
+                       "of a section in testrail. Found {0}")
+                raise TypeError(msg.format(section))
+
+            params['section_id'] = section.id if isinstance(section, models.Section) else section
+
+        normalize_dt_filter(kwargs, params, 'created_after')
+        normalize_dt_filter(kwargs, params, 'created_before')
+        normalize_param(kwargs, params, 'case_type', 'type_id', models.CaseType)
+        normalize_param(kwargs, params, 'created_by', 'created_by', models.User)
+        normalize_param(kwargs, params, 'milestone', 'milestone_id',
+                        models.Milestone, models.SubMilestone)
+        normalize_param(kwargs, params, 'priority', 'priority_id', models.Priority)
+        normalize_param(kwargs, params, 'template', 'template_id', models.Template)
+        normalize_param(kwargs, params, 'updated_by', 'updated_by', models.User)
+        normalize_dt_filter(kwargs, params, 'updated_after')
+        normalize_dt_filter(kwargs, params, 'updated_before')
+
+        async for case in self.api.cases_by_project_id(project_id, **params):
+            yield models.Case(self, case)
+
+    @cases.register(models.Project)
+    async def _cases_by_project(self, project, suite=None, section=None, **kwargs):
+        async for case in self.cases(project.id, suite, section, **kwargs):
+            yield case
+
+    @cases.register(list)
+    def _cases_by_ids(self, case_ids, project=None, suite=None):  # pylint: disable=unused-argument
+        """ Yields an awaitable models.Case for each id in ``case_ids``, in
+            order. ``project`` and ``suite`` are accepted for compatibility
+            with traw.Client.cases; each case is fetched individually
+        """
+        for case_id in case_ids:
+            yield self.case(case_id)
+
+    # Case type related methods
+    @dispatchmethod
+    def case_type(self):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @case_type.register(int)
+    async def _case_type_by_id(self, case_type_id):
+        async for case_type in self.case_types():
+            if case_type.id == case_type_id:
+                return case_type
+
+        msg = "Could not locate a models.CaseType with id of {0}"
+        raise TRAWClientError(msg.format(case_type_id))
+
+    async def case_types(self):
+        """ Async generator of models.CaseType objects """
+        async for case_type in self.api.case_types():
+            yield models.CaseType(self, case_type)
+
+    # Config related methods
+    @dispatchmethod
+    def config(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return new models.Config object (no API call) """
+        return models.Config(self)
+
+    @add.register(models.Config)
+    async def _config_add(self, config):
+        response = await self.api.config_add(config._content.get('group_id'), config.add_params)
+        return models.Config(self, response)
+
+    @config.register(models.Project)
+    async def _config_by_project(self, project, config_id):
+        return await self.config(project.id, config_id)
+
+    @config.register(int)
+    async def _config_by_project_id(self, project_id, config_id):
+        async for config_group in self.config_groups(project_id):
+            for config in config_group.configs:
+                if config.id == config_id:
+                    return config
+
+        msg = ("Could not locate a models.Config with id of {0} "
+               "for project with ID {1}")
+        raise TRAWClientError(msg.format(config_id, project_id))
+
+    @delete.register(models.Config)
+    async def _config_delete(self, config):
+        await self.api.config_delete(config.id)
+
+    @update.register(models.Config)
+    async def _config_update(self, config):
+        response = await self.api.config_update(config.id, config.update_params)
+        return models.Config(self, response)
+
+    @dispatchmethod
+    def config_group(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return new models.ConfigGroup object (no API call) """
+        return models.ConfigGroup(self)
+
+    @add.register(models.ConfigGroup)
+    async def _config_group_add(self, config_group):
+        project_id = config_group._content.get('project_id')
+        response = await self.api.config_group_add(project_id, config_group.add_params)
+        return models.ConfigGroup(self, response)
+
+    @config_group.register(int)
+    async def _config_group_by_project_id(self, project_id, config_group_id):
+        async for config_group in self.config_groups(project_id):
+            if config_group.id == config_group_id:
+                return config_group
+
+        msg = ("Could not locate a models.ConfigGroup with id of {0} "
+               "for project with ID {1}")
+        raise TRAWClientError(msg.format(config_group_id, project_id))
+
+    @config_group.register(models.Project)
+    async def _config_group_by_project(self, project, config_group_id):
+        return await self.config_group(project.id, config_group_id)
+
+    @delete.register(models.ConfigGroup)
+    async def _config_group_delete(self, config_group):
+        await self.api.config_group_delete(config_group.id)
+
+    @update.register(models.ConfigGroup)
+    async def _config_group_update(self, config_group):
+        response = await self.api.config_group_update(config_group.id, config_group.update_params)
+        return models.ConfigGroup(self, response)
+
+    @dispatchmethod
+    def config_groups(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.ConfigGroup for the given models.Project
+            object or project ID
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @config_groups.register(int)
+    async def _config_groups_by_project_id(self, project_id):
+        async for config_group in self.api.config_groups(project_id):
+            yield models.ConfigGroup(self, config_group)
+
+    @config_groups.register(models.Project)
+    async def _config_groups_by_project(self, project):
+        async for config_group in self.config_groups(project.id):
+            yield config_group
+
+    # Milestone related methods
+    @dispatchmethod
+    def milestone(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.Milestone instance
+            `client.milestone()` returns a new Milestone instance (no API call)
+            `await client.milestone(1234)` returns a Milestone instance with an ID of 1234
+        """
+        return models.Milestone(self)
+
+    @milestone.register(int)
+    async def _milestone_by_id(self, milestone_id):
+        return models.Milestone(self, await self.api.milestone_by_id(milestone_id))
+
+    @add.register(models.Milestone)
+    @add.register(models.SubMilestone)
+    async def _milestone_add(self, milestone):
+        project_id = milestone._content.get('project_id')
+        response = await self.api.milestone_add(project_id, milestone.add_params)
+        return _milestone_model(self, response)
+
+    @delete.register(models.Milestone)
+    @delete.register(models.SubMilestone)
+    async def _milestone_delete(self, milestone):
+        await self.api.milestone_delete(milestone.id)
+
+    @update.register(models.Milestone)
+    @update.register(models.SubMilestone)
+    async def _milestone_update(self, milestone):
+        response = await self.api.milestone_update(milestone.id, milestone.update_params)
+        return _milestone_model(self, response)
+
+    @dispatchmethod
+    def milestones(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Milestone for the given models.Project
+            object or project ID
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @milestones.register(int)
+    async def _milestones_by_project_id(self, project_id, is_completed=None, is_started=None):
+        msg = "{0} must be either None or bool, found {1}"
+        if not isinstance(is_completed, (type(None), bool)):
+            raise TypeError(msg.format('is_completed', is_completed))
+        elif not isinstance(is_started, (type(None), bool)):
+            raise TypeError(msg.format('is_started', is_started))
+
+        async for milestone in self.api.milestones(project_id, is_completed, is_started):
+            yield models.Milestone(self, milestone)
+
+    @milestones.register(models.Project)
+    async def _milestones_by_project(self, project, is_completed=None, is_started=None):
+        async for milestone in self.milestones(project.id, is_completed, is_started):
+            yield milestone
+
+    # Plan related methods
+    @dispatchmethod
+    def plan(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.Plan instance
+            `client.plan()` returns a new Plan instance (no API call)
+            `await client.plan(1234)` returns a Plan instance with an ID of 1234
+        """
+        return models.Plan(self)
+
+    @plan.register(int)
+    async def _plan_by_id(self, plan_id):
+        return models.Plan(self, await self.api.plan_by_id(plan_id))
+
+    # Priority related methods
+    @dispatchmethod
+    def priority(self):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @priority.register(int)
+    async def _priority_by_id(self, priority_id):
+        async for priority in self.priorities():
+            if priority.id == priority_id:
+                return priority
+
+        msg = "Could not locate a models.Priority with id of {0}"
+        raise TRAWClientError(msg.format(priority_id))
+
+    async def priorities(self):
+        """ Async generator of models.Priority objects """
+        async for priority in self.api.priorities():
+            yield models.Priority(self, priority)
+
+    # Project related methods
+    @dispatchmethod
+    def project(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.Project instance
+            `client.project()` returns a new Project instance (no API call)
+            `await client.project(1234)` returns a Project instance with an id of 1234
+        """
+        return models.Project(self)
+
+    @add.register(models.Project)
+    async def _project_add(self, project):
+        response = await self.api.project_add(project.add_params)
+        return models.Project(self, response)
+
+    @project.register(int)
+    async def _project_by_id(self, project_id):
+        return models.Project(self, await self.api.project_by_id(project_id))
+
+    @delete.register(models.Project)
+    async def _project_delete(self, project):
+        await self.api.project_delete(project.id)
+
+    @update.register(models.Project)
+    async def _project_update(self, project):
+        response = await self.api.project_update(project.id, project.update_params)
+        return models.Project(self, response)
+
+    async def projects(self, active_only=False, completed_only=False):
+        """ Async generator of models.Project objects
+
+        :param active_only: Only include currently active projects in list
+        :param completed_only: Only include completed projects in list
+        """
+        if active_only is True and completed_only is True:
+            raise TypeError('Either `active_only` or `completed_only` can be '
+                            'set to True, but not both')
+        elif active_only is True or completed_only is True:
+            is_completed = 1 if completed_only else 0
+        else:
+            is_completed = None
+
+        async for project in self.api.projects(is_completed):
+            yield models.Project(self, project)
+
+    # Result related methods
+    @dispatchmethod
+    def result(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a new models.Result instance (no API call) """
+        return models.Result(self)
+
+    @add.register(models.Result)
+    async def _result_add(self, result):
+        response = await self.api.result_add(result._content.get('test_id'), result.add_params)
+        return models.Result(self, response)
+
+    @dispatchmethod
+    def add_results(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Coroutine adding many results to a run in chunked bulk requests.
+            Accepts the same arguments as traw.Client.add_results
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Run or int"))
+
+    @add_results.register(int)
+    async def _add_results_by_run_id(self, run_id, results,
+                                     max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        entries = bulk_result_entries(results)
+        return await self._add_results_in_chunks(self.api.results_add, run_id, entries,
+                                                 max_bytes)
+
+    @add_results.register(models.Run)
+    async def _add_results_by_run(self, run, results, max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        return await self.add_results(run.id, results, max_bytes=max_bytes)
+
+    @dispatchmethod
+    def add_results_for_cases(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Coroutine adding many results to a run by case in chunked bulk
+            requests. Accepts the same arguments as traw.Client.add_results_for_cases
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Run or int"))
+
+    @add_results_for_cases.register(int)
+    async def _add_results_for_cases_by_run_id(self, run_id, results,
+                                               max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        entries = bulk_case_result_entries(results)
+        return await self._add_results_in_chunks(self.api.results_add_for_cases, run_id,
+                                                 entries, max_bytes)
+
+    @add_results_for_cases.register(models.Run)
+    async def _add_results_for_cases_by_run(self, run, results,
+                                            max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        return await self.add_results_for_cases(run.id, results, max_bytes=max_bytes)
+
+    async def _add_results_in_chunks(self, api_method, run_id, entries, max_bytes):
+        added = list()
+        for chunk in chunk_by_size(entries, max_bytes, overhead=BULK_BODY_OVERHEAD):
+            added.extend(await self._add_results_chunk(api_method, run_id, chunk))
+
+        return [models.Result(self, result) for result in added]
+
+    async def _add_results_chunk(self, api_method, run_id, chunk):
+        try:
+            return await api_method(run_id, chunk)
+        except TooLarge:
+            if len(chunk) == 1:
+                raise
+
+            half = len(chunk) // 2
+            return (await self._add_results_chunk(api_method, run_id, chunk[:half]) +
+                    await self._add_results_chunk(api_method, run_id, chunk[half:]))
+
+    @dispatchmethod
+    def results(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Result for the given models.Test/models.Run
+            object or ID. Accepts the same arguments as traw.Client.results
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Test or int"))
+
+    @results.register(int)
+    async def _results_by_obj_id(self, obj_id, obj_type=models.Test, with_status=None, limit=None):
+        API_METHODS = {models.Run: self.api.results_by_run_id,
+                       models.Test: self.api.results_by_test_id}
+        if obj_type not in API_METHODS:
+            msg = "Unknown obj_type. Must be {0}. Found {1}"
+            msg = msg.format(" or ".join([str(models.Run), str(models.Test)]), obj_type)
+            raise TypeError(msg)
+
+        params = dict()
+        if limit:
+            params['limit'] = int(limit)
+
+        ws_args = {'with_status': with_status}
+        normalize_param(ws_args, params, 'with_status', 'status_id', models.Status)
+
+        async for result in API_METHODS[obj_type](obj_id, **params):
+            yield models.Result(self, result)
+
+    @results.register(models.Run)
+    async def _results_by_run(self, run, with_status=None, limit=None):
+        params = dict(obj_type=models.Run, with_status=with_status, limit=limit)
+        async for result in self.results(run.id, **params):
+            yield result
+
+    @results.register(models.Test)
+    async def _results_by_test(self, test, with_status=None, limit=None):
+        async for result in self.results(test.id, with_status=with_status, limit=limit):
+            yield result
+
+    # Run related methods
+    @dispatchmethod
+    def run(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.Run instance
+            `client.run()` returns a new Run instance (no API call)
+            `await client.run(1234)` returns a Run instance with an ID of 1234
+        """
+        return models.Run(self)
+
+    @add.register(models.Run)
+    async def _run_add(self, run):
+        response = await self.api.run_add(run._content.get('project_id'), run.add_params)
+        return models.Run(self, response)
+
+    @run.register(int)
+    async def _run_by_id(self, run_id):
+        return models.Run(self, await self.api.run_by_id(run_id))
+
+    @close.register(models.Run)
+    async def _run_close(self, run):
+        return models.Run(self, await self.api.run_close(run.id))
+
+    @delete.register(models.Run)
+    async def _run_delete(self, run):
+        await self.api.run_delete(run.id)
+
+    @update.register(models.Run)
+    async def _run_update(self, run):
+        response = await self.api.run_update(run.id, run.update_params)
+        return models.Run(self, response)
+
+    @dispatchmethod
+    def runs(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Run for the given models.Project object
+            or project ID. Accepts the same filters as traw.Client.runs
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @runs.register(int)
+    async def _runs_by_project_id(self, project_id, **kwargs):
+        params = dict()
+        normalize_dt_filter(kwargs, params, 'created_after')
+        normalize_dt_filter(kwargs, params, 'created_before')
+
+        is_completed = kwargs.get('is_completed', None)
+        if is_completed is not None:
+            if is_completed is not True and is_completed is not False:
+                msg = "`is_completed` can only be None, True, or False. Found '{0}'"
+                raise TypeError(msg.format(is_completed))
+            params['is_completed'] = int(is_completed)
+
+        limit = kwargs.get('limit', None)
+        if limit:
+            params['limit'] = int(limit)
+
+        normalize_param(kwargs, params, 'created_by', 'created_by', models.User)
+        normalize_param(kwargs, params, 'milestone', 'milestone_id',
+                        models.Milestone, models.SubMilestone)
+        normalize_param(kwargs, params, 'suite', 'suite_id', models.Suite)
+
+        async for run in self.api.runs_by_project_id(project_id, **params):
+            yield models.Run(self, run)
+
+    @runs.register(models.Project)
+    async def _runs_by_project(self, project, **kwargs):
+        async for run in self.runs(project.id, **kwargs):
+            yield run
+
+    # Section related methods
+    @dispatchmethod
+    def section(self):
+        """ Return a new models.Section instance (no API call) """
+        return models.Section(self)
+
+    @add.register(models.Section)
+    async def _section_add(self, section):
+        project = await self.project(section._content.get('project_id'))
+        if project.suite_mode != 1 and section._content.get('suite_id') is None:
+            msg = ("You must associate the Section with a TestRail Suite "
+                   "if the Project is not in Single Suite mode")
+            raise ValueError(msg)
+        response = await self.api.section_add(project.id, section.add_params)
+        return models.Section(self, response)
+
+    @section.register(int)
+    async def _section_by_id(self, section_id):
+        return models.Section(self, await self.api.section_by_id(section_id))
+
+    @delete.register(models.Section)
+    async def _section_delete(self, section):
+        await self.api.section_delete(section.id)
+
+    @update.register(models.Section)
+    async def _section_update(self, section):
+        response = await self.api.section_update(section.id, section.update_params)
+        return models.Section(self, response)
+
+    @dispatchmethod
+    def sections(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Section for the given models.Project
+            object or project ID
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @sections.register(int)
+    async def _sections_by_project_id(self, project_id, suite=None):
+        project = await self.project(project_id)
+        if project.suite_mode != 1 and suite is None:
+            msg = ("The project with ID {0} is set to a suite_mode of {1}, which "
+                   "requires a valid suite or suite_id to retrieve sections")
+            raise TypeError(msg.format(project, project.suite_mode))
+
+        if suite and not isinstance(suite, (int, models.Suite)):
+            msg = ("``suite`` must be a models.Suite object, or int ID of a "
+                   "suite in testrail. Found {0}")
+            raise TypeError(msg.format(suite))
+
+        suite_id = suite.id if isinstance(suite, models.Suite) else suite
+
+        async for section in self.api.sections_by_project_id(project_id, suite_id):
+            yield models.Section(self, section)
+
+    @sections.register(models.Project)
+    async def _sections_by_project(self, project, suite=None):
+        async for section in self.sections(project.id, suite):
+            yield section
+
+    # Status related methods
+    @dispatchmethod
+    def custom_status(self, *args, **kwargs):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @custom_status.register(int)
+    async def _custom_status_by_id(self, custom_status_id):
+        async for status in self.statuses():
+            if status.id == 5 + custom_status_id:
+                return status
+
+        msg = "There is no active custom status associated with custom status ID {0}"
+        raise UnknownCustomStatusError(msg.format(custom_status_id))
+
+    @custom_status.register(str)
+    async def _custom_status_by_name(self, custom_status_str):
+        if (not custom_status_str.startswith('custom_status') or
+                custom_status_str[-1] not in '1234567'):
+            msg = ("custom_status_str must be of format 'custom_statusX', where X "
+                   "is between 1 and 7. Found {0}")
+            raise UnknownCustomStatusError(msg.format(custom_status_str))
+
+        custom_status_id = int(custom_status_str.split('custom_status')[1])
+        return await self.custom_status(custom_status_id)
+
+    @dispatchmethod
+    def status(self):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @status.register(int)
+    async def _status_by_id(self, status_id):
+        async for status in self.statuses():
+            if status.id == status_id:
+                return status
+
+        msg = "Could not locate a models.Status with id of {0}"
+        raise TRAWClientError(msg.format(status_id))
+
+    @status.register(str)
+    async def _status_by_label(self, label, strict=False):
+        async for status in self.statuses():
+            if label == status.label or (not strict and label.lower() == status.label.lower()):
+                return status
+
+        msg = "Could not locate a models.Status with label of {0}"
+        raise TRAWClientError(msg.format(label))
+
+    async def statuses(self):
+        """ Async generator of models.Status objects """
+        async for status in self.api.statuses():
+            yield models.Status(self, status)
+
+    # Suite related methods
+    @dispatchmethod
+    def suite(self):
+        """ Return a new models.Suite instance (no API call) """
+        return models.Suite(self)
+
+    @add.register(models.Suite)
+    async def _suite_add(self, suite):
+        response = await self.api.suite_add(suite._content.get('project_id'), suite.add_params)
+        return models.Suite(self, response)
+
+    @suite.register(int)
+    async def _suite_by_id(self, suite_id):
+        return models.Suite(self, await self.api.suite_by_id(suite_id))
+
+    @delete.register(models.Suite)
+    async def _suite_delete(self, suite):
+        await self.api.suite_delete(suite.id)
+
+    @update.register(models.Suite)
+    async def _suite_update(self, suite):
+        response = await self.api.suite_update(suite.id, suite.update_params)
+        return models.Suite(self, response)
+
+    @dispatchmethod
+    def suites(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Suite for the given models.Project
+            object or project ID
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @suites.register(int)
+    async def _suites_by_project_id(self, project_id):
+        async for suite in self.api.suites_by_project_id(project_id):
+            yield models.Suite(self, suite)
+
+    @suites.register(models.Project)
+    async def _suites_by_project(self, project):
+        async for suite in self.suites(project.id):
+            yield suite
+
+    # Template related methods
+    @dispatchmethod
+    def template(self):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @template.register(int)
+    async def _template_by_id(self, template_id):
+        async for project in self.projects():
+            async for template in self.templates(project):
+                if template.id == template_id:
+                    return template
+
+        msg = "Could not locate a models.Template with id of {0}"
+        raise TRAWClientError(msg.format(template_id))
+
+    @dispatchmethod
+    def templates(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Template for the given models.Project
+            object or project ID
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
+
+    @templates.register(int)
+    async def _templates_by_project_id(self, project_id):
+        async for template in self.api.templates(project_id):
+            yield models.Template(self, template)
+
+    @templates.register(models.Project)
+    async def _templates_by_project(self, project):
+        async for template in self.templates(project.id):
+            yield template
+
+    # Test related methods
+    @dispatchmethod
+    def test(self):
+        raise NotImplementedError(const.NOTIMP.format("int"))
+
+    @test.register(int)
+    async def _test_by_id(self, test_id):
+        return models.Test(self, await self.api.test_by_id(test_id))
+
+    @dispatchmethod
+    def tests(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Async generator of models.Test for the given models.Run object or run ID """
+        raise NotImplementedError(const.NOTIMP.format("models.Run or int"))
+
+    @tests.register(int)
+    async def _tests_by_run_id(self, run_id, with_status=None):
+        if with_status is not None:
+            with_status = with_status if isinstance(with_status, Iterable) else (with_status, )
+            if not all(isinstance(s, models.Status) for s in with_status):
+                msg = ("`with_status` must be either None, models.Status or an iterable of "
+                       "models.Status objects. Found {0}")
+                raise TypeError(msg.format(with_status))
+            with_status = ','.join([str(s.id) for s in with_status])
+
+        async for test in self.api.tests_by_run_id(run_id, with_status):
+            yield models.Test(self, test)
+
+    @tests.register(models.Run)
+    async def _tests_by_run(self, run, with_status=None):
+        async for test in self.tests(run.id, with_status):
+            yield test
+
+    # User related methods
+    @dispatchmethod
+    def user(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Return a models.User instance
+            `client.user()` returns a new User instance (no API call)
+            `await client.user(1234)` returns a User instance with an ID of 1234
+            `await client.user('user@email.com')` returns the user with that email
+        """
+        return models.User(self)
+
+    @user.register(str)
+    async def _user_by_email(self, email):
+        if '@' not in email:
+            raise ValueError('"email" must be a string that includes an "@" symbol')
+
+        return models.User(self, await self.api.user_by_email(email))
+
+    @user.register(int)
+    async def _user_by_id(self, user_id):
+        return models.User(self, await self.api.user_by_id(user_id))
+
+    async def users(self):
+        """ Async generator of models.User objects """
+        async for user in self.api.users():
+            yield models.User(self, user)
+
+
+def _milestone_model(client, content):
+    if content.get('parent_id', None) is None:
+        return models.Milestone(client, content)
+
+    return models.SubMilestone(client, content)
@@ -0,0 +1,182 @@
+import asyncio
+from copy import deepcopy
+import json
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+from requests.status_codes import codes
+
+from ..const import BASE_API_PATH, DEFAULT_MAX_CONNECTIONS, GET, TIMEOUT
+from ..exceptions import RateLimited, ServerError, ServiceUnavailableError, TRAWClientError, UnknownStatusCode
+from ..sessions import Session, request_key
+
+log = logging.getLogger(__package__)
+
+
+class AsyncRequest(object):
+    """ Minimal stand-in for ``requests.PreparedRequest``
+
+    TRAW's response exceptions only need the path and body of the request
+    """
+    def __init__(self, url, body=None):
+        self.path_url = url
+        self.body = body
+
+
+class AsyncResponse(object):
+    """ Adapts an ``aiohttp.ClientResponse`` to the parts of the
+    ``requests.Response`` interface used by TRAW's response exceptions
+    """
+    def __init__(self, status_code, reason, headers, content, request):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.request = request
+
+
+class AsyncSession(object):
+    """ Non-blocking counterpart of traw.sessions.Session, backed by aiohttp """
+    RATE_LIMIT_STATUS = Session.RATE_LIMIT_STATUS
+    STATUS_EXCEPTIONS = Session.STATUS_EXCEPTIONS
+    SUCCESS_STATUSES = Session.SUCCESS_STATUSES
+
+    def __init__(self, auth, url, max_connections=DEFAULT_MAX_CONNECTIONS, rate_limiter=None):
+        """ Prepare the connection to the TestRail API
+
+        :param auth: Tuple of username and api_key/password
+        :param url: Base url for testrail (e.g. https://<your company>.testrail.net)
+        :param max_connections: Maximum number of requests kept in flight at once
+        :param rate_limiter: Optional ``traw.ratelimit.TokenBucket`` that every
+            request (including retries) takes a token from before it is sent
+
+        """
+        if aiohttp is None:
+            raise TRAWClientError('aiohttp must be installed to use the traw.aio package')
+
+        self._auth = aiohttp.BasicAuth(*auth)
+        self._url = url
+        self._max_connections = max_connections
+        self._rate_limiter = rate_limiter
+        self._inflight = dict()
+
+        # Both are bound to the running event loop, so create them lazily
+        self._http = None
+        self._semaphore = None
+
+    @property
+    def retry_exceptions(self):
+        return (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                asyncio.TimeoutError, RateLimited, ServerError)
+
+    def _get_http(self):
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                auth=self._auth, headers={'Content-Type': 'application/json'},
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT))
+            self._semaphore = asyncio.Semaphore(self._max_connections)
+
+        return self._http
+
+    async def _make_request(self, method, url, json=None, params=None):  # pylint: disable=redefined-outer-name
+        http = self._get_http()
+        async with self._semaphore:
+            async with http.request(method, url, json=json, params=params) as resp:
+                content = await resp.read()
+
+        log.debug('Response: {} ({} bytes)'.format(resp.status, len(content)))
+
+        return AsyncResponse(resp.status, resp.reason, resp.headers, content,
+                             AsyncRequest(url, json))
+
+    async def _request(self, **kwargs):
+        Session._log_request(**kwargs)
+        if self._rate_limiter is not None:
+            wait = self._rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        response = await self._make_request(**kwargs)
+
+        if response.status_code in self.STATUS_EXCEPTIONS:
+            log.warning('Caught a ServerError ({0})'.format(response.status_code))
+            raise self.STATUS_EXCEPTIONS[response.status_code](response)
+        elif response.status_code == codes['no_content']:
+            log.warning('Received a response with no content')
+            return
+        elif response.status_code == self.RATE_LIMIT_STATUS:
+            retry_after = int(response.headers['Retry-After'])
+            log_msg = 'API rate limit reached. Retrying after {0} seconds'
+            log.warning(log_msg.format(retry_after))
+            if self._rate_limiter is not None:
+                self._rate_limiter.pause(retry_after)
+
+            await asyncio.sleep(retry_after)
+            raise RateLimited(response)
+        elif response.status_code not in self.SUCCESS_STATUSES:
+            msg = 'Received an unknown response status: {0}'
+            log.warning(msg.format(response.status_code))
+            raise UnknownStatusCode(response)
+
+        if not response.content:
+            return ''
+        else:
+            return json.loads(response.content.decode('utf-8'))
+
+    async def _request_with_retries(self, **kwargs):
+        """ Same retry policy as traw.sessions.Session, without blocking the loop """
+        return await _retry(lambda: _retry(lambda: self._request(**kwargs),
+                                           self.retry_exceptions, tries=3),
+                            (ServiceUnavailableError, ), tries=17)
+
+    async def close(self):
+        """ Close the session """
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def request(self, method, path, json=None, params=None):  # pylint: disable=redefined-outer-name
+        """Return the json content from the resource at ``path``.
+
+        :param method: The request verb. E.g., get, post, put.
+        :param path: The path of the request. This path will be combined with
+            the base TestRail api URL.
+        :param json: Object to be serialized to JSON in the body of the
+            request.
+        :param params: The query parameters to send with the request.
+
+        Identical GET requests made concurrently share a single HTTP request.
+
+        """
+        params = deepcopy(params) or dict()
+        url = '/'.join(part.strip('/') for part in [self._url, BASE_API_PATH, path])
+        if method != GET:
+            return await self._request_with_retries(method=method, json=json, params=params, url=url)
+
+        key = request_key(url, params)
+        task = self._inflight.get(key, None)
+        if task is not None:
+            return deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(
+            self._request_with_retries(method=method, json=json, params=params, url=url))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+async def _retry(coro_func, exceptions, tries, delay=1, backoff=2):
+    """ asyncio equivalent of the ``retry`` decorator used by traw.sessions """
+    while True:
+        tries -= 1
+        try:
+            return await coro_func()
+        except exceptions as exc:
+            if not tries:
+                raise
+            log.warning('{0}, retrying in {1} seconds...'.format(exc, delay))
+            await asyncio.sleep(delay)
+            delay *= backoff
@@ -0,0 +1,43 @@
+from copy import deepcopy
+from functools import wraps
+
+from ..const import DEFAULT_LIMIT
+from ..utils import next_offset, unpack_page
+
+
+def paginate(func):
+    """ Async generator counterpart of traw.utils.paginate
+
+        The decorated coroutine returns each page as TestRail sent it, either a
+        list of objects or a page envelope (see ``traw.utils.unpack_page``).
+    """
+    @wraps(func)
+    async def paginated_func(*args, **kwargs):
+        limit = kwargs.get('limit', None)
+        page_size = DEFAULT_LIMIT
+        offset = 0
+
+        while limit is None or offset < limit:
+            new_kwargs = deepcopy(kwargs)
+            new_kwargs['offset'] = offset
+            if limit:
+                new_kwargs['limit'] = min([limit - offset, page_size])
+
+            objs, envelope = unpack_page(await func(*args, **new_kwargs))
+            if limit:
+                objs = objs[:limit - offset]
+
+            for obj in objs:
+                yield obj
+
+            if envelope is not None:
+                page_size = envelope.get('limit') or page_size
+                offset = next_offset(envelope, offset, len(objs))
+                if offset is None:
+                    break
+            elif len(objs) < new_kwargs.get('limit', page_size):
+                break
+            else:
+                offset += len(objs)
+
+    return paginated_func
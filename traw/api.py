@@ -1,31 +1,84 @@
 import os
 from os import path
 from collections import defaultdict
+from datetime import datetime as dt
+import threading
 try:
     from ConfigParser import ConfigParser  # pragma: no cover
 except ImportError:  # pragma: no cover
     from configparser import ConfigParser  # pragma: no cover
 
-from .const import API_PATH, CONFIG_FILE_NAME, DEFAULT_CACHE_TIMEOUT, ENVs, GET, POST
+from .cache import LRUCache, SQLiteStore, freeze
+from .const import (API_PATH, CONFIG_FILE_NAME, DEFAULT_CACHE_FILE, DEFAULT_CACHE_MAX_BYTES,
+                    DEFAULT_CACHE_MAX_ENTRIES, DEFAULT_CACHE_TIMEOUT, ENVs, GET, POST)
 from .exceptions import TRAWLoginError
 from . import models
+from .ratelimit import shared_bucket
 from .sessions import Session
-from .utils import cacheable, cacheable_generator, clear_cache, paginate
+from .utils import cacheable, cacheable_generator, clear_cache, paginate, write_through
 
 _USER_KEY = 'username'
 _PASS_KEY = 'password'
 _URL_KEY = 'url'
 
 
+def _parent_milestone_ids(api, response, call_args):
+    """ The parent milestone of the milestone written to, before and after the
+        write (as parent milestones include their sub-milestones)
+    """
+    milestone_id = call_args.get('milestone_id', None)
+    before = api.milestone_by_id.peek(milestone_id) if milestone_id is not None else None
+    versions = [version for version in (before, response) if version]
+    if not versions:
+        raise KeyError('Parent of milestone {0} is unknown'.format(milestone_id))
+
+    return [version['parent_id'] for version in versions]
+
+
+def _run_id_of_test(api, response, call_args):  # pylint: disable=unused-argument
+    """ The run of the test a result was added to, if the test is cached """
+    return [api.test_by_id.peek(call_args['test_id'])['run_id']]
+
+
+def _section_suite_id(api, response, call_args):  # pylint: disable=unused-argument
+    """ The suite of a deleted section, if the section was cached """
+    return [api.section_by_id.peek(call_args['section_id'])['suite_id']]
+
+
+def _merge_by_id(objs, changed):
+    """ ``objs`` with each object in ``changed`` replacing the object with the
+        same id, or appended if there is none
+    """
+    merged = list(objs)
+    positions = dict((obj['id'], i) for i, obj in enumerate(merged))
+    for obj in changed:
+        position = positions.get(obj['id'], None)
+        if position is None:
+            positions[obj['id']] = len(merged)
+            merged.append(obj)
+        else:
+            merged[position] = obj
+
+    return merged
+
+
 class API(object):
     """ TRAW's interface class to TestRail's REST API
 
     The API class is not meant to be accessed directly, rather, use the traw.Client
     """
-    cache_timeouts = defaultdict(lambda: defaultdict(lambda: DEFAULT_CACHE_TIMEOUT))
-
-    def __init__(self, username=None, user_api_key=None, password=None, url=None):
+    def __init__(self, username=None, user_api_key=None, password=None, url=None,
+                 cache_engine=LRUCache, cache_dir=None, rate_limit=None, rate_limit_file=None):
         """
+        :param cache_engine: Factory for the ``traw.cache.CacheEngine`` that backs
+            each cached API method. Every API instance gets its own caches
+        :param cache_dir: Optional directory in which cached responses are also
+            persisted, and shared with every other API for the same url and
+            user (in this process, or any other on the host)
+        :param rate_limit: Optional requests per minute budget, shared with
+            every other API for the same url in this process
+        :param rate_limit_file: Optional path of a file through which the
+            ``rate_limit`` budget is also shared with other processes
         """
         config = _load_config()
         _username = username or _env_var(_USER_KEY) or config[_USER_KEY]
@@ -37,7 +90,24 @@ class API(object):
                    'use TRAW')
             raise TRAWLoginError(msg)
 
-        self._session = Session(auth=(_username, _password), url=_url)
+        self.cache_engine = cache_engine
+        self.cache_timeouts = defaultdict(lambda: DEFAULT_CACHE_TIMEOUT)
+        self.cache_staleness = defaultdict(int)
+        self.cache_limits = defaultdict(lambda: dict(max_entries=DEFAULT_CACHE_MAX_ENTRIES,
+                                                     max_bytes=DEFAULT_CACHE_MAX_BYTES))
+        self.case_syncs = cache_engine()  # Case listing sync state, by (project_id, suite_id)
+        self._case_sync_lock = threading.Lock()
+        self.cache_store = None
+        if cache_dir is not None:
+            self.cache_store = SQLiteStore(path.join(cache_dir, DEFAULT_CACHE_FILE),
+                                           scope='{0}@{1}'.format(_username, _url))
+
+        rate_limiter = None
+        if rate_limit:
+            rate_limiter = shared_bucket(_url, rate_limit, path=rate_limit_file)
+
+        self._session = Session(auth=(_username, _password), url=_url,
+                                rate_limiter=rate_limiter)
 
     @cacheable(models.Case)
     def case_by_id(self, case_id):
@@ -50,15 +120,59 @@ class API(object):
         path = API_PATH['get_case'].format(case_id=case_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Case)
+    @cacheable_generator(models.Case, seeds=case_by_id)
     def cases_by_project_id(self, project_id, **params):
         """ Calls `get_cases` API endpoint
 
         :yields: case dictionaries from api
         """
+        return self._cases(project_id, **params)
+
+    @paginate
+    def _cases(self, project_id, **params):
         path = API_PATH['get_cases'].format(project_id=project_id)
-        for case in self._session.request(method=GET, path=path, params=params):
-            yield case
+        return self._session.request(method=GET, path=path, params=params)
+
+    def cases_synced(self, project_id, suite_id=None):
+        """ Returns the cases of a project (or of one of its suites), like
+            `cases_by_project_id`, but refreshes an expired listing by only
+            fetching the cases updated since the newest case it includes
+
+        The listing is kept in the ``case_syncs`` cache engine by (project_id,
+        suite_id), along with its newest ``updated_on``, within the
+        models.Case cache limits. Cases deleted in TestRail are not reported
+        as updated, so they remain in the listing until the case caches are
+        cleared.
+
+        :returns: list of case dicts
+        """
+        key = (project_id, suite_id)
+        params = dict(suite_id=suite_id) if suite_id is not None else dict()
+        entry = self.case_syncs.get(key, dt.now())
+        sync = entry['value'] if entry is not None else None
+        cases = self.cases_by_project_id.peek(project_id, **params)
+        if cases is None and sync is None:
+            cases = freeze(list(self.cases_by_project_id(project_id, **params)))
+        elif cases is None:
+            # Cases updated in the same second as the newest known case
+            # may not have been listed yet, so that second is fetched again
+            changed = freeze(list(self._cases(project_id, updated_after=sync['updated_on'] - 1, **params)))
+            for case in changed:
+                self.case_by_id.prime(case, case['id'])
+
+            cases = freeze(_merge_by_id(sync['cases'], changed))
+            self.cases_by_project_id.prime(cases, project_id, **params)
+
+        if sync is None or sync['cases'] is not cases:
+            updated_on = max([case.get('updated_on', None) or 0 for case in cases] or [0])
+            with self._case_sync_lock:
+                # A concurrent sync may have stored a newer listing meanwhile
+                entry = self.case_syncs.get(key, dt.now())
+                if entry is None or entry['value']['updated_on'] <= updated_on:
+                    self.case_syncs.configure(**self.cache_limits[models.Case])
+                    self.case_syncs.set(key, dict(cases=cases, updated_on=updated_on), dt.max)
+
+        return cases
 
     @cacheable_generator(models.CaseType)
     def case_types(self):
@@ -145,20 +259,23 @@ class API(object):
         for milestone in self._session.request(method=GET, path=path, params=params):
             yield milestone
 
-    @clear_cache(milestones)
-    @clear_cache(milestone_by_id)
+    @write_through(milestone_by_id)
+    @clear_cache(milestones, 'project_id')
+    @clear_cache(milestone_by_id, 'milestone_id', lookup=_parent_milestone_ids)
     def milestone_add(self, project_id, params):
         path = API_PATH['add_milestone'].format(project_id=project_id)
         return self._session.request(method=POST, path=path, json=params)
 
-    @clear_cache(milestones)
-    @clear_cache(milestone_by_id)
+    @clear_cache(milestones, 'project_id')
+    @clear_cache(milestone_by_id, 'milestone_id')
+    @clear_cache(milestone_by_id, 'milestone_id', lookup=_parent_milestone_ids)
     def milestone_delete(self, milestone_id):
         path = API_PATH['delete_milestone'].format(milestone_id=milestone_id)
         return self._session.request(method=POST, path=path)
 
-    @clear_cache(milestones)
-    @clear_cache(milestone_by_id)
+    @write_through(milestone_by_id)
+    @clear_cache(milestones, 'project_id')
+    @clear_cache(milestone_by_id, 'milestone_id', lookup=_parent_milestone_ids)
     def milestone_update(self, milestone_id, params):
         path = API_PATH['update_milestone'].format(milestone_id=milestone_id)
         return self._session.request(method=POST, path=path, json=params)
@@ -195,7 +312,7 @@ class API(object):
         path = API_PATH['get_project'].format(project_id=project_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Project)
+    @cacheable_generator(models.Project, seeds=project_by_id)
     def projects(self, is_completed=None):
         """ Calls `projects` API endpoint with given filter
 
@@ -212,34 +329,36 @@ class API(object):
         for project in self._session.request(method=GET, path=path, params=params):
             yield project
 
+    @write_through(project_by_id)
     @clear_cache(projects)
-    @clear_cache(project_by_id)
     def project_add(self, params):
         path = API_PATH['add_project']
         return self._session.request(method=POST, path=path, json=params)
 
     @clear_cache(projects)
-    @clear_cache(project_by_id)
+    @clear_cache(project_by_id, 'project_id')
     def project_delete(self, project_id):
         path = API_PATH['delete_project'].format(project_id=project_id)
         return self._session.request(method=POST, path=path)
 
+    @write_through(project_by_id)
     @clear_cache(projects)
-    @clear_cache(project_by_id)
     def project_update(self, project_id, params):
         path = API_PATH['update_project'].format(project_id=project_id)
         return self._session.request(method=POST, path=path, json=params)
 
     @cacheable_generator(models.Result)
-    @paginate
     def results_by_run_id(self, run_id, **params):
         """ Calls `get_results_for_run` API endpoint
 
         :yields: result dictionaries from api
         """
+        return self._results_for_run(run_id, **params)
+
+    @paginate
+    def _results_for_run(self, run_id, **params):
         path = API_PATH['get_results_for_run'].format(run_id=run_id)
-        for result in self._session.request(method=GET, path=path, params=params):
-            yield result
+        return self._session.request(method=GET, path=path, params=params)
 
     @cacheable_generator(models.Result)
     @paginate
@@ -249,15 +368,36 @@ class API(object):
         :yields: result dictionaries from api
         """
         path = API_PATH['get_results'].format(test_id=test_id)
-        for result in self._session.request(method=GET, path=path, params=params):
-            yield result
+        return self._session.request(method=GET, path=path, params=params)
 
-    @clear_cache(results_by_run_id)
-    @clear_cache(results_by_test_id)
+    @clear_cache(results_by_run_id, 'run_id', lookup=_run_id_of_test)
+    @clear_cache(results_by_test_id, 'test_id')
     def result_add(self, test_id, params):
         path = API_PATH['add_result'].format(test_id=test_id)
         return self._session.request(method=POST, path=path, json=params)
 
+    @clear_cache(results_by_run_id, 'run_id')
+    @clear_cache(results_by_test_id, 'test_id')
+    def results_add(self, run_id, results):
+        """ Calls `add_results` API endpoint with a list of result dicts, each
+            with a `test_id`
+
+        :returns: list of added result dicts
+        """
+        path = API_PATH['add_results'].format(run_id=run_id)
+        return self._session.request(method=POST, path=path, json={'results': results})
+
+    @clear_cache(results_by_run_id, 'run_id')
+    @clear_cache(results_by_test_id, 'test_id')
+    def results_add_for_cases(self, run_id, results):
+        """ Calls `add_results_for_cases` API endpoint with a list of result
+            dicts, each with a `case_id`
+
+        :returns: list of added result dicts
+        """
+        path = API_PATH['add_results_for_cases'].format(run_id=run_id)
+        return self._session.request(method=POST, path=path, json={'results': results})
+
     @cacheable(models.Run)
     def run_by_id(self, run_id):
         """ Calls `get_run` API endpoint with the given run_id
@@ -269,34 +409,39 @@ class API(object):
         path = API_PATH['get_run'].format(run_id=run_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Run)
-    @paginate
+    @cacheable_generator(models.Run, seeds=run_by_id)
     def runs_by_project_id(self, project_id, **params):
         """ Calls `get_runs` API endpoint
 
         :yields: run dictionaries from api
         """
-        path = API_PATH['get_runs'].format(project_id=project_id)
+        return self._runs(project_id, **params)
 
-        for run in self._session.request(method=GET, path=path, params=params):
-            yield run
+    @paginate
+    def _runs(self, project_id, **params):
+        path = API_PATH['get_runs'].format(project_id=project_id)
+        return self._session.request(method=GET, path=path, params=params)
 
-    @clear_cache(run_by_id)
+    @write_through(run_by_id)
+    @clear_cache(runs_by_project_id, 'project_id')
     def run_add(self, project_id, params):
         path = API_PATH['add_run'].format(project_id=project_id)
         return self._session.request(method=POST, path=path, json=params)
 
-    @clear_cache(run_by_id)
+    @write_through(run_by_id)
+    @write_through(runs_by_project_id, 'project_id')
     def run_close(self, run_id):
         path = API_PATH['close_run'].format(run_id=run_id)
         return self._session.request(method=POST, path=path)
 
-    @clear_cache(run_by_id)
+    @clear_cache(run_by_id, 'run_id')
+    @clear_cache(runs_by_project_id, 'project_id')
     def run_delete(self, run_id):
         path = API_PATH['delete_run'].format(run_id=run_id)
         return self._session.request(method=POST, path=path)
 
-    @clear_cache(run_by_id)
+    @write_through(run_by_id)
+    @write_through(runs_by_project_id, 'project_id')
     def run_update(self, run_id, params):
         path = API_PATH['update_run'].format(run_id=run_id)
         return self._session.request(method=POST, path=path, json=params)
@@ -312,7 +457,7 @@ class API(object):
         path = API_PATH['get_section'].format(section_id=section_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Section)
+    @cacheable_generator(models.Section, seeds=section_by_id)
     def sections_by_project_id(self, project_id, suite_id=None):
         """ Calls `get_sections` API endpoint
 
@@ -323,20 +468,20 @@ class API(object):
         for section in self._session.request(method=GET, path=path, params=params):
             yield section
 
-    @clear_cache(section_by_id)
-    @clear_cache(sections_by_project_id)
+    @write_through(section_by_id)
+    @clear_cache(sections_by_project_id, 'project_id')
     def section_add(self, project_id, params):
         path = API_PATH['add_section'].format(project_id=project_id)
         return self._session.request(method=POST, path=path, json=params)
 
-    @clear_cache(section_by_id)
-    @clear_cache(sections_by_project_id)
+    @clear_cache(section_by_id, 'section_id')
+    @clear_cache(sections_by_project_id, 'suite_id', lookup=_section_suite_id)
     def section_delete(self, section_id):
         path = API_PATH['delete_section'].format(section_id=section_id)
         return self._session.request(method=POST, path=path)
 
-    @clear_cache(section_by_id)
-    @clear_cache(sections_by_project_id)
+    @write_through(section_by_id)
+    @write_through(sections_by_project_id, 'suite_id')
     def section_update(self, section_id, params):
         path = API_PATH['update_section'].format(section_id=section_id)
         return self._session.request(method=POST, path=path, json=params)
@@ -362,7 +507,7 @@ class API(object):
         path = API_PATH['get_suite'].format(suite_id=suite_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Suite)
+    @cacheable_generator(models.Suite, seeds=suite_by_id)
     def suites_by_project_id(self, project_id):
         """ Calls `get_suites` API endpoint
 
@@ -372,20 +517,20 @@ class API(object):
         for suite in self._session.request(method=GET, path=path):
             yield suite
 
-    @clear_cache(suite_by_id)
-    @clear_cache(suites_by_project_id)
+    @write_through(suite_by_id)
+    @clear_cache(suites_by_project_id, 'project_id')
     def suite_add(self, project_id, params):
         path = API_PATH['add_suite'].format(project_id=project_id)
         return self._session.request(method=POST, path=path, json=params)
 
-    @clear_cache(suite_by_id)
-    @clear_cache(suites_by_project_id)
+    @clear_cache(suite_by_id, 'suite_id')
+    @clear_cache(suites_by_project_id, 'project_id')
     def suite_delete(self, suite_id):
         path = API_PATH['delete_suite'].format(suite_id=suite_id)
         return self._session.request(method=POST, path=path)
 
-    @clear_cache(suite_by_id)
-    @clear_cache(suites_by_project_id)
+    @write_through(suite_by_id)
+    @write_through(suites_by_project_id, 'project_id')
     def suite_update(self, suite_id, params):
         path = API_PATH['update_suite'].format(suite_id=suite_id)
         return self._session.request(method=POST, path=path, json=params)
@@ -411,16 +556,20 @@ class API(object):
         path = API_PATH['get_test'].format(test_id=test_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.Test)
-    def tests_by_run_id(self, run_id, status_id=None):
+    @cacheable_generator(models.Test, seeds=test_by_id)
+    def tests_by_run_id(self, run_id, status_id=None, **params):
         """ Calls `get_tests` API endpoint
 
         :yields: test dictionaries from api
         """
+        if status_id:
+            params['status_id'] = status_id
+        return self._tests(run_id, **params)
+
+    @paginate
+    def _tests(self, run_id, **params):
         path = API_PATH['get_tests'].format(run_id=run_id)
-        params = {'status_id': status_id} if status_id else None
-        for test in self._session.request(method=GET, path=path, params=params):
-            yield test
+        return self._session.request(method=GET, path=path, params=params)
 
     @cacheable(models.User)
     def user_by_email(self, email):
@@ -445,7 +594,7 @@ class API(object):
         path = API_PATH['get_user'].format(user_id=user_id)
         return self._session.request(method=GET, path=path)
 
-    @cacheable_generator(models.User)
+    @cacheable_generator(models.User, seeds=user_by_id)
     def users(self):
         """ Calls `users` API endpoint
 
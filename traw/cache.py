@@ -0,0 +1,465 @@
+""" Cache engines used by TRAW's ``cacheable`` and ``cacheable_generator`` decorators
+
+A cache engine stores API responses by key, along with the time they expire
+and, optionally, the earlier time they become stale (due for a refresh, but
+still served meanwhile). These times are compared against the ``now`` value
+passed in by the caller, and are otherwise treated as opaque values.
+
+Any object implementing the ``CacheEngine`` interface can be used to back an
+API method's cache (see ``traw.utils.cacheable``).
+
+Cached responses are shared by every model built from them, so they are stored
+read-only (see ``freeze``). Models copy a response before editing it.
+
+Responses can also be kept on disk, in a ``SQLiteStore`` shared by every
+process on the host that uses the same file, so they survive process restarts
+(see the ``cache_dir`` argument of ``traw.Client``).
+"""
+from ast import literal_eval
+from collections import OrderedDict
+from datetime import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from six.moves import cPickle as pickle
+
+from .const import (DEFAULT_CACHE_LOCK_TIMEOUT, DEFAULT_CACHE_MAX_BYTES, DEFAULT_CACHE_MAX_ENTRIES,
+                    DEFAULT_CACHE_SWEEP_INTERVAL)
+
+_PICKLE_PROTOCOL = 2
+
+
+class CacheEngine(object):
+    """ Interface for TRAW cache engines """
+    def configure(self, max_entries=None, max_bytes=None):
+        """ Change the size limits of the cache. ``None`` means unlimited """
+        raise NotImplementedError()
+
+    def get(self, key, now):
+        """ Return the entry dict (``{'value': ..., 'expires': ...,
+            'fresh_until': ...}``) for ``key``, or None if there is no entry or
+            the entry has expired
+        """
+        raise NotImplementedError()
+
+    def set(self, key, value, expires, now=None, fresh_until=None):
+        """ Store ``value`` under ``key`` until ``expires``. The value is stale
+            after ``fresh_until``, which defaults to ``expires``
+        """
+        raise NotImplementedError()
+
+    def pop(self, key, default=None):
+        """ Remove the entry for ``key``, returning it (or ``default``) """
+        raise NotImplementedError()
+
+    def sweep(self, now):
+        """ Remove all entries that have expired as of ``now`` """
+        raise NotImplementedError()
+
+    def clear(self):
+        """ Remove all entries """
+        raise NotImplementedError()
+
+    def keys(self):
+        raise NotImplementedError()
+
+    def __contains__(self, key):
+        raise NotImplementedError()
+
+    def __len__(self):
+        raise NotImplementedError()
+
+
+class LRUCache(CacheEngine):
+    """ Bounded, thread-safe, in-memory cache engine
+
+    When either limit is exceeded, expired entries are dropped first, and then
+    entries are evicted in least-recently-used order until the cache fits.
+    Expired entries are also swept proactively every ``sweep_interval`` writes,
+    so entries that are never read again do not linger.
+
+    :param max_entries: Maximum number of entries, or None for no limit
+    :param max_bytes: Maximum (approximate) size of the cached values, or None
+        for no limit
+    :param sweep_interval: Number of writes between expiry sweeps
+    """
+    def __init__(self, max_entries=DEFAULT_CACHE_MAX_ENTRIES, max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                 sweep_interval=DEFAULT_CACHE_SWEEP_INTERVAL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._writes = 0
+
+    @property
+    def size(self):
+        """ The approximate size, in bytes, of the cached values """
+        return self._bytes
+
+    def configure(self, max_entries=None, max_bytes=None):
+        if max_entries == self.max_entries and max_bytes == self.max_bytes:
+            return
+
+        with self._lock:
+            if max_bytes is not None and self.max_bytes is None:
+                # Sizes are only tracked while there is a byte limit
+                for entry in self._entries.values():
+                    entry['size'] = sizeof(entry['value'])
+                self._bytes = sum(entry['size'] for entry in self._entries.values())
+
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+            elif entry['expires'] < now:
+                self._remove(key)
+                return None
+
+            self._touch(key)
+            return entry
+
+    def set(self, key, value, expires, now=None, fresh_until=None):
+        entry = {'value': value, 'expires': expires,
+                 'fresh_until': fresh_until if fresh_until is not None else expires,
+                 'size': sizeof(value) if self.max_bytes is not None else 0}
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._bytes += entry['size']
+
+            self._writes += 1
+            if now is not None and self._writes % self.sweep_interval == 0:
+                self.sweep(now)
+
+            self._evict(now)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            return self._remove(key)
+
+    def sweep(self, now):
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry['expires'] < now]
+            for key in expired:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _over_limit(self):
+        return ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes))
+
+    def _evict(self, now=None):
+        if not self._over_limit():
+            return
+
+        if now is not None:
+            self.sweep(now)
+
+        while self._entries and self._over_limit():
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
+        return entry
+
+    def _touch(self, key):
+        if sys.version_info >= (3, 2):
+            self._entries.move_to_end(key)
+        else:  # pragma: no cover
+            self._entries[key] = self._entries.pop(key)
+
+
+class SQLiteStore(object):
+    """ Persistent cache storage, shared through a SQLite database file
+
+    Every process (and thread) that opens a store for the same ``path`` reads
+    and writes the same entries; SQLite serializes concurrent writers, which
+    wait up to ``lock_timeout`` seconds for each other. Entries are grouped by
+    ``scope`` (e.g. the TestRail url and user) and by name (the cached API
+    method), and expire like those of any other cache engine. Expired entries
+    are swept every ``sweep_interval`` writes.
+
+    Keys must be made of literals (numbers, strings, None, tuples, ...), and
+    values must be picklable.
+
+    :param path: Path of the database file. It is created if it does not exist
+    :param scope: str, separates the entries of different TestRail instances
+        or users that share the file
+    """
+    def __init__(self, path, scope='', lock_timeout=DEFAULT_CACHE_LOCK_TIMEOUT,
+                 sweep_interval=DEFAULT_CACHE_SWEEP_INTERVAL):
+        self.path = path
+        self.scope = scope
+        self.lock_timeout = lock_timeout
+        self.sweep_interval = sweep_interval
+
+        self._connection = ThreadConnections(path, lock_timeout)
+        self._writes = 0
+
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (scope TEXT, name TEXT, key TEXT, '
+                         'expires REAL, value BLOB, PRIMARY KEY (scope, name, key))')
+
+    def get(self, name, key, now):
+        """ Return the entry dict for ``key`` in ``name``, or None """
+        row = self._connection().execute(
+            'SELECT value FROM entries WHERE scope = ? AND name = ? AND key = ? AND expires >= ?',
+            (self.scope, name, repr(key), _timestamp(now))).fetchone()
+        if row is None:
+            return None
+
+        return pickle.loads(bytes(row[0]))
+
+    def set(self, name, key, value, expires, now=None, fresh_until=None):
+        """ Store ``value`` under ``key`` in ``name`` until ``expires`` (stale
+            after ``fresh_until``)
+        """
+        entry = pickle.dumps({'value': value, 'expires': expires,
+                              'fresh_until': fresh_until if fresh_until is not None else expires},
+                             _PICKLE_PROTOCOL)
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                         (self.scope, name, repr(key), _timestamp(expires), sqlite3.Binary(entry)))
+
+        self._writes += 1
+        if now is not None and self._writes % self.sweep_interval == 0:
+            self.sweep(now)
+
+    def pop(self, name, key):
+        """ Remove the entry for ``key`` in ``name``, returning it (or None) """
+        with self._connection() as conn:
+            row = conn.execute('SELECT value FROM entries WHERE scope = ? AND name = ? AND key = ?',
+                               (self.scope, name, repr(key))).fetchone()
+            conn.execute('DELETE FROM entries WHERE scope = ? AND name = ? AND key = ?',
+                         (self.scope, name, repr(key)))
+
+        return pickle.loads(bytes(row[0])) if row is not None else None
+
+    def sweep(self, now):
+        """ Remove every entry of every name that has expired as of ``now`` """
+        with self._connection() as conn:
+            conn.execute('DELETE FROM entries WHERE scope = ? AND expires < ?',
+                         (self.scope, _timestamp(now)))
+
+    def clear(self, name):
+        """ Remove every entry in ``name`` """
+        with self._connection() as conn:
+            conn.execute('DELETE FROM entries WHERE scope = ? AND name = ?', (self.scope, name))
+
+    def keys(self, name):
+        rows = self._connection().execute('SELECT key FROM entries WHERE scope = ? AND name = ?',
+                                          (self.scope, name))
+        keys = list()
+        for row in rows:
+            try:
+                keys.append(literal_eval(row[0]))
+            except (SyntaxError, ValueError):  # Not a literal, so it can never be looked up
+                pass
+
+        return keys
+
+
+class PersistentCache(CacheEngine):
+    """ Cache engine that keeps entries both in memory and in a ``SQLiteStore``
+
+    Entries are read from memory when possible, and from the store otherwise
+    (e.g. when they were cached by an earlier or a concurrent process). Every
+    write goes to both, so the size limits set with ``configure`` only apply
+    to the in-memory entries.
+
+    :param store: The ``SQLiteStore`` holding the persistent entries
+    :param name: Name of the entries in the store, e.g. the cached method's name
+    :param memory: The in-memory cache engine. Defaults to an ``LRUCache``
+    """
+    def __init__(self, store, name, memory=None):
+        self.store = store
+        self.name = name
+        self.memory = memory if memory is not None else LRUCache()
+
+    def configure(self, max_entries=None, max_bytes=None):
+        self.memory.configure(max_entries, max_bytes)
+
+    def get(self, key, now):
+        entry = self.memory.get(key, now)
+        if entry is None:
+            entry = self.store.get(self.name, key, now)
+            if entry is not None:
+                self.memory.set(key, entry['value'], entry['expires'], now, entry.get('fresh_until', None))
+
+        return entry
+
+    def set(self, key, value, expires, now=None, fresh_until=None):
+        self.memory.set(key, value, expires, now, fresh_until)
+        self.store.set(self.name, key, value, expires, now, fresh_until)
+
+    def pop(self, key, default=None):
+        entry = self.memory.pop(key, None)
+        stored = self.store.pop(self.name, key)
+        if entry is None:
+            entry = stored
+
+        return entry if entry is not None else default
+
+    def sweep(self, now):
+        self.memory.sweep(now)
+        self.store.sweep(now)
+
+    def clear(self):
+        self.memory.clear()
+        self.store.clear(self.name)
+
+    def keys(self):
+        keys = self.memory.keys()
+        return keys + [key for key in self.store.keys(self.name) if key not in self.memory]
+
+    def __contains__(self, key):
+        return key in self.memory or key in self.store.keys(self.name)
+
+    def __len__(self):
+        return len(self.keys())
+
+
+def connect_sqlite(path, lock_timeout=DEFAULT_CACHE_LOCK_TIMEOUT):
+    """ Open the SQLite database at ``path`` (and its directory), for use by
+        concurrent processes
+
+    Writers wait up to ``lock_timeout`` seconds for each other, and readers
+    are not blocked by writers.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:  # Created by another process in the meantime
+            if not os.path.isdir(directory):
+                raise
+
+    conn = sqlite3.connect(path, timeout=lock_timeout)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+
+class ThreadConnections(object):
+    """ Per-thread connections to the SQLite database at ``path`` (see
+        ``connect_sqlite``)
+
+    Calling the object returns the calling thread's connection. Connections
+    are not shared between threads, nor with processes forked from this one.
+    """
+    def __init__(self, path, lock_timeout=DEFAULT_CACHE_LOCK_TIMEOUT):
+        self.path = path
+        self.lock_timeout = lock_timeout
+        self._local = threading.local()
+
+    def __call__(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = connect_sqlite(self.path, self.lock_timeout)
+            self._local.pid = os.getpid()
+
+        return conn
+
+
+def _timestamp(value):
+    """ ``value`` as a number that orders like it, for expiry times stored in SQLite """
+    if isinstance(value, datetime):
+        return time.mktime(value.timetuple()) + value.microsecond / 1e6
+
+    return value
+
+
+def sizeof(obj, _seen=None):
+    """ Approximate the memory footprint of ``obj``, including its contents """
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(sizeof(k, _seen) + sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item, _seen) for item in obj)
+
+    return size
+
+
+class ReadOnlyDict(dict):
+    """ dict that cannot be modified, used for cached API responses
+
+    ``copy()`` returns a regular (mutable) dict.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Cached TestRail responses are read-only')
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce_ex__(self, protocol):
+        return (self.__class__, (dict(self), ))
+
+
+class ReadOnlyList(list):
+    """ list that cannot be modified, used for cached API responses """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Cached TestRail responses are read-only')
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = _read_only
+    __iadd__ = __imul__ = _read_only
+
+    def __reduce_ex__(self, protocol):
+        return (self.__class__, (list(self), ))
+
+
+def freeze(value):
+    """ Returns a read-only copy of the API response ``value``
+
+    dicts and lists, including nested ones, are converted to ``ReadOnlyDict``
+    and ``ReadOnlyList``. Values that are already read-only are returned as is.
+    """
+    if isinstance(value, (ReadOnlyDict, ReadOnlyList)):
+        return value
+    elif isinstance(value, dict):
+        return ReadOnlyDict((key, freeze(val)) for key, val in value.items())
+    elif isinstance(value, list):
+        return ReadOnlyList(freeze(val) for val in value)
+
+    return value
@@ -1,13 +1,17 @@
 from collections import Iterable
 from datetime import datetime as dt
+from itertools import islice
+import threading
 import time
+from weakref import WeakValueDictionary
 
 from . import const
 from . import models
 from .api import API
-from .exceptions import TRAWClientError, UnknownCustomStatusError
+from .cache import ReadOnlyDict, freeze
+from .exceptions import TooLarge, TRAWClientError, UnknownCustomStatusError
 from .models.model_base import ModelBase
-from .utils import dispatchmethod
+from .utils import chunk_by_size, dispatchmethod, map_with_workers
 
 
 class Client(object):
@@ -39,11 +43,72 @@ class Client(object):
        - (optional) You may substitute `password = <password>` for `user_api_key`
 
     If both a user api key and a user password are provided, the api key will be used
+
+    Each client caches API responses separately from every other client. The
+    engine backing those caches can be replaced with the ``cache_engine``
+    keyword (a factory for ``traw.cache.CacheEngine`` objects):
+
+    .. code-block:: python
+
+        testrail = traw.Client(cache_engine=functools.partial(LRUCache, max_entries=100))
+
+    With ``cache_dir``, responses are also cached on disk, so later clients
+    (e.g. in the next CI job on the same host) can reuse them until they
+    expire. The cache is safe to share between concurrent processes:
+
+    .. code-block:: python
+
+        testrail = traw.Client(cache_dir=os.path.expanduser('~/.cache/traw'))
+
+    With ``identity_map=True``, the client returns the same model object for a
+    given TestRail object for as long as that model object is in use, instead
+    of a new model object on every lookup:
+
+    .. code-block:: python
+
+        testrail = traw.Client(identity_map=True)
+        testrail.user(15) is testrail.user(15)  # True
+
+    Lookups refresh the model object with the latest response, unless it has
+    local edits: those are kept, and the object is not refreshed again while
+    it is in use.
     """
-    def __init__(self, **credentials):
+    def __init__(self, identity_map=False, **credentials):
         """ Initialize the TRAW instance """
         # TODO: Update doc string with supported credential keywords
         self.api = API(**credentials)
+        self._indexes = dict()
+
+        self._identity_map = WeakValueDictionary() if identity_map else None
+        self._identity_lock = threading.Lock()
+
+        self._template_index = dict()  # Template id: (project id, models.Template)
+        self._indexed_projects = dict()  # Project id: time its indexed templates expire
+        self._template_lock = threading.Lock()
+
+    def _model(self, model_cls, content):
+        """ Returns a ``model_cls`` object for the API response ``content``
+
+        With an identity map, the model object already in use for that object
+        (if any) is returned instead of a new one, refreshed with ``content``
+        unless it has local edits.
+        """
+        obj_id = content.get('id', None) if isinstance(content, dict) else None
+        if self._identity_map is None or obj_id is None:
+            return model_cls(self, content)
+
+        # Mapped objects only hold read-only content until they are edited
+        # locally, which tells edited objects apart
+        content = freeze(content)
+        key = (model_cls, obj_id)
+        with self._identity_lock:
+            obj = self._identity_map.get(key, None)
+            if obj is None:
+                obj = self._identity_map[key] = model_cls(self, content)
+            elif obj._content is not content and isinstance(obj._content, ReadOnlyDict):
+                obj._content = content
+
+        return obj
 
     # POST generics
     @dispatchmethod
@@ -70,6 +135,143 @@ class Client(object):
         msg = "TRAW and/or TestRail's API does not support updating objects of type {0}"
         raise TypeError(msg.format(type(obj)))
 
+    # Relation loading
+    def resolve(self, objects, *relations, **kwargs):
+        """ Load the objects related to ``objects`` through each of
+            ``relations`` with as few API calls as possible
+
+        The related objects are loaded into the client's caches, so accessing
+        those relations of ``objects`` afterwards does not call TestRail. Where
+        TestRail can list them, related objects are listed in bulk (e.g. all
+        users at once, or the cases of a run's suite); the rest are fetched
+        individually, once per distinct id.
+
+        The size limits set with ``change_cache_limits`` are lifted for the
+        duration of the call, so every related object is loaded into the
+        caches. They apply again from the next time those caches store a
+        response, so resolving more related objects than a cache can hold
+        only keeps the most recently used of them cached from then on.
+
+        `client.resolve(tests, 'case', 'assigned_to')`
+        `client.resolve(results, 'test', 'created_by', workers=4)`
+
+        :param objects: iterable of models objects
+        :param relations: names of the relations to load: 'assigned_to',
+            'case', 'created_by', 'milestone', 'plan', 'project', 'run',
+            'section', 'suite', 'test', or 'updated_by'
+        :param workers: int, number of related objects to fetch individually
+            concurrently
+
+        :returns: list of ``objects``
+        """
+        workers = kwargs.pop('workers', None)
+        if kwargs:
+            raise TypeError("Unexpected keyword arguments: {0}".format(sorted(kwargs)))
+
+        for relation in relations:
+            if relation not in RELATIONS:
+                msg = "Cannot resolve '{0}'. Relations that can be resolved are: {1}"
+                raise ValueError(msg.format(relation, ', '.join(sorted(RELATIONS))))
+
+        objects = list(objects)
+        for relation in relations:
+            self._resolve_relation(objects, relation, workers)
+
+        return objects
+
+    def _resolve_relation(self, objects, relation, workers):
+        content_key, api_name, list_name = RELATIONS[relation]
+        api_method = getattr(self.api, api_name)
+
+        related = [obj for obj in objects
+                   if obj._content.get(content_key, None) is not None and
+                   not api_method.is_cached(obj._content[content_key])]
+        wanted = set(obj._content[content_key] for obj in related)
+        if not wanted:
+            return
+
+        # Lift the size limits of the related objects' caches while loading
+        # them, so objects loaded early on are not evicted by later ones
+        limits = self.api.cache_limits[api_method.obj_type]
+        self.api.cache_limits[api_method.obj_type] = dict(max_entries=None, max_bytes=None)
+        try:
+            if list_name is not None:
+                listed = getattr(self, list_name)(related, wanted)
+                self._prime_listed(api_method, listed, wanted)
+
+            map_with_workers(api_method, sorted(wanted), workers)
+        finally:
+            self.api.cache_limits[api_method.obj_type] = limits
+
+    @staticmethod
+    def _prime_listed(api_method, listed, wanted):
+        """ Cache the ``wanted`` objects found in ``listed`` as ``api_method``
+            responses, removing them from ``wanted``
+        """
+        for obj_id, content in Client._take_listed(listed, wanted).items():
+            api_method.prime(content, obj_id)
+
+    @staticmethod
+    def _take_listed(listed, wanted):
+        """ Returns the ``wanted`` objects found in ``listed``, by id, removing
+            them from ``wanted``
+        """
+        found = dict()
+        try:
+            for content in listed:
+                obj_id = content.get('id', None)
+                if obj_id in wanted:
+                    found[obj_id] = content
+                    wanted.discard(obj_id)
+                    if not wanted:
+                        break
+        finally:
+            listed.close()
+
+        return found
+
+    def _list_cases(self, tests, wanted):
+        """ Yields the cases of the suites that ``tests``' runs use """
+        scopes = set()
+        for run_id in set(test._content.get('run_id', None) for test in tests) - {None}:
+            run = self.api.run_by_id(run_id)
+            scopes.add((run['project_id'], run.get('suite_id', None)))
+
+        return self._list_scoped_cases(scopes, wanted)
+
+    def _list_scoped_cases(self, scopes, wanted):
+        """ Yields the cases of each (project id, suite id) in ``scopes`` """
+        for project_id, suite_id in sorted(scopes, key=str):
+            params = dict(suite_id=suite_id) if suite_id is not None else dict()
+            # Reading more pages than there are cases left to fetch would
+            # take more requests than fetching those cases one at a time
+            max_cases = len(wanted) * const.DEFAULT_LIMIT
+            for case in islice(self.api.cases_by_project_id(project_id, **params), max_cases):
+                yield case
+
+    def _list_projects(self, objs, wanted):  # pylint: disable=unused-argument
+        """ Yields every project """
+        for project in self.api.projects():
+            yield project
+
+    def _list_sections(self, cases, wanted):  # pylint: disable=unused-argument
+        """ Yields the sections of ``cases``' suites """
+        for suite_id in sorted(set(case._content.get('suite_id', None) for case in cases) - {None}):
+            suite = self.api.suite_by_id(suite_id)
+            for section in self.api.sections_by_project_id(suite['project_id'], suite_id):
+                yield section
+
+    def _list_suites(self, objs, wanted):  # pylint: disable=unused-argument
+        """ Yields the suites of ``objs``' projects """
+        for project_id in sorted(set(obj._content.get('project_id', None) for obj in objs) - {None}):
+            for suite in self.api.suites_by_project_id(project_id):
+                yield suite
+
+    def _list_users(self, objs, wanted):  # pylint: disable=unused-argument
+        """ Yields every user """
+        for user in self.api.users():
+            yield user
+
     # Case related methods
     @dispatchmethod
     def case(self, *args, **kwargs):  # pylint: disable=unused-argument
@@ -89,7 +291,7 @@ class Client(object):
         """ Do not call directly
             Returns case with ``case_id``
         """
-        return models.Case(self, self.api.case_by_id(case_id))
+        return self._model(models.Case, self.api.case_by_id(case_id))
 
     @dispatchmethod
     def cases(self, *args, **kwargs):  # pylint: disable=unused-argument
@@ -129,6 +331,14 @@ class Client(object):
         `client.cases(1234, updated_by=client.user(15))`  # by User ID
         `client.cases(1234, updated_by=[12, 15, 34])`  # by list of User IDs
 
+        `client.cases([991, 992], project=1234, suite=223)` yields the cases with
+        ids 991 and 992, listing them in bulk from project 1234's suite 223
+
+        `client.cases(1234, suite=223, incremental=True)` yields the cases of
+        suite 223, and once the cached listing expires, refreshes it with only
+        the cases updated since it was fetched (see ``API.cases_synced``).
+        Cannot be combined with any other filter
+
         :param project: models.Project object for a project in TestRail
         :param project_id: int, Project ID for a project that exists in TestRail
         :param section: models.Section instance or int (Section ID)
@@ -144,6 +354,7 @@ class Client(object):
         :param updated_after: datetime.datetime object or timestamp
         :param updated_before: datetime.datetime object or timestamp
         :param updated_by: models.User instance(s) or int(s) (User ID(s))
+        :param incremental: bool, refresh the listing incrementally
 
         :raiess: NotImplementedError if called with no parameters (`client.runs()`) or
                  a parameter of an unsupported type (`client.runs(True)`)
@@ -153,7 +364,7 @@ class Client(object):
         raise NotImplementedError(const.NOTIMP.format("models.Project or int"))
 
     @cases.register(int)
-    def _cases_by_project_id(self, project_id, suite=None, section=None, **kwargs):
+    def _cases_by_project_id(self, project_id, suite=None, section=None, incremental=False, **kwargs):
 
         project = self.project(project_id)
         if project.suite_mode != 1 and suite is None:
@@ -170,6 +381,16 @@ class Client(object):
 
             params['suite_id'] = suite.id if isinstance(suite, models.Suite) else suite
 
+        if incremental:
+            if section or kwargs:
+                msg = ("Incremental case listings cannot be filtered by anything "
+                       "but suite. Found {0}")
+                raise TRAWClientError(msg.format(sorted(kwargs) or ['section']))
+
+            for case in self.api.cases_synced(project_id, params.get('suite_id', None)):
+                yield self._model(models.Case, case)
+            return
+
         if section:
             if not isinstance(section, (int, models.Section)):
                 msg = ("``section`` must be a models.Section object, or int ID "
@@ -191,13 +412,37 @@ class Client(object):
         normalize_dt_filter(kwargs, params, 'updated_before')
 
         for case in self.api.cases_by_project_id(project_id, **params):
-            yield models.Case(self, case)
+            yield self._model(models.Case, case)
 
     @cases.register(models.Project)
-    def _cases_by_project(self, project, suite=None, section=None, **kwargs):
-        for case in self.cases(project.id, suite, section, **kwargs):
+    def _cases_by_project(self, project, suite=None, section=None, incremental=False, **kwargs):
+        for case in self.cases(project.id, suite, section, incremental, **kwargs):
             yield case
 
+    @cases.register(list)
+    def _cases_by_ids(self, case_ids, project=None, suite=None):
+        """ Do not call directly
+            Yields the cases with ids in ``case_ids``, in order
+
+        When ``project`` (and ``suite``, for multi-suite projects) is given, the
+        cases are listed in bulk from that project/suite, and only cases that
+        were not listed are fetched individually.
+        """
+        project_id = project.id if isinstance(project, models.Project) else project
+        suite_id = suite.id if isinstance(suite, models.Suite) else suite
+
+        wanted = set(case_id for case_id in case_ids
+                     if not self.api.case_by_id.is_cached(case_id))
+        listed = dict()
+        if wanted and project_id is not None:
+            listed = self._take_listed(self._list_scoped_cases([(project_id, suite_id)], wanted), wanted)
+
+        # Listed cases are not read back through the case_by_id cache, which
+        # may not hold them all
+        for case_id in case_ids:
+            content = listed.get(case_id, None)
+            yield self.case(case_id) if content is None else self._model(models.Case, content)
+
     # Case type related methods
     @dispatchmethod
     def case_type(self):
@@ -216,15 +461,12 @@ class Client(object):
 
             :returns: models.CaseType
         """
-        for sys_case_type in self.case_types():
-            if sys_case_type.id == case_type_id:
-                case_type = sys_case_type
-                break
-        else:
+        index = self._reference_index(models.CaseType, self.api.case_types)
+        if case_type_id not in index.by_id:
             msg = "Could not locate a models.CaseType with id of {0}"
             raise TRAWClientError(msg.format(case_type_id))
 
-        return case_type
+        return index.by_id[case_type_id]
 
     def case_types(self):
         """ Returns a case types generator
@@ -233,7 +475,28 @@ class Client(object):
 
         """
         for case_type in list(self.api.case_types()):
-            yield models.CaseType(self, case_type)
+            yield self._model(models.CaseType, case_type)
+
+    def _reference_index(self, model_cls, api_method):
+        """ Returns the ReferenceIndex of ``model_cls`` objects returned by
+            ``api_method``
+
+        The index is only rebuilt when the API method's cached response
+        changes (i.e. once per cache period, or after the cache is cleared).
+        """
+        contents = api_method()
+        iter_contents = iter(contents)
+        first = next(iter_contents, None)  # Starts iteration, so the source is known
+
+        index = self._indexes.get(model_cls, None)
+        source = getattr(contents, 'source', None)
+        if index is not None and source is not None and index.source is source:
+            return index
+
+        table = ([first] if first is not None else list()) + list(iter_contents)
+        objs = [self._model(model_cls, content) for content in table]
+        index = self._indexes[model_cls] = ReferenceIndex(objs, getattr(contents, 'source', None))
+        return index
 
     # Config related methods
     @dispatchmethod
@@ -357,7 +620,7 @@ class Client(object):
     @config_groups.register(int)
     def _config_groups_by_project_id(self, project_id):
         for config_group in self.api.config_groups(project_id):
-            yield models.ConfigGroup(self, config_group)
+            yield self._model(models.ConfigGroup, config_group)
 
     @config_groups.register(models.Project)
     def _config_groups_by_project(self, project):
@@ -383,7 +646,7 @@ class Client(object):
         """ Do not call directly
             Returns milestone with ``milestone_id``
         """
-        return models.Milestone(self, self.api.milestone_by_id(milestone_id))
+        return self._model(models.Milestone, self.api.milestone_by_id(milestone_id))
 
     @add.register(models.Milestone)
     @add.register(models.SubMilestone)
@@ -438,7 +701,7 @@ class Client(object):
             raise TypeError(msg.format('is_started', is_started, type(is_started)))
 
         for milestone in self.api.milestones(project_id, is_completed, is_started):
-            yield models.Milestone(self, milestone)
+            yield self._model(models.Milestone, milestone)
 
     @milestones.register(models.Project)
     def _milestones_by_project(self, project, is_completed=None, is_started=None):
@@ -464,7 +727,7 @@ class Client(object):
         """ Do not call directly
             Returns plan with ``plan_id``
         """
-        return models.Plan(self, self.api.plan_by_id(plan_id))
+        return self._model(models.Plan, self.api.plan_by_id(plan_id))
 
     # Priority related methods
     @dispatchmethod
@@ -484,15 +747,12 @@ class Client(object):
 
             :returns: models.Priority
         """
-        for sys_priority in self.priorities():
-            if sys_priority.id == priority_id:
-                priority = sys_priority
-                break
-        else:
+        index = self._reference_index(models.Priority, self.api.priorities)
+        if priority_id not in index.by_id:
             msg = "Could not locate a models.Priority with id of {0}"
             raise TRAWClientError(msg.format(priority_id))
 
-        return priority
+        return index.by_id[priority_id]
 
     def priorities(self):
         """ Returns a priority generator
@@ -500,7 +760,7 @@ class Client(object):
         :yields: models.Priority Objects
         """
         for priority in list(self.api.priorities()):
-            yield models.Priority(self, priority)
+            yield self._model(models.Priority, priority)
 
     # Project related methods
     @dispatchmethod
@@ -525,7 +785,7 @@ class Client(object):
 
             :returns: models.Project
         """
-        return models.Project(self, self.api.project_by_id(project_id))
+        return self._model(models.Project, self.api.project_by_id(project_id))
 
     @delete.register(models.Project)
     def _project_delete(self, project):
@@ -558,7 +818,7 @@ class Client(object):
             is_completed = None
 
         for project in list(self.api.projects(is_completed)):
-            yield models.Project(self, project)
+            yield self._model(models.Project, project)
 
     # Result related methods
     @dispatchmethod
@@ -577,6 +837,91 @@ class Client(object):
         response = self.api.result_add(result.test.id, result.add_params)
         return models.Result(self, response)
 
+    @dispatchmethod
+    def add_results(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Add many results to a run, using as few requests as possible
+
+        `client.add_results(run, results)` adds results to the Run instance
+        `client.add_results(1234, results)` adds results to the run with id 1234
+
+        Results are sent to TestRail's `add_results` endpoint in chunks whose
+        request bodies are no larger than ``max_bytes``. If TestRail rejects a
+        chunk as too large anyway, it is split in half and each half is retried.
+
+        :param run: models.Run object or int, Run ID for a run that exists in TestRail
+        :param results: iterable of models.Result objects, each with its
+            `test` set
+        :param max_bytes: int, maximum size of each request body in bytes
+
+        :raises: NotImplementedError if called with an unsupported run type
+        :raises: TRAWClientError if a result has no test
+
+        :returns: list of the added models.Result objects
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Run or int"))
+
+    @add_results.register(int)
+    def _add_results_by_run_id(self, run_id, results, max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        entries = bulk_result_entries(results)
+        return self._add_results_in_chunks(self.api.results_add, run_id, entries, max_bytes)
+
+    @add_results.register(models.Run)
+    def _add_results_by_run(self, run, results, max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        return self.add_results(run.id, results, max_bytes=max_bytes)
+
+    @dispatchmethod
+    def add_results_for_cases(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """ Add many results to a run by case, using as few requests as possible
+
+        `client.add_results_for_cases(run, [(case, result), ...])` adds results
+        to the Run instance for the given cases
+        `client.add_results_for_cases(1234, [(case_id, result), ...])` adds
+        results to the run with id 1234
+
+        Results are sent to TestRail's `add_results_for_cases` endpoint in
+        chunks, the same way as ``add_results``.
+
+        :param run: models.Run object or int, Run ID for a run that exists in TestRail
+        :param results: iterable of (case, result) pairs, where case is a
+            models.Case object or int case ID, and result is a models.Result
+        :param max_bytes: int, maximum size of each request body in bytes
+
+        :raises: NotImplementedError if called with an unsupported run type
+
+        :returns: list of the added models.Result objects
+        """
+        raise NotImplementedError(const.NOTIMP.format("models.Run or int"))
+
+    @add_results_for_cases.register(int)
+    def _add_results_for_cases_by_run_id(self, run_id, results,
+                                         max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        entries = bulk_case_result_entries(results)
+        return self._add_results_in_chunks(self.api.results_add_for_cases, run_id, entries,
+                                           max_bytes)
+
+    @add_results_for_cases.register(models.Run)
+    def _add_results_for_cases_by_run(self, run, results,
+                                      max_bytes=const.DEFAULT_BULK_MAX_BYTES):
+        return self.add_results_for_cases(run.id, results, max_bytes=max_bytes)
+
+    def _add_results_in_chunks(self, api_method, run_id, entries, max_bytes):
+        added = list()
+        for chunk in chunk_by_size(entries, max_bytes, overhead=BULK_BODY_OVERHEAD):
+            added.extend(self._add_results_chunk(api_method, run_id, chunk))
+
+        return [models.Result(self, result) for result in added]
+
+    def _add_results_chunk(self, api_method, run_id, chunk):
+        try:
+            return api_method(run_id, chunk)
+        except TooLarge:
+            if len(chunk) == 1:
+                raise
+
+            half = len(chunk) // 2
+            return (self._add_results_chunk(api_method, run_id, chunk[:half]) +
+                    self._add_results_chunk(api_method, run_id, chunk[half:]))
+
     @dispatchmethod
     def results(self, *args, **kwargs):  # pylint: disable=unused-argument
         """ Return models.Result generator for the given models.Test object or test ID
@@ -585,10 +930,14 @@ class Client(object):
         `client.results(1234)` yields results for test with id 1234
         `client.results(run)` yields results for Run instance
         `client.results(1234, obj_type=models.Run)` yields results for Run with id 1234
+        `client.results(run, workers=4)` fetches up to 4 pages of results concurrently
+        `client.results(run, prefetch=2)` loads up to 2 pages of results ahead of iteration
 
         :param test: models.Test object for a test that exists in TestRail
         :param run: models.Run object for a run that exists in TestRail
         :param obj_id: int, Run ID or Test ID for a Run/Test that exists in TestRail
+        :param workers: int, number of result pages to fetch concurrently
+        :param prefetch: int, number of result pages to load in the background
 
         :raiess: NotImplementedError if called with no parameters (`client.results()`) or
                  a parameter of an unsupported type (`client.results(True)`)
@@ -598,7 +947,8 @@ class Client(object):
         raise NotImplementedError(const.NOTIMP.format("models.Test or int"))
 
     @results.register(int)
-    def _results_by_obj_id(self, obj_id, obj_type=models.Test, with_status=None, limit=None):
+    def _results_by_obj_id(self, obj_id, obj_type=models.Test, with_status=None, limit=None,
+                           workers=None, prefetch=None):
         API_METHODS = {models.Run: self.api.results_by_run_id,
                        models.Test: self.api.results_by_test_id}
         if obj_type not in API_METHODS:
@@ -612,21 +962,36 @@ class Client(object):
         if limit:
             params['limit'] = int(limit)
 
+        if workers:
+            params['workers'] = int(workers)
+
+        if prefetch:
+            params['prefetch'] = int(prefetch)
+
         ws_args = {'with_status': with_status}
         normalize_param(ws_args, params, 'with_status', 'status_id', models.Status)
 
         for result in api_method(obj_id, **params):
-            yield models.Result(self, result)
+            yield self._model(models.Result, result)
 
     @results.register(models.Run)
-    def _results_by_run(self, run, with_status=None, limit=None):
+    def _results_by_run(self, run, with_status=None, limit=None, workers=None, prefetch=None):
         params = dict(obj_type=models.Run, with_status=with_status, limit=limit)
+        if workers:
+            params['workers'] = workers
+        if prefetch:
+            params['prefetch'] = prefetch
         for result in self.results(run.id, **params):
             yield result
 
     @results.register(models.Test)
-    def _results_by_test(self, test, with_status=None, limit=None):
-        for result in self.results(test.id, with_status=with_status, limit=limit):
+    def _results_by_test(self, test, with_status=None, limit=None, workers=None, prefetch=None):
+        params = dict(with_status=with_status, limit=limit)
+        if workers:
+            params['workers'] = workers
+        if prefetch:
+            params['prefetch'] = prefetch
+        for result in self.results(test.id, **params):
             yield result
 
     # Run related methods
@@ -653,7 +1018,7 @@ class Client(object):
         """ Do not call directly
             Returns run with ``run_id``
         """
-        return models.Run(self, self.api.run_by_id(run_id))
+        return self._model(models.Run, self.api.run_by_id(run_id))
 
     @close.register(models.Run)
     def _run_close(self, run):
@@ -690,6 +1055,8 @@ class Client(object):
         `client.runs(1234, suite=223)`  # by Suite ID
         `client.runs(1234, suite=[222, 223, 224])`  # by list of Suite IDs
         `client.runs(1234, suite=[suite1, suite2, suite3])`  # by list of Suite objects
+        `client.runs(1234, workers=4)`  # fetch up to 4 pages of runs concurrently
+        `client.runs(1234, prefetch=2)`  # load up to 2 pages of runs ahead of iteration
 
         :param project: models.Project object for a project that exists in TestRail
         :param project_id: int, Project ID for a project that exists in TestRail
@@ -700,6 +1067,8 @@ class Client(object):
         :param limit: int, only return <limit> responses
         :param milestone: models.(Sub)Milestone instance(s) or int(s) (Milestone ID(s))
         :param suite: models.Suite instance(s) or int(s) (Suite ID(s))
+        :param workers: int, number of pages to fetch concurrently
+        :param prefetch: int, number of pages to load in the background
 
         :raiess: NotImplementedError if called with no parameters (`client.runs()`) or
                  a parameter of an unsupported type (`client.runs(True)`)
@@ -725,23 +1094,32 @@ class Client(object):
         if limit:
             params['limit'] = int(limit)
 
+        workers = kwargs.get('workers', None)
+        if workers:
+            params['workers'] = int(workers)
+
+        prefetch = kwargs.get('prefetch', None)
+        if prefetch:
+            params['prefetch'] = int(prefetch)
+
         normalize_param(kwargs, params, 'created_by', 'created_by', models.User)
         normalize_param(kwargs, params, 'milestone', 'milestone_id',
                         models.Milestone, models.SubMilestone)
         normalize_param(kwargs, params, 'suite', 'suite_id', models.Suite)
 
         for run in self.api.runs_by_project_id(project_id, **params):
-            yield models.Run(self, run)
+            yield self._model(models.Run, run)
 
     @runs.register(models.Project)
     def _runs_by_project(self, project, created_after=None, created_before=None,
                          created_by=None, is_completed=None, milestone=None,
-                         suite=None, limit=None):
+                         suite=None, limit=None, workers=None, prefetch=None):
 
         for run in self.runs(project.id, created_after=created_after,
                              created_before=created_before, created_by=created_by,
                              is_completed=is_completed,
-                             milestone=milestone, suite=suite, limit=limit):
+                             milestone=milestone, suite=suite, limit=limit,
+                             workers=workers, prefetch=prefetch):
             yield run
 
     # Section related methods
@@ -771,7 +1149,7 @@ class Client(object):
 
             :returns: models.Section
         """
-        return models.Section(self, self.api.section_by_id(section_id))
+        return self._model(models.Section, self.api.section_by_id(section_id))
 
     @delete.register(models.Section)
     def _section_delete(self, section):
@@ -815,7 +1193,7 @@ class Client(object):
         suite_id = suite.id if isinstance(suite, models.Suite) else suite
 
         for section in self.api.sections_by_project_id(project_id, suite_id):
-            yield models.Section(self, section)
+            yield self._model(models.Section, section)
 
     @sections.register(models.Project)
     def _sections_by_project(self, project, suite=None):
@@ -842,15 +1220,12 @@ class Client(object):
 
             :raises: TRAWClientError if no matching status is found
         """
-        for sys_status in self.statuses():
-            if sys_status.id == 5 + custom_status_id:
-                status = sys_status
-                break
-        else:
+        index = self._reference_index(models.Status, self.api.statuses)
+        if 5 + custom_status_id not in index.by_id:
             msg = "There is no active custom status associated with custom status ID {0}"
             raise UnknownCustomStatusError(msg.format(custom_status_id))
 
-        return status
+        return index.by_id[5 + custom_status_id]
 
     @custom_status.register(str)
     def _custom_status_by_name(self, custom_status_str):
@@ -893,15 +1268,12 @@ class Client(object):
 
             :returns: models.Status
         """
-        for sys_status in self.statuses():
-            if sys_status.id == status_id:
-                status = sys_status
-                break
-        else:
+        index = self._reference_index(models.Status, self.api.statuses)
+        if status_id not in index.by_id:
             msg = "Could not locate a models.Status with id of {0}"
             raise TRAWClientError(msg.format(status_id))
 
-        return status
+        return index.by_id[status_id]
 
     @status.register(str)
     def _status_by_label(self, label, strict=False):
@@ -912,21 +1284,13 @@ class Client(object):
 
             :returns: models.Status
         """
-        for sys_status in self.statuses():
-            if strict:
-                if label == sys_status.label:
-                    status = sys_status
-                    break
-                else:
-                    continue  # pragma: no cover
-            elif label.lower() == sys_status.label.lower():
-                status = sys_status
-                break
-        else:
+        index = self._reference_index(models.Status, self.api.statuses)
+        by_label, key = (index.by_label, label) if strict else (index.by_folded_label, label.lower())
+        if key not in by_label:
             msg = "Could not locate a models.Status with label of {0}"
             raise TRAWClientError(msg.format(label))
 
-        return status
+        return by_label[key]
 
     def statuses(self):
         """ Returns models.Status generator
@@ -934,7 +1298,7 @@ class Client(object):
         :yields: models.Status Objects
         """
         for status in list(self.api.statuses()):
-            yield models.Status(self, status)
+            yield self._model(models.Status, status)
 
     # Suite related methods
     @dispatchmethod
@@ -959,7 +1323,7 @@ class Client(object):
 
             :returns: models.Suite
         """
-        return models.Suite(self, self.api.suite_by_id(suite_id))
+        return self._model(models.Suite, self.api.suite_by_id(suite_id))
 
     @delete.register(models.Suite)
     def _suite_delete(self, suite):
@@ -990,7 +1354,7 @@ class Client(object):
     @suites.register(int)
     def _suites_by_project_id(self, project_id):
         for suite in self.api.suites_by_project_id(project_id):
-            yield models.Suite(self, suite)
+            yield self._model(models.Suite, suite)
 
     @suites.register(models.Project)
     def _suites_by_project(self, project):
@@ -1015,19 +1379,57 @@ class Client(object):
 
             :returns: models.Template
         """
-        for project in self.projects():
-            for sys_template in self.templates(project):
-                if sys_template.id == template_id:
-                    template = sys_template
-                    break
-            else:  # Necessary to break out of both for loops
-                continue
-            break
-        else:
-            msg = "Could not locate a models.Template with id of {0}"
-            raise TRAWClientError(msg.format(template_id))
+        indexed = self._template_index.get(template_id, None)
+        if indexed is not None and self._template_index_fresh(indexed[0]):
+            return indexed[1]
+
+        # Index projects one at a time, and only until the template is found.
+        # Projects whose index is still fresh are listed again last, in case
+        # the template was added to one of them since they were indexed
+        project_ids = [project.id for project in self.projects()]
+        for project_id in sorted(project_ids, key=self._template_index_fresh):
+            self._index_templates(project_id, refresh=self._template_index_fresh(project_id))
+            indexed = self._template_index.get(template_id, None)
+            if indexed is not None:
+                return indexed[1]
+
+        msg = "Could not locate a models.Template with id of {0}"
+        raise TRAWClientError(msg.format(template_id))
+
+    def build_template_index(self, workers=None):
+        """ Index the templates of every project up front, so that
+            ``client.template(template_id)`` never has to call TestRail
+
+            `client.build_template_index(workers=8)` fetches up to 8 projects'
+            templates concurrently
+
+        :param workers: int, number of projects to index concurrently
+
+        Like the ``templates`` cache, the index of each project's templates
+        expires after the models.Template cache timeout.
+        """
+        project_ids = [project.id for project in self.projects()
+                       if not self._template_index_fresh(project.id)]
+
+        map_with_workers(self._index_templates, project_ids, workers)
 
-        return template
+    def _index_templates(self, project_id, refresh=False):
+        """ Merge the templates of project ``project_id`` into the template
+            index. With ``refresh``, the project's cached templates are listed
+            again
+        """
+        if refresh:
+            self.api.templates.invalidate('project_id', [project_id])
+
+        templates = list(self.templates(project_id))
+        expires = time.time() + int(self.api.cache_timeouts[models.Template])
+        with self._template_lock:
+            for template in templates:
+                self._template_index[template.id] = (project_id, template)
+            self._indexed_projects[project_id] = expires
+
+    def _template_index_fresh(self, project_id):
+        return self._indexed_projects.get(project_id, 0) > time.time()
 
     @dispatchmethod
     def templates(self, *args, **kwargs):  # pylint: disable=unused-argument
@@ -1048,7 +1450,7 @@ class Client(object):
     @templates.register(int)
     def _templates_by_project_id(self, project_id):
         for template in list(self.api.templates(project_id)):
-            yield models.Template(self, template)
+            yield self._model(models.Template, template)
 
     @templates.register(models.Project)
     def _templates_by_project(self, project):
@@ -1073,7 +1475,7 @@ class Client(object):
 
             :returns: models.Test
         """
-        return models.Test(self, self.api.test_by_id(test_id))
+        return self._model(models.Test, self.api.test_by_id(test_id))
 
     @dispatchmethod
     def tests(self, *args, **kwargs):  # pylint: disable=unused-argument
@@ -1110,7 +1512,7 @@ class Client(object):
             with_status = ','.join([str(s.id) for s in with_status])
 
         for test in list(self.api.tests_by_run_id(run_id, with_status)):
-            yield models.Test(self, test)
+            yield self._model(models.Test, test)
 
     @tests.register(models.Run)
     def _tests_by_run(self, run, with_status=None):
@@ -1142,14 +1544,14 @@ class Client(object):
         if '@' not in email:
             raise ValueError('"email" must be a string that includes an "@" symbol')
 
-        return models.User(self, self.api.user_by_email(email))
+        return self._model(models.User, self.api.user_by_email(email))
 
     @user.register(int)
     def _user_by_id(self, user_id):
         """ Do not call directly
             Returns user with ``user_id``
         """
-        return models.User(self, self.api.user_by_id(user_id))
+        return self._model(models.User, self.api.user_by_id(user_id))
 
     def users(self):
         """ Returns a models.User generator that yields all Users
@@ -1157,7 +1559,7 @@ class Client(object):
         :yields: models.User Objects
         """
         for user in list(self.api.users()):
-            yield models.User(self, user)
+            yield self._model(models.User, user)
 
     # Cache control related methods
     def change_cache_timeout(self, new_timeout, model_cls=None):
@@ -1181,11 +1583,69 @@ class Client(object):
                        "traw.models.model_base.ModelBase, found class of type {0}")
                 raise TypeError(msg.format(model_cls))
 
-            self.api.cache_timeouts[self.api][model_cls] = int(new_timeout)
+            self.api.cache_timeouts[model_cls] = int(new_timeout)
+        else:
+            for cls_name in models.__all__:
+                cls = getattr(models, cls_name)
+                self.api.cache_timeouts[cls] = int(new_timeout)
+
+    def change_cache_staleness(self, max_staleness, model_cls=None):
+        """ Change how many seconds a cached `model_cls` object may be served
+            after it expires to ``max_staleness``. While an expired object is
+            served, a fresh one is fetched in the background to replace it. If
+            ``model_cls`` is not specified, the maximum staleness of ALL TRAW
+            models will be changed to ``max_staleness``.
+
+        By default, expired objects are fetched again before they are
+        returned. Objects whose cache timeout is 0 are never served stale.
+
+        .. code-block:: python
+
+            # Serve expired models.User objects for up to an hour
+            client.change_cache_staleness(3600, models.User)
+
+        """
+        if model_cls:
+            if not issubclass(model_cls, ModelBase):
+                msg = ("Expected model_cls to be a subclass of "
+                       "traw.models.model_base.ModelBase, found class of type {0}")
+                raise TypeError(msg.format(model_cls))
+
+            self.api.cache_staleness[model_cls] = int(max_staleness)
         else:
             for cls_name in models.__all__:
                 cls = getattr(models, cls_name)
-                self.api.cache_timeouts[self.api][cls] = int(new_timeout)
+                self.api.cache_staleness[cls] = int(max_staleness)
+
+    def change_cache_limits(self, max_entries=None, max_bytes=None, model_cls=None):
+        """ Change the size limits of the caches for `model_cls`. Each TRAW API
+            method has its own cache, and each of those caches will hold at most
+            ``max_entries`` argument combinations and roughly ``max_bytes`` bytes
+            of response content, evicting the least recently used entries once
+            full. ``None`` means unlimited. If ``model_cls`` is not specified, the
+            limits for ALL TRAW models will be changed.
+
+        .. code-block:: python
+
+            # Keep at most 50 cached result listings, of at most 64MB each
+            client.change_cache_limits(50, 64 * 1024 * 1024, models.Result)
+
+            # Remove all cache size limits
+            client.change_cache_limits()
+
+        """
+        limits = dict(max_entries=max_entries, max_bytes=max_bytes)
+        if model_cls:
+            if not issubclass(model_cls, ModelBase):
+                msg = ("Expected model_cls to be a subclass of "
+                       "traw.models.model_base.ModelBase, found class of type {0}")
+                raise TypeError(msg.format(model_cls))
+
+            self.api.cache_limits[model_cls] = limits
+        else:
+            for cls_name in models.__all__:
+                cls = getattr(models, cls_name)
+                self.api.cache_limits[cls] = dict(limits)
 
     @dispatchmethod
     def clear_cache(self, *args, **kwargs):  # pylint: disable=unused-argument
@@ -1220,6 +1680,7 @@ class Client(object):
         """ Clear cache for models.Case related API methods """
         self.api.case_by_id.cache.clear()
         self.api.cases_by_project_id.cache.clear()
+        self.api.case_syncs.clear()
 
     @clear_cache.register(models.CaseType)
     def _clear_cache_case_types(self, _):
@@ -1286,6 +1747,9 @@ class Client(object):
     def _clear_cache_template(self, _):
         """ Clear cache for models.Template related API methods """
         self.api.templates.cache.clear()
+        with self._template_lock:
+            self._template_index.clear()
+            self._indexed_projects.clear()
 
     @clear_cache.register(models.Test)
     def _clear_cache_test(self, _):
@@ -1301,6 +1765,90 @@ class Client(object):
         self.api.users.cache.clear()
 
 
+# Bytes of a bulk add request body taken up by its enclosing object
+BULK_BODY_OVERHEAD = len('{"results": }')
+
+
+def bulk_result_entries(results):
+    """ Returns the `add_results` entries for an iterable of models.Result """
+    entries = list()
+    for result in results:
+        _check_bulk_result(result)
+        # Read the id from the content; ``result.test`` would fetch the test
+        test_id = result._content.get('test_id', None)
+        if test_id is None:
+            raise TRAWClientError('Results added with `add_results` must have a test')
+
+        entries.append(dict(result.add_params, test_id=test_id))
+
+    return entries
+
+
+def bulk_case_result_entries(results):
+    """ Returns the `add_results_for_cases` entries for an iterable of
+        (case, models.Result) pairs
+    """
+    entries = list()
+    for case, result in results:
+        if not isinstance(case, (int, models.Case)):
+            msg = ("Each case must be a models.Case object, or int ID of a "
+                   "case in testrail. Found {0}")
+            raise TypeError(msg.format(case))
+
+        _check_bulk_result(result)
+        case_id = case.id if isinstance(case, models.Case) else case
+        entries.append(dict(result.add_params, case_id=case_id))
+
+    return entries
+
+
+# Relation name: (content key of the related object's id, API method that
+# fetches the related object by id, Client method that lists related objects).
+# Milestones are not listed, as listed milestones lack the sub-milestones that
+# milestone_by_id responses include
+RELATIONS = {
+    'assigned_to': ('assignedto_id', 'user_by_id', '_list_users'),
+    'case': ('case_id', 'case_by_id', '_list_cases'),
+    'created_by': ('created_by', 'user_by_id', '_list_users'),
+    'milestone': ('milestone_id', 'milestone_by_id', None),
+    'plan': ('plan_id', 'plan_by_id', None),
+    'project': ('project_id', 'project_by_id', '_list_projects'),
+    'run': ('run_id', 'run_by_id', None),
+    'section': ('section_id', 'section_by_id', '_list_sections'),
+    'suite': ('suite_id', 'suite_by_id', '_list_suites'),
+    'test': ('test_id', 'test_by_id', None),
+    'updated_by': ('updated_by', 'user_by_id', '_list_users'),
+}
+
+
+class ReferenceIndex(object):
+    """ Id and label lookups over a TestRail reference table (case types,
+        priorities, statuses)
+
+    ``source`` is the cached API response the index was built from. Every
+    lookup returns the same model object for a given id or label.
+    """
+    def __init__(self, objs, source):
+        self.source = source
+        self.by_id = dict()
+        self.by_label = dict()
+        self.by_folded_label = dict()
+
+        # The first object wins, matching a linear scan of the table
+        for obj in objs:
+            self.by_id.setdefault(obj.id, obj)
+            label = obj._content.get('label', None)
+            if label is not None:
+                self.by_label.setdefault(label, obj)
+                self.by_folded_label.setdefault(label.lower(), obj)
+
+
+def _check_bulk_result(result):
+    if not isinstance(result, models.Result):
+        msg = "Bulk added results must be models.Result objects. Found {0}"
+        raise TypeError(msg.format(type(result)))
+
+
 def normalize_dt_filter(kwargs, params, key):
     kw_val = kwargs.get(key, None)
     if kw_val is None:
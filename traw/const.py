@@ -80,11 +80,37 @@ CONFIG_FILE_NAME = '.traw_config'
 
 DEFAULT_CACHE_TIMEOUT = 300  # Seconds
 
+# Per API method cache limits. None means unlimited
+DEFAULT_CACHE_MAX_BYTES = None
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CACHE_SWEEP_INTERVAL = 100  # Cache writes between expired entry sweeps
+DEFAULT_CACHE_FILE = 'traw-cache.sqlite'  # Name of the persistent cache in its cache_dir
+DEFAULT_CACHE_LOCK_TIMEOUT = 30  # Seconds to wait for another process's cache write
+
+# Maximum size, in bytes, of the JSON body of a bulk add request
+DEFAULT_BULK_MAX_BYTES = 512 * 1024
+
 DEFAULT_LIMIT = 250
 
+# Keys of the envelope newer TestRail servers wrap paginated responses in
+ENVELOPE_KEYS = ('offset', 'limit', 'size', '_links')
+
+DEFAULT_MAX_CONNECTIONS = 10  # Concurrent requests per traw.aio session
+
 GET = 'get'
 POST = 'post'
 
+DEFAULT_RATE_LIMIT_PERIOD = 60  # Seconds; rate limits are requests per minute
+
+PREFETCH_POLL_INTERVAL = 0.1  # Seconds between checks for an abandoned prefetch
+
+# traw.ResultReporter defaults
+DEFAULT_REPORTER_BACKOFF = 1  # Seconds before the first retry of a failed flush
+DEFAULT_REPORTER_EXIT_TIMEOUT = 30  # Seconds to wait for open reporters at interpreter exit
+DEFAULT_REPORTER_FLUSH_INTERVAL = 5  # Seconds
+DEFAULT_REPORTER_FLUSH_SIZE = 100  # Results
+DEFAULT_REPORTER_RETRIES = 5  # Retries of a flush while TestRail is unavailable
+
 # Session retry parameters
 DELAY = 1
 RETRIES = 3
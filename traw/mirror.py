@@ -0,0 +1,284 @@
+""" Local SQLite mirror of a TestRail project
+
+Slicing a project's cases, runs, tests and results many different ways takes
+a set of paginated requests for every slice. A ``Mirror`` copies them into a
+SQLite database instead, so they can be queried locally:
+
+.. code-block:: python
+
+    mirror = traw.Mirror(client, project, '/var/lib/traw/project-15.sqlite')
+    mirror.sync()  # Only fetches what changed since the last sync
+    failed = list(mirror.tests(run=run, status=client.status('failed')))
+
+Query methods return the same ``traw.models`` objects as the client, filtered
+by the keywords listed in each method's docstring. Values can be model
+objects, ids, or lists of either, and ``<x>_after``/``<x>_before`` keywords
+take datetime.datetime objects or timestamps.
+
+Each ``sync`` requests, where the TestRail API allows it, only:
+ - the cases of each suite updated since the newest case already mirrored
+ - the runs created since the newest run already mirrored, and the runs that
+   are open or were open at the previous sync
+ - the tests of those runs, and their results created since the newest result
+   already mirrored
+
+So cases deleted in TestRail, and changes to completed runs, are only picked
+up by a ``sync(full=True)``. Runs that are part of a test plan are not
+mirrored.
+"""
+from datetime import datetime
+import json
+import threading
+import time
+
+from . import models
+from .cache import ThreadConnections
+from .const import DEFAULT_CACHE_LOCK_TIMEOUT
+from .exceptions import TRAWClientError
+from .models.model_base import ModelBase
+
+# Model class and (filterable) columns of each mirrored table
+_TABLES = {
+    'cases': (models.Case, ('suite_id', 'section_id', 'type_id', 'priority_id', 'milestone_id',
+                            'template_id', 'created_by', 'created_on', 'updated_by', 'updated_on')),
+    'runs': (models.Run, ('suite_id', 'milestone_id', 'plan_id', 'assignedto_id', 'created_by',
+                          'created_on', 'is_completed', 'completed_on')),
+    'tests': (models.Test, ('run_id', 'case_id', 'status_id', 'assignedto_id', 'type_id',
+                            'priority_id', 'milestone_id')),
+    'results': (models.Result, ('test_id', 'run_id', 'status_id', 'assignedto_id', 'created_by',
+                                'created_on')),
+}
+
+# Query keywords that are not named after their column (less any ``_id``)
+_ALIASES = {'assigned_to': 'assignedto_id', 'case_type': 'type_id'}
+
+
+class Mirror(object):
+    """ A local copy of a TestRail project's cases, runs, tests and results
+
+    :param client: traw.Client used to sync the mirror
+    :param project: models.Project object or int, Project ID of the project
+    :param path: Path of the SQLite database file, which only holds this
+        project. It is created if it does not exist
+    :param lock_timeout: Seconds to wait for a concurrent sync to finish
+        writing
+
+    The database can be read (and synced) from several threads and processes
+    at once.
+    """
+    def __init__(self, client, project, path, lock_timeout=DEFAULT_CACHE_LOCK_TIMEOUT):
+        self.client = client
+        self.project_id = project.id if isinstance(project, models.Project) else project
+        self.path = path
+        self.lock_timeout = lock_timeout
+
+        self._connection = ThreadConnections(path, lock_timeout)
+        self._sync_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS mirror (project_id INTEGER)')
+            mirrored = conn.execute('SELECT project_id FROM mirror').fetchone()
+            if mirrored is None:
+                conn.execute('INSERT INTO mirror VALUES (?)', (self.project_id, ))
+            elif mirrored[0] != self.project_id:
+                msg = '{0} mirrors project {1}, not project {2}'
+                raise TRAWClientError(msg.format(path, mirrored[0], self.project_id))
+
+            for table, (_, columns) in _TABLES.items():
+                conn.execute('CREATE TABLE IF NOT EXISTS {0} (id INTEGER PRIMARY KEY, {1}, '
+                             'content TEXT)'.format(table, ', '.join(columns)))
+                for column in columns:
+                    conn.execute('CREATE INDEX IF NOT EXISTS {0}_{1} ON {0} ({1})'.format(table, column))
+
+    def sync(self, full=False):
+        """ Bring the mirror up to date with TestRail
+
+        :param full: bool, download everything again instead of only what
+            changed, dropping anything that was deleted in TestRail
+        """
+        with self._sync_lock:
+            self._sync_cases(full)
+            for run_id in self._sync_runs(full):
+                self._sync_run(run_id, full)
+
+    def cases(self, **filters):
+        """ Yields the mirrored models.Case objects, by id
+
+        Filters: suite, section, case_type, priority, milestone, template,
+        created_by, updated_by, created_after/before, updated_after/before
+        """
+        return self._query('cases', filters)
+
+    def runs(self, **filters):
+        """ Yields the mirrored models.Run objects, by id
+
+        Filters: suite, milestone, plan, assigned_to, created_by, is_completed,
+        created_after/before, completed_after/before
+        """
+        return self._query('runs', filters)
+
+    def tests(self, **filters):
+        """ Yields the mirrored models.Test objects, by id
+
+        Filters: run, case, status, assigned_to, case_type, priority, milestone
+        """
+        return self._query('tests', filters)
+
+    def results(self, **filters):
+        """ Yields the mirrored models.Result objects, by id
+
+        Filters: test, run, status, assigned_to, created_by, created_after/before
+        """
+        return self._query('results', filters)
+
+    def _sync_cases(self, full):
+        api = self.client.api
+        if api.project_by_id(self.project_id)['suite_mode'] == 1:
+            suite_ids = [None]
+        else:
+            if full:  # The cached suites may include deleted ones
+                api.suites_by_project_id.invalidate('project_id', [self.project_id])
+            suite_ids = [suite['id'] for suite in api.suites_by_project_id(self.project_id)]
+
+        for suite_id in suite_ids:
+            params = dict(suite_id=suite_id) if suite_id is not None else dict()
+            newest = None if full else self._newest('cases', 'updated_on', suite_id=suite_id)
+            if newest is not None:
+                # Cases updated in the same second as the newest mirrored case
+                # may not have been mirrored yet, so that second is fetched again
+                params['updated_after'] = newest - 1
+
+            cases = list(api._cases(self.project_id, **params))
+            with self._connection():
+                if newest is None:
+                    self._delete('cases', suite_id=suite_id)
+                self._store('cases', cases)
+
+        if full and suite_ids != [None]:
+            with self._connection() as conn:  # Cases of suites deleted in TestRail
+                conn.execute('DELETE FROM cases WHERE suite_id NOT IN ({0})'.format(
+                    ', '.join('?' * len(suite_ids))), suite_ids)
+
+    def _sync_runs(self, full):
+        """ Returns the ids of the runs whose tests and results need syncing """
+        api = self.client.api
+        conn = self._connection()
+        newest = None if full else self._newest('runs', 'created_on')
+        if newest is None:
+            runs = list(api._runs(self.project_id))
+        else:
+            known = dict(conn.execute('SELECT id, is_completed FROM runs'))
+            runs = list(api._runs(self.project_id, created_after=newest - 1))
+            runs.extend(api._runs(self.project_id, is_completed=0))
+
+            oldest_open = conn.execute('SELECT MIN(created_on) FROM runs WHERE is_completed = 0').fetchone()[0]
+            if oldest_open is not None:  # Some of these may have been completed since
+                runs.extend(api._runs(self.project_id, is_completed=1, created_after=oldest_open - 1))
+
+            runs = [run for run in runs if not run['is_completed'] or not known.get(run['id'], False)]
+
+        with conn:
+            if newest is None:
+                self._delete('runs')
+            self._store('runs', runs)
+            if newest is None:  # Tests and results of runs deleted in TestRail
+                for table in ('tests', 'results'):
+                    conn.execute('DELETE FROM {0} WHERE run_id NOT IN (SELECT id FROM runs)'.format(table))
+
+        return sorted(set(run['id'] for run in runs))
+
+    def _sync_run(self, run_id, full):
+        api = self.client.api
+        tests = list(api._tests(run_id))
+
+        newest = None if full else self._newest('results', 'created_on', run_id=run_id)
+        params = dict(created_after=newest - 1) if newest is not None else dict()
+        results = list(api._results_for_run(run_id, **params))
+
+        with self._connection():
+            self._delete('tests', run_id=run_id)
+            self._store('tests', tests)
+            if newest is None:
+                self._delete('results', run_id=run_id)
+            self._store('results', results, run_id=run_id)
+
+    def _query(self, table, filters):
+        model_cls = _TABLES[table][0]
+        clauses = list()
+        values = list()
+        for name, value in sorted(filters.items()):
+            column, operator = _column(table, name)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                clauses.append('{0} IN ({1})'.format(column, ', '.join('?' * len(value))))
+                values.extend(_sql_value(val) for val in value)
+            elif value is None:
+                clauses.append('{0} IS NULL'.format(column))
+            else:
+                clauses.append('{0} {1} ?'.format(column, operator))
+                values.append(_sql_value(value))
+
+        sql = 'SELECT content FROM {0}'.format(table)
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+
+        for row in self._connection().execute(sql + ' ORDER BY id', values):
+            yield self.client._model(model_cls, json.loads(row[0]))
+
+    def _newest(self, table, column, **where):
+        """ The largest ``column`` value among the rows matching ``where``, or
+            None if there are none
+        """
+        clause, values = _where(where)
+        return self._connection().execute(
+            'SELECT MAX({0}) FROM {1}{2}'.format(column, table, clause), values).fetchone()[0]
+
+    def _delete(self, table, **where):
+        clause, values = _where(where)
+        self._connection().execute('DELETE FROM {0}{1}'.format(table, clause), values)
+
+    def _store(self, table, objs, **defaults):
+        """ Insert or replace ``objs``. ``defaults`` are the column values of
+            objects that do not include them
+        """
+        columns = _TABLES[table][1]
+        sql = 'INSERT OR REPLACE INTO {0} (id, {1}, content) VALUES ({2})'.format(
+            table, ', '.join(columns), ', '.join('?' * (len(columns) + 2)))
+        rows = [[obj['id']] + [obj.get(column, defaults.get(column, None)) for column in columns] +
+                [json.dumps(obj)] for obj in objs]
+        self._connection().executemany(sql, rows)
+
+
+def _column(table, name):
+    """ Returns the column filtered by query keyword ``name``, and the operator
+        comparing it to the keyword's value
+    """
+    columns = _TABLES[table][1]
+    for column in (_ALIASES.get(name, None), name + '_id', name):
+        if column in columns:
+            return column, '='
+
+    for suffix, operator in (('_after', '>'), ('_before', '<')):
+        if name.endswith(suffix) and name[:-len(suffix)] + '_on' in columns:
+            return name[:-len(suffix)] + '_on', operator
+
+    raise TRAWClientError('Mirrored {0} cannot be filtered by {1}'.format(table, name))
+
+
+def _sql_value(value):
+    if isinstance(value, ModelBase):
+        return value.id
+    elif isinstance(value, datetime):
+        return int(time.mktime(value.timetuple()))
+    elif isinstance(value, bool):
+        return int(value)
+
+    return value
+
+
+def _where(where):
+    """ WHERE clause, and its values, matching the non-None ``where`` values """
+    names = sorted(name for name, value in where.items() if value is not None)
+    if not names:
+        return '', list()
+
+    return ' WHERE ' + ' AND '.join('{0} = ?'.format(name) for name in names), [where[name] for name in names]
@@ -26,6 +26,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
         case = client.add(new_case)
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = const.CASE_ADD_FIELDS
     _UPDATABLE_FIELDS = const.CASE_UPDATE_FIELDS
 
@@ -53,7 +54,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def estimate(self, val):
         if not isinstance(val, timedelta):
             raise TypeError(const.SETTER_ERR.format(timedelta, type(val)))
-        self._content['estimate'] = val.seconds
+        self._mutable_content['estimate'] = val.seconds
 
     @property
     def estimate_forecast(self):
@@ -73,7 +74,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def milestone(self, val):
         if not isinstance(val, Milestone):
             raise TypeError(const.SETTER_ERR.format(Milestone, type(val)))
-        self._content['milestone_id'] = val.id
+        self._mutable_content['milestone_id'] = val.id
 
     @property
     def priority(self):  # TODO: find out why API returns only None
@@ -85,7 +86,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def priority(self, val):
         if not isinstance(val, Priority):
             raise TypeError(const.SETTER_ERR.format(Priority, type(val)))
-        self._content['priority_id'] = val.id
+        self._mutable_content['priority_id'] = val.id
 
     @property
     def refs(self):
@@ -117,7 +118,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
                    "a list of reference strings (['REF01', 'REF02']). Found {0}")
             raise TypeError(msg.format(val))
 
-        self._content['refs'] = refs_
+        self._mutable_content['refs'] = refs_
 
     @property
     def section(self):
@@ -129,7 +130,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def section(self, val):
         if not isinstance(val, Section):
             raise TypeError(const.SETTER_ERR.format(Section, type(val)))
-        self._content['section_id'] = val.id
+        self._mutable_content['section_id'] = val.id
 
     @property
     def suite(self):
@@ -141,7 +142,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def suite(self, val):
         if not isinstance(val, Suite):
             raise TypeError(const.SETTER_ERR.format(Suite, type(val)))
-        self._content['suite_id'] = val.id
+        self._mutable_content['suite_id'] = val.id
 
     @property
     def template(self):
@@ -153,7 +154,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def template(self, val):
         if not isinstance(val, Template):
             raise TypeError(const.SETTER_ERR.format(Template, type(val)))
-        self._content['template_id'] = val.id
+        self._mutable_content['template_id'] = val.id
 
     @property
     def title(self):
@@ -164,7 +165,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def title(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['title'] = val
+        self._mutable_content['title'] = val
 
     @property
     def case_type(self):
@@ -176,7 +177,7 @@ class Case(Addable, Deleteable, Updatable, ModelBase):
     def case_type(self, val):
         if not isinstance(val, CaseType):
             raise TypeError(const.SETTER_ERR.format(CaseType, type(val)))
-        self._content['type_id'] = val.id
+        self._mutable_content['type_id'] = val.id
 
     @property
     def updated_by(self):
@@ -11,6 +11,8 @@ class CaseType(ModelBase):
         case_types = list(traw_client.case_types())
 
     """
+    __slots__ = ()
+
     @property
     def is_default(self):
         """ True if the case type is the default """
@@ -7,6 +7,8 @@ from .project import Project
 
 class ConfigBase(ModelBase):
     """ Base Class for Config-related classes """
+    __slots__ = ()
+
     @property
     def name(self):
         """ The name of the configuration group """
@@ -16,7 +18,7 @@ class ConfigBase(ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def project(self):
@@ -28,7 +30,7 @@ class ConfigBase(ModelBase):
     def project(self, project):
         if not isinstance(project, Project):
             raise TypeError(SETTER_ERR.format(Project, type(project)))
-        self._content['project_id'] = project.id
+        self._mutable_content['project_id'] = project.id
 
 
 class ConfigGroup(Addable, Deleteable, Updatable, ConfigBase):
@@ -50,6 +52,7 @@ class ConfigGroup(Addable, Deleteable, Updatable, ConfigBase):
         con_grps = traw_client.config_groups(project)
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = CONFIG_GROUP_ADD_FIELDS
     _UPDATABLE_FIELDS = CONFIG_GROUP_UPDATE_FIELDS
 
@@ -73,6 +76,7 @@ class Config(Addable, Deleteable, Updatable, ConfigBase):
         configs = list(con_grp.configs)
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = CONFIG_ADD_FIELDS
     _UPDATABLE_FIELDS = CONFIG_UPDATE_FIELDS
 
@@ -104,4 +108,4 @@ class Config(Addable, Deleteable, Updatable, ConfigBase):
     def config_group(self, val):
         if not isinstance(val, ConfigGroup):
             raise TypeError(SETTER_ERR.format(ConfigGroup, type(val)))
-        self._content['group_id'] = val.id
+        self._mutable_content['group_id'] = val.id
@@ -9,6 +9,7 @@ from .project import Project
 
 
 class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
+    __slots__ = ()
     _ADDABLE_FIELDS = const.MILESTONE_ADD_FIELDS
     _UPDATABLE_FIELDS = const.MILESTONE_UPDATE_FIELDS
 
@@ -29,7 +30,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def description(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['description'] = val
+        self._mutable_content['description'] = val
 
     @property
     def due_on(self):
@@ -44,7 +45,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
         # TODO: log warning if setting due date to past
         if not isinstance(val, dt):
             raise TypeError(const.SETTER_ERR.format(dt, type(val)))
-        self._content['due_on'] = int(time.mktime(val.timetuple()))
+        self._mutable_content['due_on'] = int(time.mktime(val.timetuple()))
 
     @property
     def is_completed(self):
@@ -55,7 +56,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def is_completed(self, val):
         if not isinstance(val, bool):
             raise TypeError(const.SETTER_ERR.format(bool, type(val)))
-        self._content['is_completed'] = val
+        self._mutable_content['is_completed'] = val
 
     @property
     def is_started(self):
@@ -66,7 +67,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def is_started(self, val):
         if not isinstance(val, bool):
             raise TypeError(const.SETTER_ERR.format(bool, type(val)))
-        self._content['is_started'] = val
+        self._mutable_content['is_started'] = val
 
     @property
     def name(self):
@@ -77,7 +78,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def project(self):
@@ -89,7 +90,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def project(self, project):
         if not isinstance(project, Project):
             raise TypeError(const.SETTER_ERR.format(Project, type(project)))
-        self._content['project_id'] = project.id
+        self._mutable_content['project_id'] = project.id
 
     @property
     def start_on(self):
@@ -103,7 +104,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def start_on(self, val):
         if not isinstance(val, dt):
             raise TypeError(const.SETTER_ERR.format(dt, type(val)))
-        self._content['start_on'] = int(time.mktime(val.timetuple()))
+        self._mutable_content['start_on'] = int(time.mktime(val.timetuple()))
 
     @property
     def started_on(self):
@@ -117,7 +118,7 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
     def started_on(self, val):
         if not isinstance(val, dt):
             raise TypeError(const.SETTER_ERR.format(dt, type(val)))
-        self._content['started_on'] = int(time.mktime(val.timetuple()))
+        self._mutable_content['started_on'] = int(time.mktime(val.timetuple()))
 
     @property
     def url(self):
@@ -126,6 +127,8 @@ class MilestoneBase(Addable, Deleteable, Updatable, ModelBase):
 
 
 class SubMilestone(MilestoneBase):
+    __slots__ = ()
+
     @property
     def parent(self):
         """ The ID of the parent milestone the sub-milestone belongs to
@@ -149,7 +152,7 @@ class SubMilestone(MilestoneBase):
                    "ID is {1}")
             raise ValueError(msg.format(self.project.id, parent_ms.project.id))
         else:
-            self._content['parent_id'] = parent_ms.id
+            self._mutable_content['parent_id'] = parent_ms.id
 
 
 class Milestone(MilestoneBase):
@@ -184,6 +187,8 @@ class Milestone(MilestoneBase):
         new_milestone.project = project
 
     """
+    __slots__ = ()
+
     def add_parent(self, milestone):
         """ Adding a parent milestone to a Milestone object transforms it into a
             SubMilestone
@@ -198,7 +203,8 @@ class Milestone(MilestoneBase):
 
         parent_id = milestone if isinstance(milestone, int) else milestone.id
 
-        sub_milestone = deepcopy(self._content)
+        # Content fetched through the client is read-only
+        sub_milestone = dict(deepcopy(self._content))
         sub_milestone['parent_id'] = parent_id
 
         return SubMilestone(self.client, sub_milestone)
@@ -216,7 +222,7 @@ class Milestone(MilestoneBase):
         if sub_milestones_ is None:
             # None indicates this milestone came from somewhere other than the `get_milestone`
             # endpoint. Need to make an additional API call to get the sub milestones
-            self._content['milestones'] = self.client.api.milestone_by_id(self.id)['milestones']
+            self._mutable_content['milestones'] = self.client.api.milestone_by_id(self.id)['milestones']
 
         for sub_milestone in self._content['milestones']:
             yield SubMilestone(self.client, sub_milestone)
@@ -1,15 +1,28 @@
+from ..cache import ReadOnlyDict
+
+
 class ModelBase(object):
-    """ Base class for all TRAW models """
+    """ Base class for all TRAW models
+
+    Models keep no per-instance ``__dict__``: their only attributes are the
+    client and the API response content, so large collections of models
+    (e.g. result histories) cost little more than the responses themselves.
+    Subclasses must declare ``__slots__`` (usually empty) to keep it that way.
+    """
+    __slots__ = ('client', '_content', '__weakref__')
+
     def __eq__(self, obj):
         if not isinstance(obj, type(self)):
             return False
         elif obj.id != self.id:
             return False
 
-        return hash(self) == hash(obj)
+        return self._content == obj._content
 
     def __hash__(self):
-        return hash(str(self._content))
+        # Objects that are equal share a type and id, so hashing those alone is
+        # consistent with __eq__ without hashing the whole content
+        return hash((type(self), self.id))
 
     def __init__(self, client, content=None):
         self.client = client
@@ -25,6 +38,19 @@ class ModelBase(object):
         class_name = self.__class__.__name__
         return "{0}-{1}".format(class_name, self.id)
 
+    @property
+    def _mutable_content(self):
+        """ The content, for local edits
+
+        Content from the API caches is read-only, as it is shared with every
+        other model built from the same cached response. The first local edit
+        copies it (copy-on-write), so edits never reach the cache.
+        """
+        if isinstance(self._content, ReadOnlyDict):
+            self._content = self._content.copy()
+
+        return self._content
+
     @property
     def id(self):
         """ The unique ID of the project """
@@ -3,4 +3,6 @@ from .model_base import ModelBase
 
 class Plan(ModelBase):
     """ Stub """
+    __slots__ = ()
+
     pass
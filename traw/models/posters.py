@@ -1,5 +1,7 @@
 class Addable(object):
     """  """
+    __slots__ = ()
+
     @property
     def add_params(self):
         """ Returns params necessary to add the subclass object to TestRail """
@@ -8,16 +10,18 @@ class Addable(object):
 
 class Closeable(object):
     """  """
-    pass
+    __slots__ = ()
 
 
 class Deleteable(object):
     """  """
-    pass
+    __slots__ = ()
 
 
 class Updatable(object):
     """  """
+    __slots__ = ()
+
     @property
     def update_params(self):
         """ Returns params necessary to update the subclass object in TestRail """
@@ -11,6 +11,8 @@ class Priority(ModelBase):
         priorities = list(traw_client.priorities())
 
     """
+    __slots__ = ()
+
     @property
     def is_default(self):
         """ Reports if priority is default """
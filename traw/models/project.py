@@ -19,6 +19,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
         new_project.suite_mode = 1
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = PROJECT_ADD_FIELDS
     _UPDATABLE_FIELDS = PROJECT_UPDATE_FIELDS
 
@@ -33,7 +34,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
     def announcement(self, val):
         if not isinstance(val, str):
             raise TypeError(SETTER_ERR.format(str, type(val)))
-        self._content['announcement'] = val
+        self._mutable_content['announcement'] = val
 
     @property
     def completed_on(self):
@@ -54,7 +55,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
     def is_completed(self, val):
         if not isinstance(val, bool):
             raise TypeError(SETTER_ERR.format(bool, type(val)))
-        self._content['is_completed'] = val
+        self._mutable_content['is_completed'] = val
 
     @property
     def name(self):
@@ -65,7 +66,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def show_announcement(self):
@@ -76,7 +77,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
     def show_announcement(self, val):
         if not isinstance(val, bool):
             raise TypeError(SETTER_ERR.format(bool, type(val)))
-        self._content['show_announcement'] = val
+        self._mutable_content['show_announcement'] = val
 
     @property
     def suite_mode(self):
@@ -92,7 +93,7 @@ class Project(Addable, Deleteable, Updatable, ModelBase):
             raise TypeError(SETTER_ERR.format(int, type(val)))
         elif val not in [1, 2, 3]:
             raise ValueError('suite_mode can only be set to 1, 2, or 3')
-        self._content['suite_mode'] = val
+        self._mutable_content['suite_mode'] = val
 
     @property
     def url(self):
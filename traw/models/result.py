@@ -13,6 +13,7 @@ class Result(Addable, ModelBase):
     """ Object model for TestRail Results
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = const.RESULT_ADD_FIELDS
 
     @property
@@ -25,7 +26,7 @@ class Result(Addable, ModelBase):
     def assigned_to(self, val):
         if not isinstance(val, User):
             raise TypeError(const.SETTER_ERR.format(User, type(val)))
-        self._content['assignedto_id'] = val.id
+        self._mutable_content['assignedto_id'] = val.id
 
     @property
     def comment(self):
@@ -36,7 +37,7 @@ class Result(Addable, ModelBase):
     def comment(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['comment'] = val
+        self._mutable_content['comment'] = val
 
     @property
     def created_by(self):
@@ -80,7 +81,7 @@ class Result(Addable, ModelBase):
                    "of defect strings (['DEFECT1', 'DEFECT2']). Found {0}")
             raise TypeError(msg.format(val))
 
-        self._content['defects'] = defects_
+        self._mutable_content['defects'] = defects_
 
     @property
     def elapsed(self):
@@ -94,7 +95,7 @@ class Result(Addable, ModelBase):
     def elapsed(self, val):
         if not isinstance(val, timedelta):
             raise TypeError(const.SETTER_ERR.format(timedelta, type(val)))
-        self._content['elapsed'] = val.seconds
+        self._mutable_content['elapsed'] = val.seconds
 
     @property
     def status(self):
@@ -106,7 +107,7 @@ class Result(Addable, ModelBase):
     def status(self, val):
         if not isinstance(val, Status):
             raise TypeError(const.SETTER_ERR.format(Status, type(val)))
-        self._content['status_id'] = val.id
+        self._mutable_content['status_id'] = val.id
 
     @property
     def test(self):
@@ -118,7 +119,7 @@ class Result(Addable, ModelBase):
     def test(self, val):
         if not isinstance(val, Test):
             raise TypeError(const.SETTER_ERR.format(Test, type(val)))
-        self._content['test_id'] = val.id
+        self._mutable_content['test_id'] = val.id
 
     @property
     def version(self):
@@ -129,4 +130,4 @@ class Result(Addable, ModelBase):
     def version(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['version'] = val
+        self._mutable_content['version'] = val
@@ -23,6 +23,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
         new_run.description = "My new run description"
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = const.RUN_ADD_FIELDS
     _UPDATABLE_FIELDS = const.RUN_UPDATE_FIELDS
 
@@ -46,7 +47,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def assigned_to(self, val):
         if not isinstance(val, User):
             raise TypeError(const.SETTER_ERR.format(User, type(val)))
-        self._content['assignedto_id'] = val.id
+        self._mutable_content['assignedto_id'] = val.id
 
     @property
     def blocked_count(self):
@@ -56,8 +57,13 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     @property
     def cases(self):
         """ A list of cases for the custom case selection """
-        case_ids = self._content.get('case_ids', list())
-        for case in [self.client.case(c) for c in case_ids]:
+        case_ids = self._content.get('case_ids', None) or list()
+        if not case_ids:
+            return
+
+        # Listed in bulk from the run's suite, rather than fetched one by one
+        for case in self.client.cases(list(case_ids), project=self._content.get('project_id', None),
+                                      suite=self._content.get('suite_id', None)):
             yield case
 
     @cases.setter
@@ -74,7 +80,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
                        "int case IDs. Found at least one {0}")
                 raise TypeError(msg.format(type(val)))
             case_ids.append(val.id if isinstance(val, Case) else val)
-        self._content['case_ids'] = case_ids
+        self._mutable_content['case_ids'] = case_ids
 
     @property
     def completed_on(self):
@@ -120,7 +126,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def description(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['description'] = val
+        self._mutable_content['description'] = val
 
     @property
     def failed_count(self):
@@ -136,7 +142,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def include_all(self, val):
         if not isinstance(val, bool):
             raise TypeError(const.SETTER_ERR.format(bool, type(val)))
-        self._content['include_all'] = val
+        self._mutable_content['include_all'] = val
 
     @property
     def is_completed(self):
@@ -153,7 +159,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def milestone(self, val):
         if not isinstance(val, Milestone):
             raise TypeError(const.SETTER_ERR.format(Milestone, type(val)))
-        self._content['milestone_id'] = val.id
+        self._mutable_content['milestone_id'] = val.id
 
     @property
     def name(self):
@@ -164,7 +170,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def passed_count(self):
@@ -187,7 +193,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def project(self, project):
         if not isinstance(project, Project):
             raise TypeError(const.SETTER_ERR.format(Project, type(project)))
-        self._content['project_id'] = project.id
+        self._mutable_content['project_id'] = project.id
 
     @property
     def retest_count(self):
@@ -207,7 +213,7 @@ class Run(Addable, Closeable, Deleteable, Updatable, ModelBase):
     def suite(self, val):
         if not isinstance(val, Suite):
             raise TypeError(const.SETTER_ERR.format(Suite, type(val)))
-        self._content['suite_id'] = val.id
+        self._mutable_content['suite_id'] = val.id
 
     @property
     def untested_count(self):
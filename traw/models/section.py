@@ -27,6 +27,7 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
         section = traw_client.add(new_section)
 
     """
+    __slots__ = ()
     _ADDABLE_FIELDS = const.SECTION_ADD_FIELDS
     _UPDATABLE_FIELDS = const.SECTION_UPDATE_FIELDS
 
@@ -44,7 +45,7 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
     def description(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['description'] = val
+        self._mutable_content['description'] = val
 
     @property
     def display_order(self):
@@ -60,7 +61,7 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def parent(self):
@@ -72,7 +73,7 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
     def parent(self, val):
         if not isinstance(val, Section):
             raise TypeError(const.SETTER_ERR.format(Section, type(val)))
-        self._content['parent_id'] = val.id
+        self._mutable_content['parent_id'] = val.id
 
     @property
     def project(self):
@@ -84,7 +85,7 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
     def project(self, val):
         if not isinstance(val, Project):
             raise TypeError(const.SETTER_ERR.format(Project, type(val)))
-        self._content['project_id'] = val.id
+        self._mutable_content['project_id'] = val.id
 
     @property
     def suite(self):
@@ -96,4 +97,4 @@ class Section(Addable, Deleteable, Updatable, ModelBase):
     def suite(self, val):
         if not isinstance(val, Suite):
             raise TypeError(const.SETTER_ERR.format(Suite, type(val)))
-        self._content['suite_id'] = val.id
+        self._mutable_content['suite_id'] = val.id
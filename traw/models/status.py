@@ -11,6 +11,8 @@ class Status(ModelBase):
         statuses = list(traw_client.statuses())
 
     """
+    __slots__ = ()
+
     @property
     def color_bright(self):
         """ The brightest shade of the status """
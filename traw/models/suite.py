@@ -7,6 +7,7 @@ from .project import Project
 
 
 class Suite(Addable, Deleteable, Updatable, ModelBase):
+    __slots__ = ()
     _ADDABLE_FIELDS = const.SUITE_ADD_FIELDS
     _UPDATABLE_FIELDS = const.SUITE_UPDATE_FIELDS
 
@@ -27,7 +28,7 @@ class Suite(Addable, Deleteable, Updatable, ModelBase):
     def description(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['description'] = val
+        self._mutable_content['description'] = val
 
     @property
     def is_baseline(self):
@@ -53,7 +54,7 @@ class Suite(Addable, Deleteable, Updatable, ModelBase):
     def name(self, val):
         if not isinstance(val, str):
             raise TypeError(const.SETTER_ERR.format(str, type(val)))
-        self._content['name'] = val
+        self._mutable_content['name'] = val
 
     @property
     def project(self):
@@ -65,7 +66,7 @@ class Suite(Addable, Deleteable, Updatable, ModelBase):
     def project(self, project):
         if not isinstance(project, Project):
             raise TypeError(const.SETTER_ERR.format(Project, type(project)))
-        self._content['project_id'] = project.id
+        self._mutable_content['project_id'] = project.id
 
     @property
     def url(self):
@@ -12,6 +12,8 @@ class Template(ModelBase):
         templates_for_project = list(traw_client.template(target_project))
 
     """
+    __slots__ = ()
+
     @property
     def is_default(self):
         """ True if this is a default template """
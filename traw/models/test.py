@@ -21,6 +21,8 @@ class Test(ModelBase):
         tests = traw_client.tests(run)
 
     """
+    __slots__ = ()
+
     @property
     def assigned_to(self):
         """ The user the test is assigned to """
@@ -18,6 +18,8 @@ class User(ModelBase):
         user_dave = traw_client.user('dave@email.com')  # Gets user with email from API
 
     """
+    __slots__ = ()
+
     @property
     def email(self):
         """ The email address of the user as configured in TestRail """
@@ -0,0 +1,184 @@
+""" Client side rate limiting for TestRail API requests
+
+TestRail limits the number of requests each account can make per minute, and
+answers requests over that budget with HTTP 429. A ``TokenBucket`` spreads
+requests out so they stay within a requests-per-minute budget instead:
+
+.. code-block:: python
+
+    bucket = TokenBucket(180)  # 180 requests per minute
+    time.sleep(bucket.reserve())  # Wait for this request's turn
+
+Buckets returned by ``shared_bucket`` are shared by every Session in the process
+that uses the same key. A ``FileTokenBucket`` keeps its state in a memory-mapped
+file, so sibling processes that use the same file share one budget as well.
+"""
+from contextlib import contextmanager
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from .const import DEFAULT_RATE_LIMIT_PERIOD
+from .exceptions import TRAWClientError
+
+_STATE = struct.Struct('<dd')  # Token level, time of last update
+
+_buckets = dict()
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket(object):
+    """ Thread-safe token bucket
+
+    The bucket holds up to ``burst`` tokens, and refills at ``rate`` tokens
+    every ``per`` seconds. Each request reserves a token, and waits for as long
+    as it takes the bucket to refill if there was none left.
+
+    :param rate: Number of requests allowed every ``per`` seconds
+    :param per: Length, in seconds, of the period ``rate`` applies to
+    :param burst: Maximum number of requests that can be made at once
+        after the bucket has been idle. Defaults to ``rate``
+    """
+    def __init__(self, rate, per=DEFAULT_RATE_LIMIT_PERIOD, burst=None):
+        if rate <= 0 or per <= 0:
+            raise TRAWClientError('rate and per must be positive numbers')
+
+        self.rate = rate
+        self.per = per
+        self.burst = burst or rate
+
+        self._lock = threading.Lock()
+        self._level = float(self.burst)
+        self._updated = time.time()
+
+    @property
+    def _refill_rate(self):
+        return float(self.rate) / self.per
+
+    def reserve(self, tokens=1):
+        """ Take ``tokens`` from the bucket, going into debt if there are not
+            enough left
+
+        :returns: float, number of seconds to wait before making the request
+        """
+        with self._state() as (level, updated):
+            now = time.time()
+            level, updated = self._refill(level, updated, now)
+            level -= tokens
+
+            wait = max(updated - now, 0)
+            if level < 0:
+                wait += -level / self._refill_rate
+
+            self._write(level, updated)
+            return wait
+
+    def acquire(self, tokens=1):
+        """ Take ``tokens`` from the bucket, sleeping until they are available """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """ Empty the bucket, and stop refilling it for ``seconds``
+
+        Used when TestRail rate limits a request anyway (e.g. because another
+        client shares the account), so every request sharing the bucket backs
+        off together instead of each being rate limited in turn.
+        """
+        with self._state() as (level, updated):
+            self._write(min(level, 0), max(updated, time.time() + seconds))
+
+    def _refill(self, level, updated, now):
+        if now > updated:
+            level = min(level + (now - updated) * self._refill_rate, self.burst)
+            updated = now
+
+        return level, updated
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            yield self._level, self._updated
+
+    def _write(self, level, updated):
+        self._level = level
+        self._updated = updated
+
+
+class FileTokenBucket(TokenBucket):
+    """ Token bucket whose state is shared through a memory-mapped file
+
+    Every process that creates a FileTokenBucket for the same ``path`` draws
+    from the same bucket. Access is serialized with an exclusive ``flock`` on
+    the file, so this is only available on platforms that provide ``fcntl``.
+
+    :param path: Path of the state file. It is created if it does not exist
+    :param rate: Number of requests allowed every ``per`` seconds
+    :param per: Length, in seconds, of the period ``rate`` applies to
+    :param burst: Maximum number of requests that can be made at once
+        after the bucket has been idle. Defaults to ``rate``
+    """
+    def __init__(self, path, rate, per=DEFAULT_RATE_LIMIT_PERIOD, burst=None):
+        if fcntl is None:  # pragma: no cover
+            raise TRAWClientError('FileTokenBucket requires fcntl, which is not '
+                                  'available on this platform')
+
+        super(FileTokenBucket, self).__init__(rate, per, burst)
+        self.path = path
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < _STATE.size:
+                os.write(self._fd, _STATE.pack(self._level, self._updated))
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._map = mmap.mmap(self._fd, _STATE.size)
+
+    def close(self):
+        """ Release the state file. The bucket cannot be used afterwards """
+        self._map.close()
+        os.close(self._fd)
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield _STATE.unpack(self._map[:_STATE.size])
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _write(self, level, updated):
+        self._map[:_STATE.size] = _STATE.pack(level, updated)
+
+
+def shared_bucket(key, rate, per=DEFAULT_RATE_LIMIT_PERIOD, burst=None, path=None):
+    """ Return the process-wide token bucket for ``key``, creating it if needed
+
+    :param key: Hashable key identifying the budget, e.g. the TestRail url
+    :param path: Optional state file path; when given, the bucket is a
+        ``FileTokenBucket`` that is also shared with other processes
+
+    The ``rate``, ``per``, and ``burst`` of an existing bucket are not changed.
+    """
+    with _buckets_lock:
+        bucket = _buckets.get((key, path), None)
+        if bucket is None:
+            if path is None:
+                bucket = TokenBucket(rate, per, burst)
+            else:
+                bucket = FileTokenBucket(path, rate, per, burst)
+
+            _buckets[(key, path)] = bucket
+
+    return bucket
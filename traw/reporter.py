@@ -0,0 +1,232 @@
+""" Buffered, background reporting of test results
+
+Adding results one at a time with ``client.add(result)`` waits on TestRail for
+every result. A ``ResultReporter`` queues results instead, and a background
+thread adds them in bulk (see ``traw.Client.add_results``):
+
+.. code-block:: python
+
+    reporter = traw.ResultReporter(client, run)
+    reporter.add(result)  # Returns immediately
+    ...
+    reporter.close()  # Reports anything still queued
+
+Queued results are reported once ``flush_size`` of them are waiting, or
+``flush_interval`` seconds after the oldest of them was queued, whichever comes
+first. Every open reporter is closed (and so flushed) when the interpreter exits,
+waiting at most ``traw.const.DEFAULT_REPORTER_EXIT_TIMEOUT`` seconds for all of
+them; results that are still unreported by then are logged, and dropped.
+"""
+import atexit
+import logging
+import threading
+import time
+from weakref import WeakSet
+
+from six.moves import queue
+
+from . import models
+from .client import BULK_BODY_OVERHEAD, bulk_case_result_entries, bulk_result_entries
+from .const import (DEFAULT_BULK_MAX_BYTES, DEFAULT_REPORTER_BACKOFF, DEFAULT_REPORTER_EXIT_TIMEOUT,
+                    DEFAULT_REPORTER_FLUSH_INTERVAL, DEFAULT_REPORTER_FLUSH_SIZE, DEFAULT_REPORTER_RETRIES)
+from .exceptions import ServiceUnavailableError, TRAWClientError
+from .utils import chunk_by_size
+
+log = logging.getLogger(__package__)
+
+_RESULT = 'result'
+_CASE_RESULT = 'case result'
+_FLUSH = 'flush'
+_STOP = 'stop'
+
+_open_reporters = WeakSet()
+
+
+class ResultReporter(object):
+    """ Reports results to a TestRail run in bulk, from a background thread
+
+    :param client: traw.Client used to add the results
+    :param run: models.Run object or int, Run ID of the run results are added to
+    :param flush_size: int, number of queued results that triggers a flush
+    :param flush_interval: float, maximum number of seconds a result is queued
+        before it is flushed
+    :param retries: int, number of times a flush is retried when TestRail
+        remains unavailable (after the session's own retries)
+    :param backoff: float, seconds before the first retry. Doubles on each retry
+    :param max_bytes: int, maximum size of each request body, as for
+        ``traw.Client.add_results``. Each request is retried on its own, so
+        results that were reported are never sent again
+
+    Results that could not be reported are kept in ``failed``, as
+    ``models.Result`` objects or ``(case, models.Result)`` pairs.
+    """
+    def __init__(self, client, run, flush_size=DEFAULT_REPORTER_FLUSH_SIZE,
+                 flush_interval=DEFAULT_REPORTER_FLUSH_INTERVAL,
+                 retries=DEFAULT_REPORTER_RETRIES, backoff=DEFAULT_REPORTER_BACKOFF,
+                 max_bytes=DEFAULT_BULK_MAX_BYTES):
+        self.client = client
+        self.run = run
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.backoff = backoff
+        self.max_bytes = max_bytes
+        self.failed = list()
+
+        self._closed = False
+        self._lock = threading.Lock()  # Nothing is queued after _STOP
+        self._unreported = 0  # Results queued, and not yet sent (or given up on)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._report)
+        self._thread.daemon = True
+        self._thread.start()
+
+        _open_reporters.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, result):
+        """ Queue a models.Result, with its `test` set, to be reported """
+        if not isinstance(result, models.Result):
+            msg = "Reported results must be models.Result objects. Found {0}"
+            raise TypeError(msg.format(type(result)))
+        elif result._content.get('test_id', None) is None:
+            raise TRAWClientError('Reported results must have a test')
+
+        self._put(_RESULT, result)
+
+    def add_for_case(self, case, result):
+        """ Queue a models.Result to be reported for ``case`` (a models.Case
+            object or int case ID)
+        """
+        if not isinstance(result, models.Result):
+            msg = "Reported results must be models.Result objects. Found {0}"
+            raise TypeError(msg.format(type(result)))
+
+        self._put(_CASE_RESULT, (case, result))
+
+    def flush(self, timeout=None):
+        """ Report every result queued so far, waiting up to ``timeout``
+            seconds (or forever, if None) for them to be reported
+
+        :returns: True if the results were reported within ``timeout``
+        """
+        done = threading.Event()
+        self._put(_FLUSH, done)
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """ Report every queued result, and stop the background thread """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._queue.put((_STOP, None))
+            self._closed = True
+
+        _open_reporters.discard(self)
+        self._thread.join(timeout)
+
+    def _put(self, kind, item):
+        with self._lock:
+            if self._closed:
+                raise TRAWClientError('Cannot use a ResultReporter after it is closed')
+
+            self._queue.put((kind, item))
+            if kind in (_RESULT, _CASE_RESULT):
+                self._unreported += 1
+
+    def _report(self):
+        pending = list()
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                kind, item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, item = _FLUSH, None
+
+            if kind in (_RESULT, _CASE_RESULT):
+                pending.append((kind, item))
+                if deadline is None:
+                    deadline = time.time() + self.flush_interval
+                if len(pending) < self.flush_size:
+                    continue
+
+            self._send(pending)
+            with self._lock:
+                self._unreported -= len(pending)
+            pending = list()
+            deadline = None
+
+            if item is not None and kind == _FLUSH:
+                item.set()
+            if kind == _STOP:
+                return
+
+    def _send(self, pending):
+        for start in range(0, len(pending), self.flush_size):
+            batch = pending[start:start + self.flush_size]
+            results = [item for kind, item in batch if kind == _RESULT]
+            case_results = [item for kind, item in batch if kind == _CASE_RESULT]
+
+            if results:
+                self._send_requests(self.client.add_results, bulk_result_entries, results)
+            if case_results:
+                self._send_requests(self.client.add_results_for_cases, bulk_case_result_entries,
+                                    case_results)
+
+    def _send_requests(self, add_method, entries_func, items):
+        """ Send ``items`` one request body (of at most ``max_bytes``) at a
+            time, so only the request that fails is retried
+        """
+        try:
+            entries = entries_func(items)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Failed to report {0} results'.format(len(items)))
+            self.failed.extend(items)
+            return
+
+        start = 0
+        for chunk in chunk_by_size(entries, self.max_bytes, overhead=BULK_BODY_OVERHEAD):
+            self._send_with_backoff(add_method, items[start:start + len(chunk)])
+            start += len(chunk)
+
+    def _send_with_backoff(self, add_method, items):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                add_method(self.run, items, max_bytes=self.max_bytes)
+                return
+            except ServiceUnavailableError:
+                if attempt == self.retries:
+                    log.error('TestRail is unavailable. Failed to report {0} results'.format(
+                        len(items)))
+                    break
+
+                log_msg = 'TestRail is unavailable. Retrying {0} results in {1} seconds'
+                log.warning(log_msg.format(len(items), delay))
+                time.sleep(delay)
+                delay *= 2
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Failed to report {0} results'.format(len(items)))
+                break
+
+        self.failed.extend(items)
+
+
+@atexit.register
+def _close_open_reporters(timeout=DEFAULT_REPORTER_EXIT_TIMEOUT):
+    """ Close every open reporter, waiting at most ``timeout`` seconds for
+        all of them to report their queued results
+    """
+    deadline = time.time() + timeout
+    for reporter in list(_open_reporters):
+        reporter.close(max(deadline - time.time(), 0))
+        if reporter._thread.is_alive():
+            log.error('Gave up on reporting {0} results to TestRail at exit'.format(reporter._unreported))
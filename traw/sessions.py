@@ -7,10 +7,11 @@ from retry import retry
 from requests.status_codes import codes
 from requests.exceptions import ChunkedEncodingError, ConnectionError, ReadTimeout
 
-from .const import BASE_API_PATH, TIMEOUT
+from .const import BASE_API_PATH, GET, TIMEOUT
 from .exceptions import (BadRequest, Conflict, Forbidden, NotFound, RateLimited,
                          Redirect, ServerError, ServiceUnavailableError,
                          TooLarge, UnknownStatusCode)
+from .utils import SingleFlight
 
 log = logging.getLogger(__package__)
 
@@ -33,15 +34,19 @@ class Session(object):
                          codes['unauthorized']: Forbidden}
     SUCCESS_STATUSES = {codes['created'], codes['ok']}
 
-    def __init__(self, auth, url):
+    def __init__(self, auth, url, rate_limiter=None):
         """ Prepare the connection to the TestRail API
 
         :param auth: Tuple of username and api_key/password
         :param url: Base url for testrail (e.g. https://<your company>.testrail.net)
+        :param rate_limiter: Optional ``traw.ratelimit.TokenBucket`` that every
+            request (including retries) takes a token from before it is sent
 
         """
         self._auth = auth
         self._url = url
+        self._rate_limiter = rate_limiter
+        self._inflight = SingleFlight()
 
         self._http = requests.Session()
         self._http.headers['Content-Type'] = 'application/json'
@@ -71,6 +76,9 @@ class Session(object):
     def _request_with_retries(self, *args, **kwargs):
         """  """
         self._log_request(**kwargs)
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
         response = self._make_request(*args, **kwargs)
 
         if response.status_code in self.STATUS_EXCEPTIONS:
@@ -83,6 +91,10 @@ class Session(object):
             retry_after = int(response.headers['Retry-After'])
             log_msg = 'API rate limit reached. Retrying after {0} seconds'
             log.warning(log_msg.format(retry_after))
+            if self._rate_limiter is not None:
+                # Hold back every request sharing the limiter, not just this one
+                self._rate_limiter.pause(retry_after)
+
             time.sleep(retry_after)
             raise RateLimited(response)
         elif response.status_code not in self.SUCCESS_STATUSES:
@@ -109,7 +121,20 @@ class Session(object):
             request.
         :param params: The query parameters to send with the request.
 
+        Identical GET requests made concurrently from several threads share
+        a single HTTP request.
+
         """
         params = deepcopy(params) or dict()
         url = '/'.join(part.strip('/') for part in [self._url, BASE_API_PATH, path])
+        if method == GET:
+            key = request_key(url, params)
+            return self._inflight.do(key, self._request_with_retries,
+                                     method=method, json=json, params=params, url=url)
+
         return self._request_with_retries(method=method, json=json, params=params, url=url)
+
+
+def request_key(url, params):
+    """ Returns a key identifying a GET request for ``url`` with ``params`` """
+    return (url, str(sorted(params.items())))
@@ -1,15 +1,276 @@
+from collections import deque
 from copy import deepcopy
 from datetime import datetime as dt, timedelta
-from functools import update_wrapper, wraps
-from inspect import isclass
+from functools import update_wrapper
+import inspect
+import json
+import logging
+from multiprocessing.pool import ThreadPool
 import re
+import sys
+import threading
+from weakref import WeakKeyDictionary
 
 from singledispatch import singledispatch
+import six
+from six.moves import queue
 
-from .const import DEFAULT_LIMIT
+from .cache import PersistentCache, freeze
+from .const import DEFAULT_LIMIT, ENVELOPE_KEYS, PREFETCH_POLL_INTERVAL
 
+log = logging.getLogger(__package__)
 
-def cacheable_generator(obj_type):
+# Arguments of paginated methods that change how a listing is fetched, rather
+# than which objects it includes
+PAGING_ARGS = ('limit', 'offset', 'prefetch', 'workers')
+
+# Arguments that only change how a listing is fetched, so are left out of its cache key
+UNKEYED_ARGS = ('prefetch', 'workers')
+
+# Types whose values are used in cache keys as they are
+_KEY_SCALARS = frozenset((bool, float, type(None)) + six.integer_types + six.string_types + (six.text_type, ))
+
+
+class CachedMethod(object):
+    """ Wraps an API method so every API instance gets its own cache
+
+    Caches are held in a WeakKeyDictionary keyed by API instance, so the caches
+    of a client are released together with the client. Accessing the method
+    through an API instance returns a ``BoundCachedMethod`` whose ``cache``
+    attribute is that instance's cache:
+
+    .. code-block:: python
+
+        api.user_by_id(15)
+        len(api.user_by_id.cache)  # 1
+        api.user_by_id.cache.clear()
+    """
+    def __init__(self, func, cached_call, engine=None, obj_type=None):
+        """
+        :param func: The undecorated API method
+        :param cached_call: callable(cache, inst, *args, **kwargs) implementing
+            the caching behavior
+        :param engine: Cache engine factory. Defaults to the API instance's
+            ``cache_engine`` attribute
+        :param obj_type: The model class whose cache timeout and limits apply
+        """
+        update_wrapper(self, func)
+        self._cached_call = cached_call
+        self._engine = engine
+        self.obj_type = obj_type
+        self.arg_names = arg_names(func)
+        self.arg_defaults = arg_defaults(func)
+        self._caches = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __call__(self, inst, *args, **kwargs):
+        return self._cached_call(self.cache_for(inst), inst, *args, **kwargs)
+
+    def __get__(self, inst, owner):
+        if inst is None:
+            return self
+
+        return BoundCachedMethod(self, inst)
+
+    def cache_for(self, inst):
+        """ Returns the cache engine that holds ``inst``'s cached responses
+
+        If ``inst`` has a ``cache_store``, the responses are also persisted to
+        that ``traw.cache.SQLiteStore`` (see ``traw.cache.PersistentCache``).
+        """
+        cache = self._caches.get(inst, None)
+        if cache is None:
+            with self._lock:
+                cache = self._caches.get(inst, None)
+                if cache is None:
+                    engine = self._engine or inst.cache_engine
+                    cache = engine()
+                    store = getattr(inst, 'cache_store', None)
+                    if store is not None:
+                        cache = PersistentCache(store, self.__name__, cache)
+                    self._caches[inst] = cache
+
+        return cache
+
+    def prime(self, inst, value, *args, **kwargs):
+        """ Cache ``value`` as ``inst``'s response to a call with ``args`` and
+            ``kwargs``, as if the method had been called
+        """
+        _cache_set(self.cache_for(inst), inst, self.obj_type,
+                   self.key(args, kwargs), freeze(value), dt.now())
+
+    def key(self, args, kwargs):
+        """ Returns the cache key of a call with ``args`` and ``kwargs`` (see ``cache_key``) """
+        return cache_key(args, kwargs, self.arg_names, self.arg_defaults)
+
+    def seed(self, inst, objs, now):
+        """ Cache each object of the listing ``objs`` as ``inst``'s response
+            to a call with that object's id, as of ``now``
+
+        The entries expire after this method's own cache timeout, counted from
+        ``now`` (when the listing was requested).
+        """
+        cache = self.cache_for(inst)
+        for obj in objs:
+            if isinstance(obj, dict) and 'id' in obj:
+                _cache_set(cache, inst, self.obj_type, self.key((obj['id'], ), {}), freeze(obj), now)
+
+    def is_cached(self, inst, *args, **kwargs):
+        """ Returns True if ``inst`` has an unexpired cached response to a call
+            with ``args`` and ``kwargs``
+        """
+        return self.peek(inst, *args, **kwargs) is not None
+
+    def peek(self, inst, *args, **kwargs):
+        """ Returns ``inst``'s unexpired cached response to a call with
+            ``args`` and ``kwargs``, or None. Never calls the method
+        """
+        entry = self.cache_for(inst).get(self.key(args, kwargs), dt.now())
+        return entry['value'] if entry is not None else None
+
+    def invalidate(self, inst, arg, values):
+        """ Remove ``inst``'s cached responses to calls whose ``arg`` argument
+            is one of ``values``, or was not given (i.e. was not filtered on)
+        """
+        cache = self.cache_for(inst)
+        for key in self._matching_keys(cache, arg, values):
+            cache.pop(key)
+
+    def write_through(self, inst, arg, values, obj):
+        """ Replace the previous version of ``obj`` in ``inst``'s cached
+            listings whose ``arg`` argument is one of ``values``
+
+        Matching listings that are filtered on any argument after ``arg`` are
+        removed instead, as are listings for one of ``values`` that do not
+        include ``obj``. Arguments before ``arg`` (e.g. the project of a
+        suite's sections) are implied by ``arg``, so they do not filter.
+        """
+        cache = self.cache_for(inst)
+        obj = freeze(obj)
+        now = dt.now()
+        for key in self._matching_keys(cache, arg, values):
+            entry = cache.get(key, now)
+            objs = entry['value'] if entry is not None else list()
+            positions = [i for i, cached in enumerate(objs) if cached.get('id', None) == obj['id']]
+            if self._filtered(key, arg):
+                cache.pop(key)
+            elif positions:
+                objs = list(objs)
+                for i in positions:
+                    objs[i] = obj
+                cache.set(key, freeze(objs), entry['expires'], now, entry.get('fresh_until', None))
+            elif self._arg_value(key, arg) is not None:
+                cache.pop(key)
+            # Otherwise the listing is not limited to ``values`` and does not
+            # include ``obj`` (e.g. another project's sections), so it is kept
+
+    def _matching_keys(self, cache, arg, values):
+        for key in cache.keys():
+            value = self._arg_value(key, arg)
+            if value is None or value in values:
+                yield key
+
+    def _arg_value(self, key, arg):
+        """ Returns the value of ``arg`` in the call cached under ``key`` """
+        args, kwargs = key
+        position = self.arg_names.index(arg)
+        return args[position] if position < len(args) else dict(kwargs).get(arg, None)
+
+    def _filtered(self, key, arg):
+        """ Returns True if the call cached under ``key`` filters on any
+            argument after ``arg``
+        """
+        args, kwargs = key
+        named = dict(zip(self.arg_names, args), **dict(kwargs))
+        scope = self.arg_names[:self.arg_names.index(arg)]
+        return any(value is not None for name, value in named.items()
+                   if name != arg and name not in scope and name not in PAGING_ARGS)
+
+
+class BoundCachedMethod(object):
+    """ A CachedMethod bound to a single API instance """
+    def __init__(self, method, inst):
+        self._method = method
+        self._inst = inst
+
+    def __call__(self, *args, **kwargs):
+        return self._method(self._inst, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._method, name)
+
+    @property
+    def cache(self):
+        return self._method.cache_for(self._inst)
+
+    def prime(self, value, *args, **kwargs):
+        self._method.prime(self._inst, value, *args, **kwargs)
+
+    def seed(self, objs, now):
+        self._method.seed(self._inst, objs, now)
+
+    def is_cached(self, *args, **kwargs):
+        return self._method.is_cached(self._inst, *args, **kwargs)
+
+    def peek(self, *args, **kwargs):
+        return self._method.peek(self._inst, *args, **kwargs)
+
+    def invalidate(self, arg, values):
+        self._method.invalidate(self._inst, arg, values)
+
+    def write_through(self, arg, values, obj):
+        self._method.write_through(self._inst, arg, values, obj)
+
+
+class SingleFlight(object):
+    """ Coalesces concurrent calls that share a key into a single call
+
+    The first thread to call ``do`` for a key makes the call. Any other thread
+    that calls ``do`` with the same key before that call finishes waits for
+    it, and receives a copy of its result (or has its exception raised), so
+    identical concurrent requests only reach TestRail once.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+
+    def do(self, key, func, *args, **kwargs):
+        """ Return ``func(*args, **kwargs)``, sharing the call with any
+            concurrent callers using the same ``key``
+        """
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return deepcopy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _Call(object):
+    """ An in-flight SingleFlight call """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+def cacheable_generator(obj_type, engine=None, seeds=None):
     """ Caching decorator for API generator methods
 
         If the decorated method has cached objects for that method and argument
@@ -28,35 +289,103 @@ def cacheable_generator(obj_type):
 
         The above will set the cache timeout of models.Run objects from 300
         seconds to 30 seconds
+
+        Each API instance has its own cache for the decorated method, held by a
+        ``traw.cache.CacheEngine`` created by calling ``engine`` (defaults to the
+        API instance's ``cache_engine``, a bounded ``traw.cache.LRUCache``).
+        Cache size limits can be adjusted on a per-object basis from the client:
+
+        .. code-block:: python
+
+            client.change_cache_limits(max_entries=100, model_cls=models.Result)
+
+        Expired objects of types with a maximum staleness are served, and
+        refreshed in the background, as with ``cacheable``.
+
+        ``seeds`` is the by-id method (e.g. ``run_by_id`` for a runs listing)
+        whose cache is seeded with each object the listing downloads, so
+        listing objects and then looking each of them up costs no extra
+        requests.
     """
     def _cacheable_generator(func):
         """ """
-        cache = func.cache = {}
-
-        @wraps(func)
-        def cacheable_func(inst, *args, **kwargs):
-            key = str(args) + str(kwargs)
-            if key not in cache or cache[key]['expires'] < dt.now():
+        def _cached_objs(cache, inst, objs, args, kwargs):
+            key = method.key(args, kwargs)
+            now = dt.now()
+            entry = cache.get(key, now)
+            if entry is None:
                 returned_vals = list()
-                timeout = inst.cache_timeouts[inst][obj_type]
-                expires = dt.now() + timedelta(seconds=timeout)
-                for val in func(inst, *args, **kwargs):
+                objs.source = func(inst, *args, **kwargs)
+                for val in objs.source:
+                    val = freeze(val)
+                    if seeds is not None:
+                        seeds.seed(inst, [val], now)
                     returned_vals.append(val)
                     yield val
                 else:  # pylint: disable=useless-else-on-loop
                     # Only cache results if the generator has been exhausted
-                    cache[key] = dict()
-                    cache[key]['value'] = returned_vals
-                    cache[key]['expires'] = expires
+                    _cache_set(cache, inst, obj_type, key, returned_vals, now)
+                    objs.source = returned_vals
             else:
-                for val in cache[key]['value']:
+                if _is_stale(entry, now):
+                    _revalidate(cache, inst, obj_type, key,
+                                lambda refreshed_at: _fetch_objs(func, seeds, inst, args, kwargs, refreshed_at))
+                objs.source = entry['value']
+                for val in entry['value']:
                     yield val
 
-        return cacheable_func
+        def cacheable_func(cache, inst, *args, **kwargs):
+            return CachedObjects(lambda objs: _cached_objs(cache, inst, objs, args, kwargs))
+
+        method = CachedMethod(func, cacheable_func, engine, obj_type)
+        return method
     return _cacheable_generator
 
 
-def cacheable(obj_type):
+def _fetch_objs(func, seeds, inst, args, kwargs, now):
+    """ All the objects yielded by the ``cacheable_generator`` method ``func`` """
+    vals = freeze(list(func(inst, *args, **kwargs)))
+    if seeds is not None:
+        seeds.seed(inst, vals, now)
+    return vals
+
+
+class CachedObjects(object):
+    """ Iterator over the objects yielded by a ``cacheable_generator`` method
+
+        ``source`` is the underlying method's iterator once iteration has
+        started, and the cached list of objects once they have been cached. ``size`` is the size reported by
+        a paginated source (see ``Pages``), or the number of cached objects.
+
+        :param iterate: callable taking this iterator and returning a generator
+            of objects, which sets ``source`` when it starts
+    """
+    def __init__(self, iterate):
+        self.source = None
+        self._objs = iterate(self)
+
+    @property
+    def size(self):
+        if isinstance(self.source, list):
+            return len(self.source)
+
+        return getattr(self.source, 'size', None)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._objs)
+
+    next = __next__  # Python 2
+
+    def close(self):
+        self._objs.close()
+        if hasattr(self.source, 'close'):
+            self.source.close()
+
+
+def cacheable(obj_type, engine=None):
     """ Caching decorator for API methods that return a single object
 
         If the decorated method has a cached object for that method and argument
@@ -75,27 +404,158 @@ def cacheable(obj_type):
 
         The above will set the cache timeout of models.Run objects from 300
         seconds to 30 seconds
+
+        Each API instance has its own cache for the decorated method, held by a
+        ``traw.cache.CacheEngine`` created by calling ``engine`` (defaults to the
+        API instance's ``cache_engine``, a bounded ``traw.cache.LRUCache``).
+        Cache size limits can be adjusted on a per-object basis from the client:
+
+        .. code-block:: python
+
+            client.change_cache_limits(max_entries=100, model_cls=models.Result)
+
+        For object types with a maximum staleness (see
+        ``traw.Client.change_cache_staleness``), an expired object is still
+        returned for up to that many seconds, while a background thread fetches
+        a fresh one to replace it.
     """
     def cacheable_func(func):
         """ """
-        cache = func.cache = {}
-
-        @wraps(func)
-        def _cacheable_func(inst, *args, **kwargs):
-            key = str(args) + str(kwargs)
-            if key not in cache or cache[key]['expires'] < dt.now():
-                timeout = inst.cache_timeouts[inst][obj_type]
-                cache[key] = dict()
-                cache[key]['value'] = func(inst, *args, **kwargs)
-                cache[key]['expires'] = dt.now() + timedelta(seconds=timeout)
+        def _cacheable_func(cache, inst, *args, **kwargs):
+            key = method.key(args, kwargs)
+            now = dt.now()
+            entry = cache.get(key, now)
+            if entry is None:
+                value = freeze(func(inst, *args, **kwargs))
+                _cache_set(cache, inst, obj_type, key, value, now)
+                return value
+            elif _is_stale(entry, now):
+                _revalidate(cache, inst, obj_type, key, lambda _: freeze(func(inst, *args, **kwargs)))
 
-            return cache[key]['value']
+            return entry['value']
 
-        return _cacheable_func
+        method = CachedMethod(func, _cacheable_func, engine, obj_type)
+        return method
     return cacheable_func
 
 
-def clear_cache(method):
+def cache_key(args, kwargs, names=(), defaults=None):
+    """ Returns the cache key of a cached method call's arguments
+
+        The key is a tuple of the values of the method's named arguments
+        (``names``, whether they were passed by position or by keyword, or their
+        ``defaults``), and a tuple of the remaining keyword arguments sorted by
+        name. Keyword arguments that are None, or in ``UNKEYED_ARGS``, are left
+        out, and every value is normalized with ``key_value``, so equivalent
+        calls share a key:
+
+        .. code-block:: python
+
+            cache_key((run, ), {'limit': 5}, ['run_id'])  # ((7, ), (('limit', 5), ))
+            cache_key((), {'run_id': 7, 'limit': 5, 'workers': 2}, ['run_id'])  # Same key
+    """
+    if not kwargs and len(args) == len(names) and all(type(arg) in _KEY_SCALARS for arg in args):
+        return (tuple(args), ())
+
+    values = [key_value(arg) for arg in args]
+    params = dict(kwargs)
+    for name in names[len(args):]:
+        values.append(key_value(params.pop(name, (defaults or dict()).get(name, None))))
+
+    params = tuple(sorted((name, key_value(value)) for name, value in params.items()
+                          if value is not None and name not in UNKEYED_ARGS))
+    return (tuple(values), params)
+
+
+def key_value(value):
+    """ Returns the hashable, canonical form of the argument ``value`` used in cache keys
+
+        Models are replaced by their id, lists and tuples by tuples, sets by
+        sorted tuples, and dicts by tuples of their items sorted by key.
+    """
+    if type(value) in _KEY_SCALARS:
+        return value
+    elif isinstance(value, (list, tuple)):
+        return tuple(key_value(val) for val in value)
+    elif isinstance(value, (set, frozenset)):
+        return tuple(sorted((key_value(val) for val in value), key=repr))
+    elif isinstance(value, dict):
+        return tuple(sorted(((key, key_value(val)) for key, val in value.items()), key=repr))
+
+    content = getattr(value, '_content', None)  # models.* objects
+    if isinstance(content, dict) and 'id' in content:
+        return content['id']
+
+    return value
+
+
+def _unwrapped(func):
+    while hasattr(func, '__wrapped__'):
+        func = func.__wrapped__
+
+    return func
+
+
+def arg_names(func):
+    """ Returns the names of the arguments of method ``func``, after ``self`` """
+    getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+    return getargspec(_unwrapped(func)).args[1:]
+
+
+def arg_defaults(func):
+    """ Returns the default values of method ``func``'s arguments, by name """
+    getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+    spec = getargspec(_unwrapped(func))
+    defaults = spec.defaults or ()
+    return dict(zip(spec.args[len(spec.args) - len(defaults):], defaults))
+
+
+def _cache_set(cache, inst, obj_type, key, value, now):
+    timeout = inst.cache_timeouts[obj_type]
+    fresh_until = now + timedelta(seconds=timeout)
+    # Objects that are not to be cached are not to be served stale either
+    max_staleness = inst.cache_staleness[obj_type] if timeout else 0
+    expires = fresh_until + timedelta(seconds=max_staleness) if max_staleness else fresh_until
+    cache.configure(**inst.cache_limits[obj_type])
+    cache.set(key, value, expires, now, fresh_until)
+
+
+def _is_stale(entry, now):
+    fresh_until = entry.get('fresh_until', None)
+    return fresh_until is not None and fresh_until < now
+
+
+# (cache, key) of the entries being refreshed in the background
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate(cache, inst, obj_type, key, fetch):
+    """ Refresh the stale entry ``key`` in the background, replacing it with
+        ``fetch(now)``. The stale entry keeps being served until then, and is
+        only refreshed by one thread at a time
+    """
+    with _revalidating_lock:
+        if (id(cache), key) in _revalidating:
+            return
+        _revalidating.add((id(cache), key))
+
+    def refresh():
+        try:
+            now = dt.now()
+            _cache_set(cache, inst, obj_type, key, fetch(now), now)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Failed to refresh a stale cache entry. It is served until it expires')
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard((id(cache), key))
+
+    thread = threading.Thread(target=refresh)
+    thread.daemon = True
+    thread.start()
+
+
+def clear_cache(method, arg=None, lookup=None):
     """ API method decorator for API methods that POST to the TestRail API
 
         When TRAW adds/closes/deletes/updates ojects to the TestRail API, any
@@ -132,19 +592,163 @@ def clear_cache(method):
 
         The method cache is only cleared if the reponse is successful;
         exceptions raises from the actual call to TestRail's API will not clear
-        the cache.
+        the cache. Only the cache of the API instance that made the call is
+        cleared.
+
+        Naming an argument of ``method`` with ``arg`` clears only the cached
+        responses to calls with a matching value for that argument (and to
+        calls that did not filter on it):
 
+        .. code-block:: python
+
+            @clear_cache(foos_by_bar_id, 'bar_id')
+            def add_foo(self, bar_id, new_foo):
+                # ...
+
+        The values to match are the decorated method's argument of the same
+        name if it has one, and otherwise the same key of the response (or of
+        each object in a list response). ``lookup`` can be given instead, as a
+        callable ``(inst, response, call_args)`` returning a list of values,
+        where ``call_args`` maps the decorated method's argument names to their
+        values. None values are ignored. When the values cannot be determined
+        (a KeyError or TypeError is raised), the whole cache is cleared.
+
+    """
+    def target(func):
+        func_arg_names = arg_names(func)
+
+        @six.wraps(func)
+        def _func(inst, *args, **kwargs):
+            response = func(inst, *args, **kwargs)
+            if arg is None:
+                method.cache_for(inst).clear()
+                return response
+
+            values = _write_values(arg, lookup, inst, response, func_arg_names, args, kwargs)
+            if values is None:
+                method.cache_for(inst).clear()
+            elif values:
+                method.invalidate(inst, arg, values)
+
+            return response
+        return _func
+    return target
+
+
+def write_through(method, arg=None, lookup=None):
+    """ API method decorator for API methods that add or update objects
+
+        TestRail responds to adds and updates with the object that was written.
+        Rather than clearing the cache of ``method``, ``write_through`` caches
+        that object, so reading it again does not call TestRail.
+
+        Without ``arg``, ``method`` is a by-id method (e.g. ``run_by_id``), and
+        the object is cached as its response for the object's id:
+
+        .. code-block:: python
+
+            @write_through(foo_by_id)
+            def update_foo(self, foo_id, params):
+                # ...
+
+        With ``arg``, ``method`` is a listing, and the object replaces its
+        previous version in the cached listings matched as by ``clear_cache``.
+        Matching listings that are filtered on arguments after ``arg`` (which
+        the written object may no longer pass) are cleared instead, as are
+        listings for the object's ``arg`` value that do not include it.
     """
     def target(func):
-        @wraps(func)
-        def _func(*args, **kwargs):
-            response = func(*args, **kwargs)
-            method.cache.clear()
+        func_arg_names = arg_names(func)
+
+        @six.wraps(func)
+        def _func(inst, *args, **kwargs):
+            response = func(inst, *args, **kwargs)
+            if not isinstance(response, dict) or response.get('id', None) is None:
+                # Not the written object; nothing to cache
+                method.cache_for(inst).clear()
+                return response
+            elif arg is None:
+                method.prime(inst, response, response['id'])
+                return response
+
+            values = _write_values(arg, lookup, inst, response, func_arg_names, args, kwargs)
+            if values is None:
+                method.cache_for(inst).clear()
+            elif values:
+                method.write_through(inst, arg, values, response)
+
             return response
         return _func
     return target
 
 
+def _write_values(arg, lookup, inst, response, func_arg_names, args, kwargs):
+    """ Returns the set of ``arg`` values affected by a write, or None if they
+        cannot be determined
+    """
+    call_args = dict(zip(func_arg_names, args), **kwargs)
+    try:
+        if lookup is not None:
+            values = lookup(inst, response, call_args)
+        else:
+            values = _response_values(arg, response, call_args)
+    except (KeyError, TypeError):
+        return None
+
+    return set(value for value in values if value is not None)
+
+
+def _response_values(arg, response, call_args):
+    if arg in call_args:
+        return [call_args[arg]]
+
+    objs = response if isinstance(response, list) else [response]
+    return [obj[arg] for obj in objs]
+
+
+def chunk_by_size(items, max_bytes, overhead=0):
+    """ Split ``items`` into lists whose JSON encoding fits in ``max_bytes``
+
+    :param items: iterable of JSON serializable objects
+    :param max_bytes: maximum size of each list's JSON encoding, in bytes
+    :param overhead: bytes of each request body taken up by anything other
+        than the list (e.g. the enclosing object)
+
+    :yields: lists of items. An item that does not fit in ``max_bytes`` on its
+        own is yielded in a list by itself
+    """
+    chunk = list()
+    chunk_bytes = overhead + len('[]')
+    for item in items:
+        item_bytes = len(json.dumps(item)) + len(', ')
+        if chunk and chunk_bytes + item_bytes > max_bytes:
+            yield chunk
+            chunk = list()
+            chunk_bytes = overhead + len('[]')
+
+        chunk.append(item)
+        chunk_bytes += item_bytes
+
+    if chunk:
+        yield chunk
+
+
+def map_with_workers(func, items, workers=None):
+    """ Returns ``[func(item) for item in items]``, calling ``func`` from up
+        to ``workers`` threads at once when ``workers`` is set
+    """
+    items = list(items)
+    if not workers or len(items) < 2:
+        return [func(item) for item in items]
+
+    pool = ThreadPool(min(int(workers), len(items)))
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def dispatchmethod(func):
     """ singledispatch for class methods
 
@@ -166,7 +770,7 @@ def dispatchmethod(func):
 
     def wrapper(inst, *args, **kwargs):
         obj = args[0] if len(args) > 0 else inst
-        cls = obj if isclass(obj) else obj.__class__
+        cls = obj if inspect.isclass(obj) else obj.__class__
         impl = dispatch(cls)
         return impl(inst, *args, **kwargs)
 
@@ -193,33 +797,285 @@ def duration_to_timedelta(duration):
 
 
 def paginate(func):
-    """ """
-    @wraps(func)
+    """ Pagination decorator for API generator methods
+
+        Pages through the decorated method's results, passing ``offset`` (and
+        ``limit``, if the caller set one) to the decorated method. The decorated
+        method returns each page as TestRail sent it: either a plain list of
+        objects, or (on newer TestRail servers) an envelope dictionary with
+        ``offset``, ``limit``, ``size`` and ``_links`` keys alongside the list
+        of objects.
+
+        Plain list pages are requested DEFAULT_LIMIT objects at a time, until a
+        short page indicates there are no more objects. Older TestRail servers
+        do not page some endpoints, and return every object whatever the
+        ``offset``, so paging also stops at a page longer than requested, or
+        one that starts with the same object as the page before. Envelope pages are
+        followed through their ``_links.next`` link, and later pages are sized
+        by the ``limit`` the server reports, so the largest page the server
+        allows is always used.
+
+        The decorated method returns a ``Pages`` iterator of objects, whose
+        ``size`` attribute holds the ``size`` reported by the server once
+        iteration has started.
+
+        Pages are fetched one after another by default. Passing ``workers=N``
+        fetches up to N pages concurrently: N offset windows are requested at
+        once from a thread pool, and a new window is requested each time the
+        oldest one is consumed. Objects are still yielded in order, and paging
+        stops at the last page (any speculative requests past it are
+        discarded).
+
+        Passing ``prefetch=N`` instead fetches pages one after another on a
+        background thread, keeping up to N pages loaded ahead of the consumer,
+        so requests overlap with the processing of the current page. At most
+        N pages (plus the page being consumed) are held in memory at once.
+        ``workers`` takes precedence when both are given.
+    """
+    @six.wraps(func)
     def paginated_func(*args, **kwargs):
-        limit = kwargs.get('limit', None)
-        offset = 0
-
-        keep_paging = True
-        while keep_paging:
-            new_kwargs = deepcopy(kwargs)
-            new_kwargs['offset'] = offset
-            if limit:
-                new_kwargs['limit'] = min([limit - offset, DEFAULT_LIMIT])
-
-            obj_count = 0
-            for obj_count, obj in enumerate(func(*args, **new_kwargs), 1):
-                yield obj
-
-                if limit and obj_count + offset >= limit:
-                    break
-
-            offset = offset + obj_count
-            if limit and offset >= limit:
-                keep_paging = False
-            elif limit is None and DEFAULT_LIMIT > obj_count:
-                # If obj_count is less than the paging size (DEFAULT_LIMIT),
-                # it indicates that there are no more objects for the API
-                # to return
-                keep_paging = False
+        workers = kwargs.pop('workers', None)
+        prefetch = kwargs.pop('prefetch', None)
+        if workers and workers > 1:
+            pages = _paginate_parallel(func, args, kwargs, workers)
+        elif prefetch and prefetch > 0:
+            pages = _paginate_prefetch(func, args, kwargs, prefetch)
+        else:
+            pages = _paginate_sequential(func, args, kwargs)
+
+        return Pages(pages)
 
     return paginated_func
+
+
+class Pages(object):
+    """ Iterator over the objects of a paginated API method's pages
+
+        ``size`` is the number of objects the server reported in its most
+        recent page envelope, or None until the first page has been fetched
+        (or if the server does not send envelopes).
+    """
+    def __init__(self, pages):
+        self.size = None
+        self._pages = pages
+        self._objs = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            try:
+                return next(self._objs)
+            except StopIteration:
+                objs, envelope = next(self._pages)
+                if envelope is not None:
+                    self.size = envelope.get('size', self.size)
+                self._objs = iter(objs)
+
+    next = __next__  # Python 2
+
+    def close(self):
+        """ Stop paging, releasing any background page requests """
+        self._pages.close()
+
+
+def unpack_page(response):
+    """ Split a page returned by a paginated TestRail endpoint into its list of
+        objects and its envelope
+
+        :param response: list of objects, or an envelope dictionary
+
+        :returns: tuple of (list of objects, envelope dictionary or None)
+    """
+    if isinstance(response, dict) and '_links' in response:
+        objs = [val for key, val in response.items()
+                if key not in ENVELOPE_KEYS and isinstance(val, list)]
+        return (objs[0] if objs else list(), response)
+
+    return (list(response or list()), None)
+
+
+def next_offset(envelope, offset, obj_count):
+    """ Returns the offset of the page after the page at ``offset``, or None if
+        ``envelope`` indicates there are no more pages
+    """
+    links = envelope.get('_links') or dict()
+    if not links.get('next'):
+        return None
+
+    match = re.search(r'[&?]offset=(\d+)', links['next'])
+    return int(match.group(1)) if match else offset + obj_count
+
+
+def _page_kwargs(kwargs, offset, limit, page_size):
+    """ Returns a copy of ``kwargs`` requesting the page at ``offset`` """
+    page_kwargs = deepcopy(kwargs)
+    page_kwargs['offset'] = offset
+    if limit:
+        page_kwargs['limit'] = min([limit - offset, page_size])
+
+    return page_kwargs
+
+
+def _paginate_sequential(func, args, kwargs):
+    """ Yields each page of ``func``, one page after another """
+    limit = kwargs.get('limit', None)
+    page_size = DEFAULT_LIMIT
+    offset = 0
+
+    previous = None
+
+    while limit is None or offset < limit:
+        page_kwargs = _page_kwargs(kwargs, offset, limit, page_size)
+        objs, envelope = _fetch_page(func, args, page_kwargs)
+        if envelope is None and _repeats(objs, previous):
+            break
+
+        page_limit = page_kwargs.get('limit', page_size)
+        unpaged = envelope is None and len(objs) > page_limit
+        if limit:
+            objs = objs[:limit - offset]
+
+        yield objs, envelope
+
+        if envelope is not None:
+            page_size = envelope.get('limit') or page_size
+            offset = next_offset(envelope, offset, len(objs))
+            if offset is None:
+                break
+        elif unpaged or len(objs) < page_limit:
+            # A short page indicates that there are no more objects for the
+            # API to return, and a long one that the API returned them all
+            break
+        else:
+            previous = objs
+            offset += len(objs)
+
+
+def _repeats(objs, previous):
+    """ Returns True if the plain list page ``objs`` starts with the same
+        object as the page before it, which servers that do not page an
+        endpoint (and ignore ``offset``) return every time
+    """
+    if not objs or not previous or not isinstance(objs[0], dict) or not isinstance(previous[0], dict):
+        return False
+
+    return objs[0].get('id', None) is not None and objs[0].get('id', None) == previous[0].get('id', None)
+
+
+def _paginate_parallel(func, args, kwargs, workers):
+    """ Yields each page of ``func``, keeping up to ``workers`` page requests
+        in flight
+
+        The first page is fetched on its own, so the windows requested after it
+        can be sized by the page size the server reports.
+    """
+    limit = kwargs.get('limit', None)
+    first_kwargs = _page_kwargs(kwargs, 0, limit, DEFAULT_LIMIT)
+    objs, envelope = _fetch_page(func, args, first_kwargs)
+    yield objs, envelope
+
+    page_size = _next_page_size(objs, envelope, first_kwargs.get('limit', DEFAULT_LIMIT))
+    if page_size is None:
+        return
+
+    first = objs
+
+    pool = ThreadPool(workers)
+    pending = deque()
+    window_offset = len(objs)
+
+    try:
+        while True:
+            while len(pending) < workers and (limit is None or window_offset < limit):
+                page_kwargs = _page_kwargs(kwargs, window_offset, limit, page_size)
+                page = pool.apply_async(_fetch_page, (func, args, page_kwargs))
+                pending.append((page, page_kwargs.get('limit', page_size)))
+                window_offset += page_size
+
+            if not pending:
+                break
+
+            page, window_size = pending.popleft()
+            objs, envelope = page.get()
+            if envelope is None and _repeats(objs, first):
+                break
+
+            yield objs, envelope
+
+            if envelope is not None and not (envelope.get('_links') or dict()).get('next'):
+                break
+            elif len(objs) < window_size:
+                break
+    finally:
+        # Don't wait on speculative requests past the last page
+        pool.close()
+
+
+def _next_page_size(objs, envelope, page_size):
+    """ Returns the size of the pages after the first page ``objs`` of
+        ``page_size`` objects, or None if it is the only page
+    """
+    if envelope is not None:
+        if next_offset(envelope, 0, len(objs)) is None:
+            return None
+        return envelope.get('limit') or page_size
+    elif len(objs) != page_size:
+        # A short page, or every object from a server that does not page
+        return None
+
+    return page_size
+
+
+def _paginate_prefetch(func, args, kwargs, prefetch):
+    """ Yields each page of ``func``, while a background thread loads up to
+        ``prefetch`` pages ahead
+    """
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    loader = threading.Thread(target=_load_pages, args=(func, args, kwargs, pages, stop))
+    loader.daemon = True
+    loader.start()
+
+    try:
+        while True:
+            page, exc_info = pages.get()
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            elif page is None:
+                break
+
+            yield page
+    finally:
+        # Let the loader exit if the consumer stops early
+        stop.set()
+
+
+def _load_pages(func, args, kwargs, pages, stop):
+    """ Fetches pages of ``func`` in order onto the ``pages`` queue, followed
+        by a ``None`` page, until there are no more pages or ``stop`` is set
+    """
+    def _put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=PREFETCH_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for page in _paginate_sequential(func, args, kwargs):
+            if not _put((page, None)):
+                return
+    except Exception:
+        _put((None, sys.exc_info()))
+        return
+
+    _put((None, None))
+
+
+def _fetch_page(func, args, kwargs):
+    return unpack_page(func(*args, **kwargs))